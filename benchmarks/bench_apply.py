@@ -0,0 +1,33 @@
+"""Compares applying configuration with executemany against one statement at a time.
+
+Usage: python -m benchmarks.bench_apply [TABLES ...]
+"""
+import os
+import sys
+import tempfile
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.applier import ConfigurationApplier
+from sdmanager.core.database import ConnectionPool
+from sdmanager.tests.TestApplier import create_sym_database
+from benchmarks.synthetic import make_properties
+
+
+def main(sizes):
+    print(f"{'tables':>8} {'mode':>22} {'calls':>8} {'seconds':>9}")
+    for tables in sizes:
+        builder = ReplicationBuilder(make_properties(tables=tables))
+        for executemany in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                pool = ConnectionPool()
+                url = create_sym_database(os.path.join(tmp, 'corp.db'))
+                timings = ConfigurationApplier(builder, url, pool=pool, executemany=executemany).apply()
+                pool.close()
+
+            mode = 'executemany' if executemany else 'statement-by-statement'
+            calls = sum(timing.statements for timing in timings)
+            seconds = sum(timing.seconds for timing in timings)
+            print(f"{tables:>8} {mode:>22} {calls:>8} {seconds:>9.3f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
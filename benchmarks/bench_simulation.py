@@ -0,0 +1,28 @@
+"""Measures simulation time against the number of nodes.
+
+Usage: python -m benchmarks.bench_simulation [NODES ...]
+"""
+import sys
+import time
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.simulation import ReplicationSimulator
+from benchmarks.synthetic import make_properties
+
+DURATION = 300
+
+
+def main(node_counts):
+    print(f"{'nodes':>7} {'job runs':>10} {'seconds':>9}")
+    for nodes in node_counts:
+        properties = make_properties(nodes=nodes, tables=100, channels=4)
+        for idx, table in enumerate(properties['tables']):
+            table['rows-per-second'] = 1 + idx % 10
+        builder = ReplicationBuilder(properties)
+
+        start = time.perf_counter()
+        report = ReplicationSimulator(builder, duration=DURATION).run()
+        print(f"{nodes:>7} {report.events:>10,} {time.perf_counter() - start:>9.3f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,55 @@
+"""Compares streamed SQL generation with materialising the whole script.
+
+Usage: python -m benchmarks.bench_sql_stream [TABLES ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from string import Template
+from sdmanager.core import ReplicationBuilder
+from benchmarks.synthetic import make_properties
+
+
+def materialised(builder):
+    """The pre-streaming path: build every section, then substitute sql.st"""
+    mappings = {}
+    mappings['group'], mappings['group_links'] = builder.build_group_queries()
+    mappings['channels_list'], mappings['channel'] = builder.build_channel_query()
+    mappings['table_triggers'], mappings['initial_load_table_triggers'] = builder.build_table_trigger_queries()
+    mappings['router'] = builder.build_router_query()
+    mappings['router_triggers'], mappings['initial_load_router_triggers'] = builder.build_router_trigger_queries()
+
+    with open(os.path.join(os.environ['SDMANAGER_BASE_DIR'], 'templates', 'sql.st')) as template_file:
+        result = Template(template_file.read()).substitute(mappings)
+    with open(os.path.join(builder.output_dir, 'symmetricds.sql'), 'w') as sql_file:
+        sql_file.write(result)
+
+
+def streamed(builder):
+    builder.generate_sql_file()
+
+
+def measure(func, builder):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(builder)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes):
+    print(f"{'tables':>8} {'mode':>12} {'seconds':>9} {'peak MiB':>9}")
+    for tables in sizes:
+        with tempfile.TemporaryDirectory() as output_dir:
+            builder = ReplicationBuilder(make_properties(tables=tables), output_dir)
+            for name, func in (('materialised', materialised), ('streamed', streamed)):
+                elapsed, peak = measure(func, builder)
+                print(f"{tables:>8} {name:>12} {elapsed:>9.3f} {peak / 2**20:>9.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,88 @@
+"""Times CLI startup of commands that should not load the builder.
+
+Runs each command in a fresh interpreter, keeps the best wall time of
+several runs and checks that no heavy module was imported. Exits with
+status 1 when a command is over budget or imported a heavy module.
+
+Usage: python -m benchmarks.bench_startup [--repeat 10] [--budget 0.1]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Best wall time allowed for a command, interpreter startup included
+BUDGET_SECONDS = 0.1
+
+COMMANDS = {
+    'python': [],
+    'sd-manager --help': ['--help'],
+    'sd-manager get-config': ['get-config', 'bench.key'],
+}
+# Commands measured only as a reference, without a budget
+REFERENCE_COMMANDS = ['python']
+
+HEAVY_MODULES = ['sdmanager.commands', 'sdmanager.core.replication_builder', 'sdmanager.core.validator',
+                 'sdmanager.core.applier', 'sdmanager.core.catalog', 'sdmanager.core.workload']
+
+RUN_CLI = 'import sys; from sdmanager.cli import cli; cli(prog_name="sd-manager")'
+# Prints the loaded sdmanager modules once the command exits
+REPORT_MODULES = ('import atexit, sys; atexit.register(lambda: print(",".join(m for m in sys.modules '
+                  'if m.startswith("sdmanager")), file=sys.stderr)); ')
+
+
+def command_line(name, arguments, report_modules=False):
+    if name == 'python':
+        return [sys.executable, '-c', 'pass']
+    return [sys.executable, '-c', (REPORT_MODULES if report_modules else '') + RUN_CLI, *arguments]
+
+
+def best_time(command, cwd, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def loaded_modules(command, cwd):
+    result = subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return result.stderr.strip().splitlines()[-1].split(',')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per command, the best is kept.')
+    parser.add_argument('--budget', type=float, default=BUDGET_SECONDS, help='Seconds allowed per command.')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'command':<24} {'best s':>8} {'budget s':>9}  heavy modules")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'conf.ini'), 'w') as config_file:
+            config_file.write('[bench]\nkey = value\n')
+
+        for name, arguments in COMMANDS.items():
+            seconds = best_time(command_line(name, arguments), tmp, args.repeat)
+            if name in REFERENCE_COMMANDS:
+                print(f"{name:<24} {seconds:>8.4f} {'-':>9}")
+                continue
+
+            heavy = [module for module in loaded_modules(command_line(name, arguments, True), tmp) if module in HEAVY_MODULES]
+            print(f"{name:<24} {seconds:>8.4f} {args.budget:>9.4f}  {', '.join(heavy) or '-'}")
+            if seconds > args.budget:
+                failures.append(f"{name}: {seconds:.4f}s over the {args.budget:g}s budget")
+            if heavy:
+                failures.append(f"{name}: imported {', '.join(heavy)}")
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Measures node properties render throughput (renders/sec).
+
+Usage: python -m benchmarks.bench_templates [RENDERS]
+"""
+import os
+import sys
+import time
+from string import Template
+from sdmanager.core import templates
+from benchmarks.synthetic import make_properties
+
+
+def reopen_and_substitute(path, parameters):
+    """The original per-node path: read, parse and substitute every time"""
+    with open(path, 'r') as template_file:
+        return Template(template_file.read()).substitute(parameters)
+
+
+def main(renders):
+    registry = templates.TemplateRegistry()
+    path = registry.find('child')
+    with open(path) as template_file:
+        parsed = Template(template_file.read())
+
+    parameters = {
+        "job_routing_period_time_ms": 5000,
+        "job_push_period_time_ms": 10000,
+        "job_pull_period_time_ms": 10000,
+        **make_properties(nodes=2)['nodes'][1]
+    }
+
+    compiled = registry.get('child')
+
+    candidates = (
+        ('open + Template.substitute', lambda: reopen_and_substitute(path, parameters)),
+        ('cached Template.substitute', lambda: parsed.substitute(parameters)),
+        ('registry.get + render', lambda: registry.get('child').render(parameters)),
+        ('CompiledTemplate.render', lambda: compiled.render(parameters)),
+    )
+
+    print(f"{'path':>28} {'renders/sec':>12}")
+    for name, render in candidates:
+        start = time.perf_counter()
+        for _ in range(renders):
+            render()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>28} {renders / elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,49 @@
+"""Measures peak memory of reading a large Torque XML schema.
+
+Usage: python -m benchmarks.bench_torque [TABLES] [COLUMNS]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from xml.etree import ElementTree
+from sdmanager.core.torque import iter_torque_tables
+
+
+def write_schema(path, tables, columns):
+    with open(path, 'w') as schema_file:
+        schema_file.write('<?xml version="1.0"?>\n<database name="bench">\n')
+        for idx in range(tables):
+            schema_file.write(f'  <table name="table_{idx:05}">\n')
+            schema_file.write('    <column name="id" type="INTEGER" required="true" primaryKey="true" />\n')
+            for col in range(columns):
+                schema_file.write(f'    <column name="col_{col}" type="VARCHAR" size="50" />\n')
+            if idx:
+                schema_file.write(f'    <foreign-key foreignTable="table_{idx - 1:05}"><reference local="id" foreign="id" /></foreign-key>\n')
+            schema_file.write('  </table>\n')
+        schema_file.write('</database>\n')
+
+
+def measure(name, read):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = read()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>22} {count:>8} {elapsed:>9.3f} {peak / 1024 / 1024:>10.1f}")
+
+
+def main(tables, columns):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'schema.xml')
+        write_schema(path, tables, columns)
+        print(f"{tables} tables, {tables * (columns + 1)} columns, {os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+        print(f"{'reader':>22} {'tables':>8} {'seconds':>9} {'peak MiB':>10}")
+        measure('ElementTree.parse', lambda: len(ElementTree.parse(path).getroot().findall('table')))
+        measure('iter_torque_tables', lambda: sum(1 for _ in iter_torque_tables(path)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, int(sys.argv[2]) if len(sys.argv) > 2 else 25)
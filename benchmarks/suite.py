@@ -0,0 +1,150 @@
+"""Times each stage of the build pipeline on synthetic topologies.
+
+Records the best wall time of several runs and the peak traced memory of
+each stage, saves them as JSON and compares them against a baseline.
+Exits with status 1 when a stage regressed.
+
+Usage:
+    python -m benchmarks.suite [--scale small --scale medium] [--output results.json]
+                               [--baseline benchmarks/baseline.json] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from sdmanager.core import ReplicationBuilder, Validator
+from benchmarks.synthetic import make_properties
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# nodes, tables, groups, channels
+SCALES = {
+    'small': (10, 100, 2, 2),
+    'medium': (1000, 1000, 4, 8),
+    'large': (10000, 5000, 8, 16),
+}
+DEFAULT_SCALES = ['small', 'medium']
+
+# Slower or larger than the baseline by this ratio is a regression, unless
+# the difference is within the noise floor
+THRESHOLD = 2.0
+NOISE_SECONDS = 0.005
+NOISE_BYTES = 64 * 1024
+
+
+def stages(builder, properties_path):
+    """Yields each stage's name and a callable running it once"""
+    yield 'parse_properties', lambda: builder.parse_properties(properties_path)
+    yield 'Validator.validate', lambda: Validator(builder.properties).validate()
+    yield 'build_group_queries', builder.build_group_queries
+    yield 'build_channel_query', builder.build_channel_query
+    yield 'build_table_trigger_queries', builder.build_table_trigger_queries
+    yield 'build_router_query', builder.build_router_query
+    yield 'build_router_trigger_queries', builder.build_router_trigger_queries
+    yield 'generate_node_property_files', builder.generate_node_property_files
+
+
+def measure(run, repeat):
+    """Returns the best wall time of repeat runs and the peak memory of one traced run"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_scale(scale, repeat):
+    nodes, tables, groups, channels = SCALES[scale]
+    properties = make_properties(nodes=nodes, tables=tables, groups=groups, channels=channels)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        properties_path = os.path.join(tmp, 'properties.json')
+        with open(properties_path, 'w') as properties_file:
+            json.dump(properties, properties_file)
+
+        output_dir = os.path.join(tmp, 'output')
+        os.mkdir(output_dir)
+        builder = ReplicationBuilder(properties, output_dir, incremental=False)
+        for name, run in stages(builder, properties_path):
+            seconds, peak = measure(run, repeat)
+            results[name] = {'seconds': round(seconds, 6), 'peak_bytes': peak}
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Lists the stages slower or larger than the baseline by more than threshold
+
+    Returns:
+        list[str]: Regression descriptions
+    """
+    regressions = []
+    for scale, stage_results in results.items():
+        for stage, result in stage_results.items():
+            previous = baseline.get(scale, {}).get(stage)
+            if previous is None:
+                continue
+            for key, unit, noise in [('seconds', 's', NOISE_SECONDS), ('peak_bytes', ' bytes', NOISE_BYTES)]:
+                before, after = previous[key], result[key]
+                if after - before > noise and after > before * threshold:
+                    regressions.append(f"{scale} {stage}: {key} {before:g}{unit} -> {after:g}{unit} ({after / max(before, 1e-9):.2f}x)")
+    return regressions
+
+
+def print_results(results, baseline):
+    print(f"{'scale':<8} {'stage':<30} {'seconds':>9} {'peak KiB':>10} {'vs baseline':>12}")
+    for scale, stage_results in results.items():
+        for stage, result in stage_results.items():
+            previous = baseline.get(scale, {}).get(stage)
+            ratio = f"{result['seconds'] / max(previous['seconds'], 1e-9):.2f}x" if previous else '-'
+            print(f"{scale:<8} {stage:<30} {result['seconds']:>9.4f} {result['peak_bytes'] / 1024:>10.1f} {ratio:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', action='append', choices=sorted(SCALES), help='Scale to run. May be repeated.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage, the best is kept.')
+    parser.add_argument('--output', help='File to save the results to.')
+    parser.add_argument('--baseline', default=BASELINE, help='Results to compare against.')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline.')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Ratio over the baseline reported as a regression.')
+    args = parser.parse_args(argv)
+
+    results = {scale: run_scale(scale, args.repeat) for scale in args.scale or DEFAULT_SCALES}
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'results': results}
+
+    baseline = {}
+    if os.path.isfile(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    print_results(results, baseline)
+    for path in [args.output, args.baseline if args.save_baseline else None]:
+        if path:
+            with open(path, 'w') as results_file:
+                json.dump(report, results_file, indent=2)
+                results_file.write('\n')
+            print(f"Saved results to {path}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold}x the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
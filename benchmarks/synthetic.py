@@ -0,0 +1,62 @@
+"""Synthetic replication properties for benchmarks.
+
+Run benchmarks from the repository root, e.g.
+`python -m benchmarks.bench_sql_stream`.
+"""
+
+
+def make_properties(nodes: int = 2, tables: int = 10, groups: int = 2, channels: int = 2,
+                    arch: str = 'bi-directional') -> dict:
+    """Builds a valid properties dict of the requested size
+
+    Args:
+        nodes (int): Number of nodes. The first node is the parent.
+        tables (int): Number of tables
+        groups (int): Number of node groups. The first group is the parent group.
+        channels (int): Number of channels
+        arch (str): Replication architecture
+
+    Returns:
+        dict: Replication properties
+    """
+    group_ids = [f"group_{idx:03}" for idx in range(groups)]
+    channel_ids = [f"channel_{idx:03}" for idx in range(channels)]
+
+    properties = {
+        'groups': [
+            {'id': group_id, 'description': f"Group {group_id}", 'sync': 'P' if idx == 0 else 'W'}
+            for idx, group_id in enumerate(group_ids)
+        ],
+        'nodes': [],
+        'replication-arch': arch,
+        'channels': [{'id': channel_id, 'description': ''} for channel_id in channel_ids],
+        'tables': []
+    }
+
+    for idx in range(nodes):
+        parent = idx == 0
+        group_id = group_ids[0] if parent else group_ids[1 + (idx - 1) % (groups - 1)]
+        properties['nodes'].append({
+            'engine_name': f"{group_id}-{idx:06}",
+            'group_id': group_id,
+            'type': 'parent' if parent else 'child',
+            'external_id': f"{idx:06}",
+            'db_driver': 'com.mysql.jdbc.Driver',
+            'db_url': f"jdbc:mysql://localhost/db_{idx:06}?tinyInt1isBit=false",
+            'db_user': 'symmetric',
+            'db_password': 'symmetric',
+            'url': 'http://localhost:31415/sync/corp-000'
+        })
+
+    for idx in range(tables):
+        table = {
+            'name': f"table_{idx:06}",
+            'channel': channel_ids[idx % channels],
+            'route': 'parent-child' if idx % 2 == 0 else 'child-parent'
+        }
+        if idx % 10 == 0:
+            table['initial-load'] = 1
+            table['initial-load-route'] = 'parent-child'
+        properties['tables'].append(table)
+
+    return properties
@@ -1,24 +1,75 @@
 import configparser
+import functools
+import importlib
 import subprocess
-from sdmanager.core import ReplicationBuilder
 import click
 
-config_parser = configparser.ConfigParser()
-config_parser.sections()
-config_parser.read('conf.ini')
+CONFIG_FILE = 'conf.ini'
 
-@click.group()
+# Note: Commands below are imported only when they run, so the help and
+# config commands start without loading the builder. Their short help is
+# kept here so listing them does not import them either.
+LAZY_COMMANDS = {
+    'apply': ('sdmanager.commands:apply_config', "Loads the generated configuration into the parent node's database."),
+    'build-files': ('sdmanager.commands:build_files', 'Generates the node properties files and configuration SQL.'),
+    'diff-config': ('sdmanager.commands:diff_config', 'Writes only the SQL statements changing the current configuration.'),
+    'discover': ('sdmanager.commands:discover', "Adds a node database's tables to the tables section of a properties file."),
+    'extract-node': ('sdmanager.commands:extract_node', 'Extracts the bundles of single nodes from a combined archive.'),
+    'gen-load': ('sdmanager.commands:gen_load', 'Generates synthetic rows for the replicated tables.'),
+    'plan-channels': ('sdmanager.commands:plan_channels', 'Reports the planned batching, order and queue of each channel.'),
+    'reload': ('sdmanager.commands:reload', 'Writes table reload requests for nodes, in load order and chunks.'),
+    'simulate': ('sdmanager.commands:simulate', 'Simulates replication under load and reports latency and traffic.'),
+    'validate': ('sdmanager.commands:validate', 'Reports every validation error in a replication properties file.'),
+}
+
+
+class LazyGroup(click.Group):
+    """Group importing each of its `lazy_commands` on first use
+
+    `lazy_commands` maps a command name to its `module:attribute` path and
+    short help.
+    """
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(self, ctx, name):
+        if name not in self.commands and name in self.lazy_commands:
+            module, _, attribute = self.lazy_commands[name][0].partition(':')
+            self.add_command(getattr(importlib.import_module(module), attribute), name)
+        return self.commands.get(name)
+
+    def format_commands(self, ctx, formatter):
+        names = [name for name in self.list_commands(ctx) if name in self.lazy_commands or not self.commands[name].hidden]
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            if name in self.commands:
+                rows.append((name, self.commands[name].get_short_help_str(limit)))
+            else:
+                rows.append((name, click.utils.make_default_short_help(self.lazy_commands[name][1], limit)))
+        with formatter.section('Commands'):
+            formatter.write_dl(rows)
+
+
+@functools.lru_cache(maxsize=None)
+def get_config_parser() -> configparser.ConfigParser:
+    """Reads the INI config on first use"""
+    config_parser = configparser.ConfigParser()
+    config_parser.read(CONFIG_FILE)
+    return config_parser
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 def cli():
     """SymmetricDS Manager."""
     click.echo('SymmetricDS Manager')
 
-@cli.command()
-@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
-@click.option('-o', '--output', help="SymmetricDS files' output directory.")
-def build_files(properties, output=None):
-    builder = ReplicationBuilder(properties, output)
-    builder.generate_files();
-
 @cli.command()
 def run():
     print('Running command')
@@ -48,12 +99,13 @@ def set_config(key: str, value: str) -> None:
         click.echo("Comibation of INI section and key separated by '.' required.")
         return
 
+    config_parser = get_config_parser()
     config_parser.read_dict({
         sections[0] : {
             sections[1] : value
         }
     })
-    with open('conf.ini', 'w') as configfile:
+    with open(CONFIG_FILE, 'w') as configfile:
         config_parser.write(configfile)
 
 @cli.command()
@@ -72,6 +124,7 @@ def get_config(key: str) -> None:
         OUTPUT: Hello World
     """
     value = ''
+    config_parser = get_config_parser()
     sections = key.split('.')
     if (len(sections) != 2):
         click.echo("Comibation of INI section and key separated by '.' required.")
@@ -0,0 +1,330 @@
+import json
+import sys
+import time
+from sdmanager.core import ReplicationBuilder, Validator, batch, bundle, capacity, database, delta, load_order, simulation, sql_generator, watcher, workload
+from sdmanager.core.applier import ConfigurationApplier
+from sdmanager.core.catalog import CatalogCache, discover_catalog, tables_section
+from sdmanager.core.database import DatabaseError
+from sdmanager.core.profiling import BuildProfiler
+from sdmanager.core.replication_builder import load_properties
+import click
+
+# Note: These commands are registered lazily by `sdmanager.cli`, which
+# imports this module only when one of them runs.
+
+@click.command()
+@click.option('-p', '--properties', required=True, multiple=True, help='Manager replication properties JSON file, or directory of properties fragments. May be repeated or a glob, building each deployment into its own output subdirectory.')
+@click.option('-o', '--output', help="SymmetricDS files' output directory.")
+@click.option('-j', '--jobs', type=int, default=1, show_default=True, help='Number of worker processes rendering node properties files, or building deployments when there are several.')
+@click.option('-t', '--templates', multiple=True, type=click.Path(exists=True, file_okay=False), help='Directory of custom templates, searched before the bundled templates. May be repeated.')
+@click.option('-f', '--force', is_flag=True, help='Rewrite every file instead of only those whose inputs changed since the last build.')
+@click.option('-b', '--batch-size', type=int, default=1, show_default=True, help='Rows per multi-row INSERT in the generated SQL. 1 generates single-row inserts.')
+@click.option('--dialect', type=click.Choice(sorted(sql_generator.DIALECT_MAX_ROWS)), help="SQL dialect of batched inserts. Defaults to the parent node's db_driver dialect.")
+@click.option('-s', '--stream', is_flag=True, help='Stream nodes and tables from the properties file instead of loading it whole. Always on for a directory of fragments.')
+@click.option('--table-schema', type=click.Path(exists=True, dir_okay=False), help='Torque XML schema whose tables are added to the tables section, overriding the table-schema property.')
+@click.option('--profile', is_flag=True, help='Print the wall time, CPU time and memory peak of each build phase.')
+@click.option('--profile-json', type=click.Path(dir_okay=False, writable=True), help='Write the build phase metrics to a JSON file.')
+@click.option('--profile-stats', type=click.Path(dir_okay=False, writable=True), help='Write a cProfile .pstats dump of the build.')
+@click.option('-w', '--watch', is_flag=True, help='Keep running and rebuild the files affected by each change to the properties.')
+@click.option('--poll-interval', type=float, default=watcher.POLL_INTERVAL, show_default=True, help='Seconds between checks for changes when watching.')
+@click.option('--debounce', type=float, default=watcher.DEBOUNCE, show_default=True, help='Seconds without further changes before rebuilding when watching.')
+@click.option('--bundle', 'bundle_format', type=click.Choice(bundle.BUNDLE_FORMATS), help="Write each node's properties, engine directories and checksums into its own archive instead of a properties file.")
+@click.option('--combined', is_flag=True, help='Write every node bundle into one indexed archive.')
+def build_files(properties, output=None, jobs=1, templates=(), force=False, batch_size=1, dialect=None, stream=False,
+                table_schema=None, profile=False, profile_json=None, profile_stats=None, watch=False,
+                poll_interval=watcher.POLL_INTERVAL, debounce=watcher.DEBOUNCE, bundle_format=None, combined=False):
+    """Generates the node properties files and configuration SQL."""
+    try:
+        paths = batch.expand_properties(properties)
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+    if (bundle_format or combined) and (not output or (combined and watch)):
+        click.echo('Bundles require --output, and a combined bundle does not support --watch.')
+        sys.exit(1)
+    if len(paths) > 1 or paths[0] != properties[0]:
+        if not output or watch or profile or profile_json or profile_stats:
+            click.echo('Building several deployments requires --output and does not support --watch or profiling.')
+            sys.exit(1)
+        build_batch(paths, output, jobs, templates, force, batch_size, dialect, stream, table_schema, bundle_format, combined)
+        return
+
+    properties = paths[0]
+    profiler = None
+    if profile or profile_json or profile_stats:
+        profiler = BuildProfiler(cprofile=profile_stats is not None)
+
+    builder = ReplicationBuilder(properties, output, jobs, list(templates), incremental=not force,
+                                 insert_batch_size=batch_size, dialect=dialect, streaming=stream,
+                                 table_schema=table_schema, profiler=profiler, bundle_format=bundle_format,
+                                 combined_bundle=combined)
+    failures = builder.generate_files()
+
+    if profiler is not None:
+        click.echo(profiler.summary())
+        if profile_json:
+            profiler.write_json(profile_json)
+        if profile_stats:
+            profiler.dump_stats(profile_stats)
+
+    if watch:
+        builder.profiler = None
+        properties_watcher = watcher.PropertiesWatcher(builder, properties, table_schema, dialect, poll_interval, debounce)
+        click.echo(f"Watching {properties} for changes, press Ctrl+C to stop")
+        try:
+            properties_watcher.watch(lambda rebuild: click.echo(str(rebuild)))
+        except KeyboardInterrupt:
+            return
+    if failures:
+        sys.exit(1)
+
+def build_batch(paths, output, jobs, templates, force, batch_size, dialect, stream, table_schema, bundle_format=None, combined=False):
+    start = time.perf_counter()
+    results = []
+    try:
+        for result in batch.build_deployments(paths, output, jobs, template_dirs=list(templates), incremental=not force,
+                                              insert_batch_size=batch_size, dialect=dialect, streaming=stream,
+                                              table_schema=table_schema, bundle_format=bundle_format,
+                                              combined_bundle=combined):
+            click.echo(f"{'Built' if result.ok else 'Failed'} {result.name} in {result.seconds:.3f}s")
+            results.append(result)
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+
+    click.echo(batch.format_summary(results, time.perf_counter() - start))
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+@click.command()
+@click.option('-a', '--archive', required=True, type=click.Path(exists=True, dir_okay=False), help='Combined bundle archive written by build-files --combined.')
+@click.option('-n', '--node', 'engine_names', required=True, multiple=True, help='Engine name of the node to extract. May be repeated.')
+@click.option('-o', '--output', required=True, help='Directory to extract the bundles into, e.g. the SymmetricDS installation.')
+def extract_node(archive, engine_names, output):
+    """Extracts the bundles of single nodes from a combined archive."""
+    try:
+        index = bundle.read_index(archive)
+        for engine_name in engine_names:
+            content, bundle_format = bundle.read_node_bundle(archive, engine_name, index)
+            files = bundle.extract_bundle(content, bundle_format, output)
+            click.echo(f"Extracted {engine_name}: {', '.join(files)}")
+    except (KeyError, ValueError) as e:
+        click.echo(str(e.args[0]) if isinstance(e, KeyError) else str(e))
+        sys.exit(1)
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the validation report as JSON.')
+def validate(properties, as_json=False):
+    """Reports every validation error in a replication properties file."""
+    report = Validator(load_properties(properties)).validate_all()
+    if as_json:
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    else:
+        click.echo(str(report))
+
+    if not report.valid:
+        sys.exit(1)
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+def plan_channels(properties):
+    """Reports the planned batching, order and queue of each channel."""
+    builder = ReplicationBuilder(properties)
+    click.echo(capacity.format_plans(builder.plan_channels()))
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-n', '--node', 'nodes', required=True, multiple=True, help='Engine name of a node to reload. May be repeated.')
+@click.option('-t', '--table', 'tables', multiple=True, help='Table to reload. May be repeated. Defaults to every table.')
+@click.option('--table-schema', type=click.Path(exists=True, dir_okay=False), help='Torque XML schema defining the tables, overriding the table-schema property.')
+@click.option('-o', '--output', type=click.Path(dir_okay=False, writable=True), help='File to write the statements to instead of printing them.')
+def reload(properties, nodes=(), tables=(), table_schema=None, output=None):
+    """Writes table reload requests for nodes, in load order and chunks."""
+    builder = ReplicationBuilder(properties, table_schema=table_schema)
+    try:
+        statements = list(load_order.reload_requests(builder, list(nodes), list(tables)))
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+
+    text = ''.join(f"{statement}\n" for statement in statements)
+    if output:
+        with open(output, 'w') as output_file:
+            output_file.write(text)
+        click.echo(f"{len(statements)} reload request(s), written to {output}")
+    else:
+        click.echo(text + f"-- {len(statements)} reload request(s)")
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-d', '--duration', type=float, default=simulation.DEFAULT_DURATION, show_default=True, help='Simulated seconds.')
+@click.option('-r', '--rate', 'rates', multiple=True, help="Rows changed per second at each capturing node as TABLE=ROWS, overriding the table's rows-per-second. May be repeated.")
+@click.option('--bandwidth', type=float, help='Bandwidth of each node to node connection in KiB/s. Transfers are instant when omitted.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed of the job phases.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON.')
+def simulate(properties, duration=simulation.DEFAULT_DURATION, rates=(), bandwidth=None, seed=0, as_json=False):
+    """Simulates replication under load and reports latency and traffic."""
+    table_rates = {}
+    for entry in rates:
+        name, _, rate = entry.partition('=')
+        try:
+            table_rates[name] = float(rate)
+        except ValueError:
+            click.echo(f"Rates must be given as TABLE=ROWS, got '{entry}'.")
+            sys.exit(1)
+
+    builder = ReplicationBuilder(properties)
+    try:
+        simulator = simulation.ReplicationSimulator(builder, duration, table_rates, bandwidth * 1024 if bandwidth else None, seed)
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+
+    report = simulator.run()
+    click.echo(json.dumps(report.to_dict(), indent=2) if as_json else str(report))
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-o', '--output', required=True, help='Directory to write the generated rows to.')
+@click.option('--table-schema', type=click.Path(exists=True, dir_okay=False), help='Torque XML schema defining the tables, overriding the table-schema property.')
+@click.option('-n', '--rows', type=int, default=1000, show_default=True, help='Rows generated per table.')
+@click.option('-r', '--table-rows', multiple=True, help='Rows of a single table as TABLE=ROWS. May be repeated.')
+@click.option('-t', '--table', 'tables', multiple=True, help='Only generate rows for this table. May be repeated.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed. The same seed generates the same rows.')
+@click.option('--format', 'output_format', type=click.Choice(workload.WORKLOAD_FORMATS), default='sql', show_default=True, help='Output format.')
+@click.option('--per-store', is_flag=True, help="Write each store's rows to a directory named after its external ID.")
+@click.option('-j', '--jobs', type=int, default=1, show_default=True, help='Number of worker processes generating rows.')
+@click.option('-b', '--batch-size', type=int, default=500, show_default=True, help='Rows per multi-row INSERT.')
+@click.option('--dialect', type=click.Choice(sorted(sql_generator.DIALECT_MAX_ROWS)), help="SQL dialect of the inserts. Defaults to the parent node's db_driver dialect.")
+def gen_load(properties, output, table_schema=None, rows=1000, table_rows=(), tables=(), seed=0, output_format='sql',
+             per_store=False, jobs=1, batch_size=500, dialect=None):
+    """Generates synthetic rows for the replicated tables."""
+    counts = {}
+    for entry in table_rows:
+        name, _, count = entry.partition('=')
+        if not count.isdigit():
+            click.echo(f"Table rows must be given as TABLE=ROWS, got '{entry}'.")
+            sys.exit(1)
+        counts[name] = int(count)
+
+    builder = ReplicationBuilder(properties, table_schema=table_schema)
+    generator = workload.WorkloadGenerator(builder, output, rows, counts, seed, output_format, per_store, jobs,
+                                           batch_size, dialect, list(tables))
+    for name in generator.skipped_tables:
+        click.echo(f"Skipped {name}: no column definitions")
+
+    start = time.perf_counter()
+    written = generator.write()
+    seconds = time.perf_counter() - start
+    for name, count in written.items():
+        click.echo(f"{name:<40} {count:>12,} rows")
+    click.echo(f"Generated {sum(written.values()):,} rows in {seconds:.2f}s")
+
+@click.command(name='apply')
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-d', '--database', help="JDBC URL of the database to load the configuration into. Defaults to the parent node's db_url.")
+@click.option('--no-executemany', is_flag=True, help='Execute each statement separately instead of batching inserts per table.')
+@click.option('--delta', 'only_changes', is_flag=True, help='Only delete, update and insert the configuration rows that differ, keeping node registrations.')
+def apply_config(properties, database=None, no_executemany=False, only_changes=False):
+    """Loads the generated configuration into the parent node's database."""
+    builder = ReplicationBuilder(properties)
+    applier = ConfigurationApplier(builder, database, executemany=not no_executemany, delta=only_changes)
+    try:
+        timings = applier.apply()
+    except DatabaseError as e:
+        click.echo(f"Unable to connect to database: {e}")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Configuration was rolled back: {e}")
+        sys.exit(1)
+
+    click.echo(f"{'Section':<30} {'Statements':>10} {'Rows':>8} {'Seconds':>9}")
+    for timing in timings:
+        click.echo(f"{timing.section:<30} {timing.statements:>10} {timing.rows:>8} {timing.seconds:>9.4f}")
+    if only_changes:
+        click.echo(delta.format_summary(applier.changes))
+    click.echo(f"Applied configuration to {applier.url} in {sum(timing.seconds for timing in timings):.4f}s")
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-d', '--database', 'url', help="JDBC URL of the database holding the current configuration. Defaults to the parent node's db_url.")
+@click.option('--snapshot', type=click.Path(exists=True, dir_okay=False), help='Configuration snapshot to compare with instead of the database.')
+@click.option('-o', '--output', type=click.Path(dir_okay=False, writable=True), help='File to write the statements to instead of printing them.')
+@click.option('--write-snapshot', type=click.Path(dir_okay=False, writable=True), help='Write the generated configuration as a snapshot, to compare the next change with.')
+def diff_config(properties, url=None, snapshot=None, output=None, write_snapshot=None):
+    """Writes only the SQL statements changing the current configuration."""
+    builder = ReplicationBuilder(properties)
+    desired = delta.builder_rows(builder)
+    try:
+        if snapshot:
+            current = delta.read_snapshot(snapshot)
+        else:
+            parent = builder.parent_node()
+            with database.default_pool.connection(url or parent.get('db_url'), parent.get('db_user'), parent.get('db_password')) as (connection, _):
+                cursor = connection.cursor()
+                try:
+                    current = delta.read_database_rows(cursor)
+                finally:
+                    cursor.close()
+    except Exception as e:
+        click.echo(f"Unable to read the current configuration: {e}")
+        sys.exit(1)
+
+    changes = delta.diff_rows(desired, current)
+    text = ''.join(f"{change.statement}\n" for change in changes)
+    if output:
+        with open(output, 'w') as output_file:
+            output_file.write(text)
+        click.echo(f"{delta.format_summary(changes)}, written to {output}")
+    else:
+        click.echo(text + f"-- {delta.format_summary(changes)}")
+    if write_snapshot:
+        delta.write_snapshot(write_snapshot, desired)
+
+@click.command()
+@click.option('-p', '--properties', required=True, help='Manager replication properties JSON file.')
+@click.option('-n', '--node', help="Engine name of the node whose database is read. Defaults to the parent node.")
+@click.option('-d', '--database', help="JDBC URL of the database to read, overriding the node's db_url.")
+@click.option('--schema', help='Schema to read. Defaults to the database of the URL, or public for PostgreSQL.')
+@click.option('-c', '--channel', help='Channel of discovered tables. Defaults to the first configured channel.')
+@click.option('-r', '--route', type=click.Choice(['parent-child', 'child-parent']), help='Route of discovered tables. Defaults to parent-child for bi-directional replication.')
+@click.option('-i', '--include', multiple=True, help='Only discover tables matching this pattern, e.g. "sale_*". May be repeated.')
+@click.option('-x', '--exclude', multiple=True, help='Skip tables matching this pattern. May be repeated.')
+@click.option('-o', '--output', help='File to write the properties to. Defaults to updating the properties file.')
+@click.option('--cache-dir', help='Directory of cached catalog snapshots.')
+@click.option('--refresh', is_flag=True, help='Read the catalog even if a cached snapshot matches the schema.')
+def discover(properties, node=None, database=None, schema=None, channel=None, route=None, include=(), exclude=(),
+             output=None, cache_dir=None, refresh=False):
+    """Adds a node database's tables to the tables section of a properties file."""
+    config = load_properties(properties)
+    nodes = [nd for nd in config.get('nodes', []) if (nd.get('engine_name') == node if node else nd.get('type') == 'parent')]
+    if not nodes and not database:
+        click.echo(f"Node '{node}' is not configured." if node else 'No parent node is configured.')
+        sys.exit(1)
+    source = nodes[0] if nodes else {}
+    url = database or source.get('db_url')
+    if not url:
+        click.echo(f"Node '{source.get('engine_name')}' has no db_url.")
+        sys.exit(1)
+
+    try:
+        catalog, cached = discover_catalog(url, source.get('db_user'), source.get('db_password'), schema,
+                                           CatalogCache(cache_dir), refresh)
+    except DatabaseError as e:
+        click.echo(f"Unable to connect to database: {e}")
+        sys.exit(1)
+
+    if channel is None:
+        channel = config['channels'][0]['id'] if config.get('channels') else 'default'
+    if route is None and config.get('replication-arch') not in ['parent-child', 'child-parent']:
+        route = 'parent-child'
+
+    existing = config.get('tables', [])
+    config['tables'] = tables_section(catalog, existing, channel, route, list(include), list(exclude))
+    with open(output or properties, 'w') as properties_file:
+        json.dump(config, properties_file, indent=4)
+        properties_file.write('\n')
+
+    source_name = 'cached catalog' if cached else 'catalog'
+    click.echo(f"Added {len(config['tables']) - len(existing)} of {len(catalog['tables'])} table(s) from the {source_name} of {url}")
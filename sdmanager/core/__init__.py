@@ -1,3 +1,23 @@
+import importlib
 
-from sdmanager.core.validator import Validator
-from sdmanager.core.replication_builder import ReplicationBuilder
\ No newline at end of file
+# Note: The builder and validator are imported on first access, so that
+# importing a light module such as `sdmanager.core.sql_generator` does not
+# load the whole package.
+_LAZY_ATTRIBUTES = {
+    'Validator': 'sdmanager.core.validator',
+    'ReplicationBuilder': 'sdmanager.core.replication_builder',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,194 @@
+import time
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, NamedTuple
+from sdmanager.core import database, delta
+from sdmanager.core.sql_generator import InsertStatement, SqlExpression
+
+# Note: Statements written literally in `sql.st`, such as the deletes
+# clearing the previous configuration, are reported as the 'template' section.
+TEMPLATE_SECTION = 'template'
+
+
+class SectionTiming(NamedTuple):
+    section: str
+    statements: int
+    rows: int
+    seconds: float
+
+
+def split_statements(text: str) -> tuple[list[str], str]:
+    """
+    Splits SQL text into complete statements, dropping `--` comments
+
+    Returns
+    -------
+    tuple[list[str], str]
+        Complete statements and the text following the last one
+    """
+    lines = [line.split('--', 1)[0] for line in text.split('\n')]
+    *statements, remainder = '\n'.join(lines).split(';')
+    return [statement.strip() for statement in statements if statement.strip()], remainder
+
+
+def iter_template_statements(template, text_sections: dict[str, Callable[[], Iterable[str]]],
+                             statement_sections: dict[str, Callable[[], Iterable[str]]]) -> Iterator[tuple[str, str]]:
+    """
+    Yields each statement of a SQL template with the section it belongs to
+
+    Sections whose placeholder starts a statement are taken from
+    statement_sections, keeping their statement objects. Placeholders
+    inside a statement, like the channel list of a delete, are filled
+    from text_sections.
+
+    Returns
+    -------
+    Iterator[tuple[str, str]]
+        Section name and statement
+    """
+    pending = ''
+    for literal, name in template.parts:
+        statements, pending = split_statements(pending + literal)
+        for statement in statements:
+            yield TEMPLATE_SECTION, statement
+
+        if name is None:
+            break
+        if name in statement_sections and not pending.strip():
+            pending = ''
+            for statement in statement_sections[name]():
+                yield name, statement
+        elif name in text_sections:
+            pending += ''.join(text_sections[name]())
+        else:
+            raise KeyError(name)
+
+    if pending.strip():
+        yield TEMPLATE_SECTION, pending.strip()
+
+
+class ConfigurationApplier():
+    """Executes a builder's configuration SQL against a database over DB-API
+
+    All statements run in one transaction, which is rolled back if any
+    statement fails. Consecutive inserts into the same table are sent with
+    `executemany` rather than one round trip per row.
+
+    With `delta`, the configuration rows are read first and only the rows
+    that differ are deleted, updated or inserted, instead of clearing and
+    reloading the whole configuration.
+    """
+
+    def __init__(self, builder, url: str = None, user: str = None, password: str = None,
+                 pool: database.ConnectionPool = None, executemany: bool = True, chunk_size: int = 1000,
+                 delta: bool = False) -> None:
+        parent = builder.parent_node()
+        self.builder = builder
+        self.url = url or parent.get('db_url')
+        self.user = user if user is not None else parent.get('db_user')
+        self.password = password if password is not None else parent.get('db_password')
+        self.pool = pool or database.default_pool
+        self.executemany = executemany
+        self.chunk_size = chunk_size
+        self.delta = delta
+        self.changes = []
+
+    def statements(self, cursor=None) -> Iterator[tuple[str, str]]:
+        if self.delta:
+            self.changes = delta.diff_rows(delta.builder_rows(self.builder), delta.read_database_rows(cursor))
+            return ((f"{change.action} {change.table}", change.statement) for change in self.changes)
+        return iter_template_statements(self.builder.templates.get('sql'), self.builder.sql_sections(),
+                                        self.builder.sql_statement_sections())
+
+    def apply(self) -> list[SectionTiming]:
+        """
+        Applies the configuration in a single transaction
+
+        Raises
+        ------
+        DatabaseError
+            If the database cannot be connected to
+        Exception
+            The DB-API module's error if a statement fails. The
+            transaction is rolled back.
+
+        Returns
+        -------
+        list[SectionTiming]
+            Statements, rows and time taken by each section
+        """
+        timings = []
+        with self.pool.connection(self.url, self.user, self.password) as (connection, module):
+            cursor = connection.cursor()
+            try:
+                for section, statements in groupby(self.statements(cursor), key=lambda item: item[0]):
+                    start = time.perf_counter()
+                    executed, rows = self.execute(cursor, module, (statement for _, statement in statements))
+                    timings.append(SectionTiming(section, executed, rows, time.perf_counter() - start))
+                connection.commit()
+            finally:
+                cursor.close()
+
+        return timings
+
+    def execute(self, cursor, module, statements: Iterable[str]) -> tuple[int, int]:
+        """
+        Executes statements, batching consecutive inserts into the same
+        table and columns
+
+        Returns
+        -------
+        tuple[int, int]
+            Number of database calls and rows written
+        """
+        calls = 0
+        rows = 0
+        batch = []
+        batch_key = None
+
+        def flush():
+            nonlocal calls, batch
+            if batch:
+                cursor.executemany(parameterised_insert(batch[0], module), list(batch_params(batch)))
+                calls += 1
+                batch = []
+
+        for statement in statements:
+            if not self.executemany or not isinstance(statement, InsertStatement):
+                flush()
+                cursor.execute(str(statement).rstrip().rstrip(';'))
+                calls += 1
+                rows += 1 if isinstance(statement, InsertStatement) else max(cursor.rowcount, 0)
+                continue
+
+            key = insert_key(statement)
+            if batch and (key != batch_key or len(batch) >= self.chunk_size):
+                flush()
+            batch_key = key
+            batch.append(statement)
+            rows += 1
+
+        flush()
+        return calls, rows
+
+
+def insert_key(statement: InsertStatement) -> tuple:
+    """Inserts sharing a key can share one parameterised statement"""
+    expressions = tuple(param if isinstance(param, SqlExpression) else None for param in statement.params)
+    return statement.table.lower(), statement.columns, expressions
+
+
+def parameterised_insert(statement: InsertStatement, module) -> str:
+    values = []
+    position = 0
+    for param in statement.params:
+        if isinstance(param, SqlExpression):
+            values.append(str(param))
+        else:
+            values.append(database.placeholder(module, position))
+            position += 1
+    return f"insert into {statement.table} ({statement.columns}) values ({', '.join(values)})"
+
+
+def batch_params(batch: list[InsertStatement]) -> Iterator[tuple]:
+    for statement in batch:
+        yield tuple(param for param in statement.params if not isinstance(param, SqlExpression))
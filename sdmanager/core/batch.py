@@ -0,0 +1,169 @@
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Iterator, NamedTuple, Optional
+from sdmanager.core import templates
+from sdmanager.core.properties_reader import PROPERTIES_FILE
+from sdmanager.core.replication_builder import ReplicationBuilder
+
+# Note: Each deployment is built by a single process, rendering its nodes
+# serially, so the pool never nests. Templates are compiled before the pool
+# starts and cached per process by `templates.registry_for`, so every
+# deployment a worker builds reuses them.
+
+PRELOADED_TEMPLATES = ['parent', 'router', 'child', 'sql']
+
+
+class DeploymentResult(NamedTuple):
+    """Outcome of building one deployment"""
+    name: str
+    properties: str
+    output_dir: str
+    nodes: int
+    failures: list
+    seconds: float
+    error: Optional[str]
+    log: str
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failures
+
+
+def expand_properties(patterns: list[str]) -> list[str]:
+    """
+    Expands glob patterns into properties files or fragment directories,
+    keeping the order given and dropping duplicates
+
+    Raises
+    ------
+    ValueError
+        If a pattern matches nothing
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise ValueError(f"No properties match '{pattern}'")
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def deployment_name(path: str) -> str:
+    """
+    Names a deployment after its properties file without the extension,
+    or after its directory of fragments
+    """
+    path = os.path.normpath(path)
+    if os.path.isdir(path) or os.path.basename(path) == PROPERTIES_FILE:
+        path = path if os.path.isdir(path) else os.path.dirname(path)
+        return os.path.basename(os.path.abspath(path))
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def deployment_dirs(paths: list[str], output_dir: str) -> dict[str, str]:
+    """
+    Maps each properties path to its output directory, named after the
+    deployment under output_dir
+
+    Raises
+    ------
+    ValueError
+        If two deployments have the same name
+    """
+    dirs = {}
+    names = {}
+    for path in paths:
+        name = deployment_name(path)
+        if name in names:
+            raise ValueError(f"Deployments '{names[name]}' and '{path}' would both be built into '{name}'")
+        names[name] = path
+        dirs[path] = os.path.join(output_dir, name)
+    return dirs
+
+
+def build_deployment(task) -> DeploymentResult:
+    """
+    Builds a deployment into its output directory, capturing the builder's
+    output. Module level so it can run in a process pool worker.
+    """
+    path, output_dir, options = task
+    name = deployment_name(path)
+    log = io.StringIO()
+    start = time.perf_counter()
+    nodes = 0
+    try:
+        with redirect_stdout(log):
+            builder = ReplicationBuilder(path, output_dir, **options)
+            os.makedirs(output_dir, exist_ok=True)
+            failures = builder.generate_files()
+            nodes = len(builder.properties['nodes'])
+    except (SystemExit, Exception) as e:
+        return DeploymentResult(name, path, output_dir, nodes, [], time.perf_counter() - start, str(e) or type(e).__name__, log.getvalue())
+    return DeploymentResult(name, path, output_dir, nodes, failures, time.perf_counter() - start, None, log.getvalue())
+
+
+def build_deployments(paths: list[str], output_dir: str, jobs: int = 1, **options) -> Iterator[DeploymentResult]:
+    """
+    Builds each deployment into `<output_dir>/<name>`, `jobs` at a time
+
+    Parameter
+    ---------
+    paths : list[str]
+        Properties files or directories of fragments
+    output_dir : str
+        Directory of the deployments' output directories
+    jobs : int
+        Number of deployments built at once
+    options
+        `ReplicationBuilder` options applied to every deployment
+
+    Returns
+    -------
+    Iterator[DeploymentResult]
+        Results in the order of paths
+    """
+    dirs = deployment_dirs(paths, output_dir)
+    registry = templates.registry_for(options.get('template_dirs'))
+    for name in PRELOADED_TEMPLATES:
+        try:
+            registry.get(name)
+        except FileNotFoundError:
+            pass
+
+    tasks = [(path, dirs[path], {**options, 'jobs': 1}) for path in paths]
+    jobs = max(1, min(jobs or 1, len(tasks)))
+    if jobs == 1:
+        yield from map(build_deployment, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(build_deployment, tasks)
+
+
+def format_summary(results: list[DeploymentResult], seconds: float = None) -> str:
+    """Formats one line per deployment, the errors of failed ones and totals"""
+    lines = [f"{'Deployment':<30} {'Status':<8} {'Nodes':>7} {'Seconds':>9}"]
+    for result in results:
+        status = 'ok' if result.ok else 'failed'
+        lines.append(f"{result.name:<30} {status:<8} {result.nodes:>7} {result.seconds:>9.3f}")
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        lines.append('')
+        lines.append(f"{result.name} ({result.properties}):")
+        if result.error:
+            lines.append(f"  {result.error}")
+        for engine_name, error in result.failures:
+            lines.append(f"  {engine_name}: {error}")
+
+    total = seconds if seconds is not None else sum(result.seconds for result in results)
+    lines.append('')
+    lines.append(f"Built {len(results) - len(failed)} of {len(results)} deployment(s), "
+                 f"{sum(result.nodes for result in results)} node(s), in {total:.3f}s")
+    return '\n'.join(lines)
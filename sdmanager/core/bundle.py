@@ -0,0 +1,294 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import posixpath
+import tarfile
+import time
+import zipfile
+from typing import NamedTuple
+
+# Note: A node's bundle is built in memory from its rendered properties and
+# written once, so no uncompressed file is ever staged on disk. The combined
+# archive is an uncompressed tar or zip of the node bundles, and its index
+# records where each bundle's bytes start, so a single node is extracted by
+# reading just its bundle.
+
+BUNDLE_FORMATS = ['tar.gz', 'zip']
+# Directories of a SymmetricDS engine installation created by each bundle
+ENGINE_LAYOUT = ['engines/', 'logs/', 'tmp/']
+CHECKSUM_FILE = 'SHA256SUMS'
+COMBINED_NAME = 'nodes'
+INDEX_MEMBER = 'index.json'
+
+
+class IndexEntry(NamedTuple):
+    """Location of a node's bundle in a combined archive"""
+    member: str
+    offset: int
+    size: int
+    sha256: str
+
+
+def bundle_suffix(bundle_format: str) -> str:
+    return f".{bundle_format}"
+
+
+def combined_archive_name(bundle_format: str) -> str:
+    """Names the combined archive, a tar of `.tar.gz` bundles or a zip of `.zip` bundles"""
+    return f"{COMBINED_NAME}.{'tar' if bundle_format == 'tar.gz' else 'zip'}"
+
+
+def index_path(archive_path: str) -> str:
+    return f"{archive_path}.index.json"
+
+
+def node_bundle(engine_name: str, properties: str, bundle_format: str, mtime: int = None) -> bytes:
+    """
+    Builds a node's bundle: its properties file in the engine directory
+    layout and a `SHA256SUMS` manifest of the files
+
+    Parameter
+    ---------
+    engine_name : str
+        Node engine name
+    properties : str
+        Rendered node properties
+    bundle_format : str
+        `tar.gz` or `zip`
+    mtime : int
+        Modification time of the entries, defaults to now
+
+    Returns
+    -------
+    bytes
+        Compressed bundle
+    """
+    mtime = int(time.time()) if mtime is None else mtime
+    content = properties.encode('utf-8')
+    name = f"engines/{engine_name}.properties"
+    checksums = f"{hashlib.sha256(content).hexdigest()}  {name}\n".encode('utf-8')
+    files = [(name, content), (CHECKSUM_FILE, checksums)]
+
+    buffer = io.BytesIO()
+    if bundle_format == 'zip':
+        date_time = time.localtime(max(mtime, 315532800))[:6]
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for directory in ENGINE_LAYOUT:
+                archive.writestr(zipfile.ZipInfo(directory, date_time), b'')
+            for file_name, data in files:
+                info = zipfile.ZipInfo(file_name, date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, data)
+        return buffer.getvalue()
+
+    if bundle_format != 'tar.gz':
+        raise ValueError(f"Bundle format must be one of {BUNDLE_FORMATS}")
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=mtime) as compressed, \
+            tarfile.open(fileobj=compressed, mode='w', format=tarfile.PAX_FORMAT) as archive:
+        for directory in ENGINE_LAYOUT:
+            info = tarfile.TarInfo(directory.rstrip('/'))
+            info.type, info.mode, info.mtime = tarfile.DIRTYPE, 0o755, mtime
+            archive.addfile(info)
+        for file_name, data in files:
+            info = tarfile.TarInfo(file_name)
+            info.size, info.mode, info.mtime = len(data), 0o644, mtime
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class CombinedArchive():
+    """Appends node bundles to one uncompressed archive and indexes them
+
+    Written to a temporary file and moved into place, along with the index
+    next to it, when closed without error.
+    """
+
+    def __init__(self, path: str, bundle_format: str) -> None:
+        if bundle_format not in BUNDLE_FORMATS:
+            raise ValueError(f"Bundle format must be one of {BUNDLE_FORMATS}")
+        self.path = path
+        self.bundle_format = bundle_format
+        self.tmp_path = f"{path}.tmp"
+        self.index = {}
+        if bundle_format == 'zip':
+            self.archive = zipfile.ZipFile(self.tmp_path, 'w', zipfile.ZIP_STORED)
+        else:
+            self.archive = tarfile.open(self.tmp_path, 'w', format=tarfile.PAX_FORMAT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, engine_name: str, content: bytes) -> IndexEntry:
+        """Appends a node's bundle"""
+        member = f"{engine_name}{bundle_suffix(self.bundle_format)}"
+        self.write_member(member, content)
+        entry = IndexEntry(member, self.data_offset, len(content), hashlib.sha256(content).hexdigest())
+        self.index[engine_name] = entry
+        return entry
+
+    def write_member(self, member: str, content: bytes) -> None:
+        if self.bundle_format == 'zip':
+            info = zipfile.ZipInfo(member, time.localtime()[:6])
+            self.archive.writestr(info, content)
+            # Stored data follows the local header, its name and extra field
+            self.data_offset = info.header_offset + 30 + len(info.filename.encode('utf-8')) + len(info.extra)
+        else:
+            info = tarfile.TarInfo(member)
+            info.size, info.mode, info.mtime = len(content), 0o644, int(time.time())
+            self.archive.addfile(info, io.BytesIO(content))
+            # Data is padded to whole blocks after the member's headers
+            blocks, remainder = divmod(len(content), tarfile.BLOCKSIZE)
+            self.data_offset = self.archive.offset - (blocks + bool(remainder)) * tarfile.BLOCKSIZE
+
+    def index_document(self) -> dict:
+        return {
+            'format': self.bundle_format,
+            'archive': os.path.basename(self.path),
+            'nodes': {engine_name: entry._asdict() for engine_name, entry in self.index.items()},
+        }
+
+    def close(self) -> None:
+        """Writes the index into the archive and next to it"""
+        document = self.index_document()
+        encoded = json.dumps(document, indent=1, sort_keys=True).encode('utf-8')
+        self.write_member(INDEX_MEMBER, encoded)
+        self.archive.close()
+        os.replace(self.tmp_path, self.path)
+
+        tmp_index = f"{index_path(self.path)}.tmp"
+        with open(tmp_index, 'wb') as index_file:
+            index_file.write(encoded)
+        os.replace(tmp_index, index_path(self.path))
+
+    def abort(self) -> None:
+        self.archive.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def read_index(archive_path: str) -> dict:
+    """
+    Reads a combined archive's index, from the file next to it or else
+    from the archive itself
+
+    Raises
+    ------
+    ValueError
+        If the archive has no index
+    """
+    try:
+        with open(index_path(archive_path), 'rb') as index_file:
+            return json.load(index_file)
+    except FileNotFoundError:
+        pass
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            if INDEX_MEMBER in archive.namelist():
+                return json.loads(archive.read(INDEX_MEMBER))
+    else:
+        with tarfile.open(archive_path, 'r:') as archive:
+            for info in archive:
+                if info.name == INDEX_MEMBER:
+                    return json.load(archive.extractfile(info))
+    raise ValueError(f"{archive_path} has no node index")
+
+
+def read_node_bundle(archive_path: str, engine_name: str, index: dict = None) -> tuple[bytes, str]:
+    """
+    Reads a node's bundle from a combined archive, seeking straight to it
+
+    Raises
+    ------
+    KeyError
+        If the node is not in the archive
+    ValueError
+        If the bundle does not match its checksum
+
+    Returns
+    -------
+    tuple[bytes, str]
+        Bundle content and format
+    """
+    index = read_index(archive_path) if index is None else index
+    if engine_name not in index['nodes']:
+        raise KeyError(f"Node '{engine_name}' is not in {archive_path}")
+    entry = IndexEntry(**index['nodes'][engine_name])
+
+    with open(archive_path, 'rb') as archive_file:
+        archive_file.seek(entry.offset)
+        content = archive_file.read(entry.size)
+    if hashlib.sha256(content).hexdigest() != entry.sha256:
+        raise ValueError(f"Bundle of node '{engine_name}' does not match its checksum in {archive_path}")
+    return content, index['format']
+
+
+def extract_bundle(content: bytes, bundle_format: str, destination: str) -> list[str]:
+    """
+    Extracts a node's bundle and checks its files against `SHA256SUMS`
+
+    Raises
+    ------
+    ValueError
+        If an entry would be written outside the destination or a file
+        does not match its checksum
+
+    Returns
+    -------
+    list[str]
+        Names of the extracted files
+    """
+    files = {}
+    if bundle_format == 'zip':
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            directories = []
+            for info in archive.infolist():
+                check_member_name(info.filename)
+                if info.is_dir():
+                    directories.append(info.filename)
+                else:
+                    files[info.filename] = archive.read(info)
+    else:
+        with tarfile.open(fileobj=io.BytesIO(content), mode='r:gz') as archive:
+            directories = []
+            for info in archive:
+                check_member_name(info.name)
+                if info.isdir():
+                    directories.append(info.name)
+                elif info.isfile():
+                    files[info.name] = archive.extractfile(info).read()
+
+    verify_checksums(files)
+    for directory in directories:
+        os.makedirs(os.path.join(destination, directory), exist_ok=True)
+    for name, data in files.items():
+        path = os.path.join(destination, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as extracted_file:
+            extracted_file.write(data)
+    return sorted(files)
+
+
+def check_member_name(name: str) -> None:
+    normalized = posixpath.normpath(name)
+    if name.startswith('/') or normalized == '..' or normalized.startswith('../'):
+        raise ValueError(f"Bundle entry '{name}' is outside the bundle")
+
+
+def verify_checksums(files: dict[str, bytes]) -> None:
+    """Checks bundle files against the hashes listed in `SHA256SUMS`"""
+    if CHECKSUM_FILE not in files:
+        raise ValueError(f"Bundle has no {CHECKSUM_FILE}")
+    for line in files[CHECKSUM_FILE].decode('utf-8').splitlines():
+        digest, _, name = line.partition('  ')
+        if name not in files or hashlib.sha256(files[name]).hexdigest() != digest:
+            raise ValueError(f"Bundle file '{name}' does not match its checksum")
@@ -0,0 +1,156 @@
+import math
+from typing import NamedTuple, Optional
+
+# Note: Channel sizing follows from the expected change rate of the tables
+# on each channel. Rates are declared per table with `rows-per-second` and
+# `avg-row-bytes`; channel fields set in the properties always win.
+
+CHANNEL_TUNING_KEYS = ['processing-order', 'max-batch-size', 'max-batch-to-send', 'max-data-to-route', 'queue']
+TABLE_RATE_KEYS = ['rows-per-second', 'avg-row-bytes']
+
+DEFAULT_ROW_BYTES = 512
+# Payload a batch is sized to, so a batch is a single reasonable HTTP request
+TARGET_BATCH_BYTES = 1 << 20
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 100000
+MIN_BATCHES_TO_SEND = 10
+MAX_BATCHES_TO_SEND = 1000
+MIN_DATA_TO_ROUTE = 10000
+MAX_DATA_TO_ROUTE = 10000000
+# Capacity kept above the expected rate to catch up after an outage
+HEADROOM = 2
+# Channels carrying at least this share of the bytes get their own queue,
+# and so their own push and pull threads
+DEDICATED_QUEUE_SHARE = 0.25
+DEFAULT_QUEUE = 'default'
+
+
+class ChannelPlan(NamedTuple):
+    channel_id: str
+    processing_order: int
+    max_batch_size: Optional[int]
+    max_batch_to_send: Optional[int]
+    max_data_to_route: Optional[int]
+    queue: Optional[str]
+    rows_per_second: Optional[float]
+    bytes_per_second: Optional[float]
+    rationale: tuple
+
+
+def clamp(value: float, minimum: int, maximum: int) -> int:
+    return int(min(max(math.ceil(value), minimum), maximum))
+
+
+def channel_rates(channels: list[dict], tables) -> dict[str, tuple[float, float]]:
+    """
+    Sums the expected rows and bytes per second of the tables on each
+    channel. Channels without a table declaring a rate are left out.
+    """
+    rates = {}
+    channel_ids = {channel['id'] for channel in channels}
+    for table in tables:
+        if table.get('rows-per-second') is None or table.get('channel') not in channel_ids:
+            continue
+        rows = float(table['rows-per-second'])
+        row_bytes = float(table.get('avg-row-bytes', DEFAULT_ROW_BYTES))
+        total_rows, total_bytes = rates.get(table['channel'], (0.0, 0.0))
+        rates[table['channel']] = (total_rows + rows, total_bytes + rows * row_bytes)
+    return rates
+
+
+def plan_channels(channels: list[dict], tables, push_period_ms: int = 10000,
+                  routing_period_ms: int = 5000) -> list[ChannelPlan]:
+    """
+    Plans the batching, ordering and queue of each channel
+
+    - `max_batch_size` fits a push period of rows in a batch of about
+      `TARGET_BATCH_BYTES`.
+    - `max_batch_to_send` sends a push period of batches `HEADROOM` times over.
+    - `max_data_to_route` routes a routing period of rows `HEADROOM` times over.
+    - `processing_order` sends low volume channels, typically reference
+      data, first so they are not queued behind bulk data.
+    - `queue` gives channels with `DEDICATED_QUEUE_SHARE` of the bytes
+      their own thread.
+
+    Parameter
+    ---------
+    channels : list[dict]
+        Configured channels
+    tables : Iterable[dict]
+        Configured tables, with optional `rows-per-second` and `avg-row-bytes`
+    push_period_ms, routing_period_ms : int
+        Push and routing job periods
+
+    Returns
+    -------
+    list[ChannelPlan]
+        Plans in channel order
+    """
+    rates = channel_rates(channels, tables)
+    total_bytes = sum(bytes_per_second for _, bytes_per_second in rates.values())
+    push_seconds = push_period_ms / 1000
+    routing_seconds = routing_period_ms / 1000
+
+    # Known rates ascending, then channels without a rate as declared
+    ranked = sorted(range(len(channels)), key=lambda idx: (channels[idx]['id'] not in rates, rates.get(channels[idx]['id'], (0, 0))[1], idx))
+    order = {channels[idx]['id']: position + 1 for position, idx in enumerate(ranked)}
+
+    plans = []
+    for channel in channels:
+        channel_id = channel['id']
+        rationale = []
+        batch_size = batch_to_send = data_to_route = queue = None
+        rows_per_second = bytes_per_second = None
+
+        if channel_id in rates:
+            rows_per_second, bytes_per_second = rates[channel_id]
+            row_bytes = bytes_per_second / rows_per_second if rows_per_second else DEFAULT_ROW_BYTES
+            rows_per_push = rows_per_second * push_seconds
+            batch_size = clamp(min(TARGET_BATCH_BYTES / max(row_bytes, 1), max(rows_per_push, MIN_BATCH_SIZE)),
+                               MIN_BATCH_SIZE, MAX_BATCH_SIZE)
+            rationale.append(f"{rows_per_second:g} rows/s of {row_bytes:.0f} bytes, {rows_per_push:.0f} rows per {push_seconds:g}s push")
+            batch_to_send = clamp(rows_per_push / batch_size * HEADROOM, MIN_BATCHES_TO_SEND, MAX_BATCHES_TO_SEND)
+            data_to_route = clamp(rows_per_second * routing_seconds * HEADROOM, MIN_DATA_TO_ROUTE, MAX_DATA_TO_ROUTE)
+            rationale.append(f"batches of {batch_size} rows, {batch_to_send} per push and {data_to_route} rows per routing run with {HEADROOM}x headroom")
+
+            queue = DEFAULT_QUEUE
+            if total_bytes and bytes_per_second / total_bytes >= DEDICATED_QUEUE_SHARE and len(rates) > 1:
+                queue = channel_id
+                rationale.append(f"{bytes_per_second / total_bytes:.0%} of bytes, on its own queue")
+        else:
+            rationale.append('no expected rate, SymmetricDS defaults')
+
+        planned = {
+            'processing-order': order[channel_id],
+            'max-batch-size': batch_size,
+            'max-batch-to-send': batch_to_send,
+            'max-data-to-route': data_to_route,
+            'queue': queue,
+        }
+        overridden = [key for key in CHANNEL_TUNING_KEYS if channel.get(key) is not None]
+        for key in overridden:
+            planned[key] = channel[key]
+        if overridden:
+            rationale.append(f"{', '.join(overridden)} set in properties")
+
+        plans.append(ChannelPlan(channel_id, planned['processing-order'], planned['max-batch-size'],
+                                 planned['max-batch-to-send'], planned['max-data-to-route'], planned['queue'],
+                                 rows_per_second, bytes_per_second, tuple(rationale)))
+    return plans
+
+
+def format_plans(plans: list[ChannelPlan]) -> str:
+    """Formats channel plans as a table followed by each plan's rationale"""
+    def cell(value):
+        return '-' if value is None else str(value)
+
+    lines = [f"{'Channel':<24} {'Order':>5} {'Batch':>7} {'Send':>5} {'Route':>9} {'Queue':<16} {'Rows/s':>9} {'KiB/s':>9}"]
+    for plan in sorted(plans, key=lambda plan: plan.processing_order):
+        rows = '-' if plan.rows_per_second is None else f"{plan.rows_per_second:g}"
+        kib = '-' if plan.bytes_per_second is None else f"{plan.bytes_per_second / 1024:.1f}"
+        lines.append(f"{plan.channel_id:<24} {plan.processing_order:>5} {cell(plan.max_batch_size):>7} "
+                     f"{cell(plan.max_batch_to_send):>5} {cell(plan.max_data_to_route):>9} {cell(plan.queue):<16} {rows:>9} {kib:>9}")
+    lines.append('')
+    for plan in plans:
+        lines.append(f"{plan.channel_id}: {'; '.join(plan.rationale)}")
+    return '\n'.join(lines)
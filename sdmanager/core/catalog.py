@@ -0,0 +1,317 @@
+import fnmatch
+import glob
+import json
+import os
+from typing import Optional
+from sdmanager.core.database import connect, parse_jdbc_url, placeholder
+from sdmanager.core.manifest import fingerprint
+
+# Note: A catalog snapshot lists the tables of a schema with their columns,
+# primary key and foreign keys:
+#   {"tables": [{"name": "item",
+#                "columns": [{"name": "item_id", "type": "INTEGER", "nullable": false}],
+#                "primary_key": ["item_id"],
+#                "foreign_keys": [{"columns": ["store_id"], "foreign_table": "store",
+#                                  "foreign_columns": ["store_id"]}]}]}
+# SymmetricDS' own `sym_*` tables are never part of a snapshot.
+
+CATALOG_VERSION = 1
+SYM_TABLE_PREFIX = 'sym_'
+
+
+def schema_fingerprint(connection, module, subprotocol: str, schema: str = None) -> str:
+    """
+    Hashes the table definitions of a schema with a single cheap query,
+    so a cached snapshot can be checked without reading the catalog
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest
+    """
+    cursor = connection.cursor()
+    try:
+        if subprotocol == 'sqlite':
+            cursor.execute("select type, name, tbl_name, sql from sqlite_master order by type, name")
+        elif subprotocol == 'postgresql':
+            cursor.execute(
+                "select count(*), md5(string_agg(concat_ws('.', table_name, column_name, data_type, is_nullable), ','"
+                " order by table_name, ordinal_position)) from information_schema.columns"
+                f" where table_schema = {placeholder(module, 0)}", (schema,))
+        else:
+            cursor.execute(
+                "select count(*), sum(crc32(concat_ws('.', table_name, column_name, column_type, is_nullable, column_key)))"
+                f" from information_schema.columns where table_schema = {placeholder(module, 0)}", (schema,))
+        return fingerprint(subprotocol, schema, [list(row) for row in cursor.fetchall()])
+    finally:
+        cursor.close()
+
+
+def read_catalog(connection, module, subprotocol: str, schema: str = None) -> dict:
+    """
+    Reads the tables, columns and keys of a schema
+
+    Parameter
+    ---------
+    connection : Connection
+        Open DB-API connection
+    module : module
+        DB-API module of the connection
+    subprotocol : str
+        JDBC subprotocol, e.g. `sqlite`
+    schema : str
+        Schema (database for MySQL) to read. Ignored for sqlite
+
+    Returns
+    -------
+    dict
+        Catalog snapshot
+    """
+    if subprotocol == 'sqlite':
+        tables = _read_sqlite_tables(connection)
+    else:
+        tables = _read_information_schema_tables(connection, module, subprotocol, schema)
+
+    tables = [table for table in tables if not table['name'].lower().startswith(SYM_TABLE_PREFIX)]
+    return {'version': CATALOG_VERSION, 'tables': sorted(tables, key=lambda table: table['name'])}
+
+
+def _read_sqlite_tables(connection) -> list[dict]:
+    cursor = connection.cursor()
+    try:
+        cursor.execute("select name from sqlite_master where type = 'table' and name not like 'sqlite_%' order by name")
+        names = [row[0] for row in cursor.fetchall()]
+
+        tables = []
+        for name in names:
+            quoted = name.replace('"', '""')
+            cursor.execute(f'pragma table_info("{quoted}")')
+            columns = []
+            primary_key = []
+            for _, column, column_type, not_null, _, pk in cursor.fetchall():
+                columns.append({'name': column, 'type': column_type, 'nullable': not not_null and not pk})
+                if pk:
+                    primary_key.append((pk, column))
+
+            cursor.execute(f'pragma foreign_key_list("{quoted}")')
+            foreign_keys = {}
+            for fk_id, _, foreign_table, column, foreign_column, *_ in cursor.fetchall():
+                foreign_key = foreign_keys.setdefault(fk_id, {'columns': [], 'foreign_table': foreign_table, 'foreign_columns': []})
+                foreign_key['columns'].append(column)
+                foreign_key['foreign_columns'].append(foreign_column)
+
+            tables.append({
+                'name': name,
+                'columns': columns,
+                'primary_key': [column for _, column in sorted(primary_key)],
+                'foreign_keys': [foreign_keys[fk_id] for fk_id in sorted(foreign_keys)],
+            })
+        return tables
+    finally:
+        cursor.close()
+
+
+def _read_information_schema_tables(connection, module, subprotocol: str, schema: str) -> list[dict]:
+    param = placeholder(module, 0)
+    cursor = connection.cursor()
+    try:
+        tables = {}
+        cursor.execute(
+            "select c.table_name, c.column_name, c.data_type, c.is_nullable from information_schema.columns c"
+            " join information_schema.tables t on t.table_schema = c.table_schema and t.table_name = c.table_name"
+            f" where c.table_schema = {param} and t.table_type = 'BASE TABLE'"
+            " order by c.table_name, c.ordinal_position", (schema,))
+        for table_name, column, data_type, is_nullable in cursor.fetchall():
+            table = tables.setdefault(table_name, {'name': table_name, 'columns': [], 'primary_key': [], 'foreign_keys': []})
+            table['columns'].append({'name': column, 'type': data_type.upper(), 'nullable': is_nullable == 'YES'})
+
+        cursor.execute(
+            "select kcu.table_name, kcu.column_name from information_schema.table_constraints tc"
+            " join information_schema.key_column_usage kcu on kcu.constraint_schema = tc.constraint_schema"
+            " and kcu.constraint_name = tc.constraint_name and kcu.table_name = tc.table_name"
+            f" where tc.table_schema = {param} and tc.constraint_type = 'PRIMARY KEY'"
+            " order by kcu.table_name, kcu.ordinal_position", (schema,))
+        for table_name, column in cursor.fetchall():
+            if table_name in tables:
+                tables[table_name]['primary_key'].append(column)
+
+        if subprotocol == 'postgresql':
+            cursor.execute(
+                "select kcu.table_name, kcu.constraint_name, kcu.column_name, ref.table_name, ref.column_name"
+                " from information_schema.referential_constraints rc"
+                " join information_schema.key_column_usage kcu on kcu.constraint_schema = rc.constraint_schema"
+                " and kcu.constraint_name = rc.constraint_name"
+                " join information_schema.key_column_usage ref on ref.constraint_schema = rc.unique_constraint_schema"
+                " and ref.constraint_name = rc.unique_constraint_name and ref.ordinal_position = kcu.position_in_unique_constraint"
+                f" where kcu.table_schema = {param} order by kcu.table_name, kcu.constraint_name, kcu.ordinal_position", (schema,))
+        else:
+            cursor.execute(
+                "select table_name, constraint_name, column_name, referenced_table_name, referenced_column_name"
+                f" from information_schema.key_column_usage where table_schema = {param}"
+                " and referenced_table_name is not null order by table_name, constraint_name, ordinal_position", (schema,))
+
+        foreign_keys = {}
+        for table_name, constraint, column, foreign_table, foreign_column in cursor.fetchall():
+            if table_name not in tables:
+                continue
+            key = (table_name, constraint)
+            if key not in foreign_keys:
+                foreign_keys[key] = {'columns': [], 'foreign_table': foreign_table, 'foreign_columns': []}
+                tables[table_name]['foreign_keys'].append(foreign_keys[key])
+            foreign_keys[key]['columns'].append(column)
+            foreign_keys[key]['foreign_columns'].append(foreign_column)
+
+        return list(tables.values())
+    finally:
+        cursor.close()
+
+
+def default_schema(subprotocol: str, arguments: dict) -> Optional[str]:
+    if subprotocol == 'sqlite':
+        return None
+    if subprotocol == 'postgresql':
+        return arguments['options'].get('currentSchema', 'public')
+    return arguments['database']
+
+
+class CatalogCache():
+    """Catalog snapshots saved on disk between runs
+
+    Snapshots are stored as `<connection>-<schema>.json`, named after a
+    hash of the connection (URL, user and schema) and the schema
+    fingerprint, so a changed schema is read again while an unchanged one
+    is loaded from disk. Saving a snapshot replaces older snapshots of the
+    same connection.
+    """
+
+    def __init__(self, directory: str = None) -> None:
+        self.directory = directory or self.default_directory()
+
+    @staticmethod
+    def default_directory() -> str:
+        return os.path.join(os.path.expanduser('~'), '.cache', 'sdmanager', 'catalog')
+
+    @staticmethod
+    def connection_key(url: str, user: str = None, schema: str = None) -> str:
+        return fingerprint(url, user, schema)[:16]
+
+    def path(self, connection_key: str, schema_hash: str) -> str:
+        return os.path.join(self.directory, f"{connection_key}-{schema_hash[:16]}.json")
+
+    def load(self, connection_key: str, schema_hash: str) -> Optional[dict]:
+        """Returns a cached snapshot, or None if absent or unreadable"""
+        try:
+            with open(self.path(connection_key, schema_hash), 'r') as catalog_file:
+                catalog = json.load(catalog_file)
+        except (OSError, ValueError):
+            return None
+
+        if catalog.get('version') != CATALOG_VERSION or catalog.get('schema_fingerprint') != schema_hash:
+            return None
+        return catalog
+
+    def save(self, connection_key: str, schema_hash: str, catalog: dict) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(connection_key, schema_hash)
+        for stale in glob.glob(os.path.join(self.directory, f"{connection_key}-*.json")):
+            if stale != path:
+                os.remove(stale)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as catalog_file:
+            json.dump({**catalog, 'schema_fingerprint': schema_hash}, catalog_file)
+        os.replace(tmp_path, path)
+        return path
+
+
+def discover_catalog(url: str, user: str = None, password: str = None, schema: str = None,
+                     cache: CatalogCache = None, refresh: bool = False) -> tuple[dict, bool]:
+    """
+    Gets the catalog snapshot of a database, from the cache when the
+    schema fingerprint is unchanged
+
+    Parameter
+    ---------
+    url : str
+        JDBC URL of the database
+    user, password : str
+        Database credentials
+    schema : str
+        Schema to read. Defaults to the URL's database (MySQL) or `public`
+    cache : CatalogCache
+        Snapshot cache. None disables caching
+    refresh : bool
+        Read the catalog even if a cached snapshot matches
+
+    Raises
+    ------
+    DatabaseError
+        If the database cannot be connected to
+
+    Returns
+    -------
+    tuple[dict, bool]
+        The catalog snapshot and whether it was loaded from the cache
+    """
+    subprotocol, arguments = parse_jdbc_url(url)
+    schema = schema or default_schema(subprotocol, arguments)
+    connection, module = connect(url, user, password)
+    try:
+        schema_hash = schema_fingerprint(connection, module, subprotocol, schema)
+        connection_key = CatalogCache.connection_key(url, user, schema)
+        if cache is not None and not refresh:
+            catalog = cache.load(connection_key, schema_hash)
+            if catalog is not None:
+                return catalog, True
+
+        catalog = read_catalog(connection, module, subprotocol, schema)
+    finally:
+        connection.close()
+
+    if cache is not None:
+        cache.save(connection_key, schema_hash, catalog)
+    return catalog, False
+
+
+def tables_section(catalog: dict, existing: list[dict] = (), channel: str = None, route: str = None,
+                   include: list[str] = (), exclude: list[str] = ()) -> list[dict]:
+    """
+    Builds the `tables` section of the replication properties from a
+    catalog snapshot. Tables already configured keep their entries, in
+    their existing order, and discovered tables are appended.
+
+    Parameter
+    ---------
+    catalog : dict
+        Catalog snapshot
+    existing : list[dict]
+        Currently configured tables
+    channel : str
+        Channel of discovered tables
+    route : str
+        Route of discovered tables, omitted if None
+    include, exclude : list[str]
+        Shell-style table name patterns to include or exclude
+
+    Returns
+    -------
+    list[dict]
+        Table configurations
+    """
+    tables = list(existing)
+    configured = {table['name'] for table in tables}
+    for table in catalog['tables']:
+        name = table['name']
+        if name in configured:
+            continue
+        if include and not any(fnmatch.fnmatchcase(name, pattern) for pattern in include):
+            continue
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in exclude):
+            continue
+
+        entry = {'name': name, 'channel': channel}
+        if route is not None:
+            entry['route'] = route
+        tables.append(entry)
+        configured.add(name)
+    return tables
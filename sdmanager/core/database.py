@@ -0,0 +1,152 @@
+import importlib
+import threading
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlsplit
+
+# Note: Node `db_url`s are JDBC URLs. They are mapped onto a DB-API module
+# so generated configuration can be applied, or a catalog read, from Python.
+# Drivers other than sqlite3 are optional dependencies imported on use.
+
+DBAPI_MODULES = {
+    'sqlite': ('sqlite3', None),
+    'mysql': ('pymysql', 'PyMySQL'),
+    'mariadb': ('pymysql', 'PyMySQL'),
+    'postgresql': ('psycopg2', 'psycopg2-binary'),
+}
+
+
+class DatabaseError(Exception):
+    """Raised when a database cannot be connected to"""
+
+
+def parse_jdbc_url(url: str) -> tuple[str, dict]:
+    """
+    Splits a JDBC URL into its subprotocol and connection arguments
+
+    Parameter
+    ---------
+    url : str
+        JDBC URL, e.g. `jdbc:mysql://localhost:3306/corp` or `jdbc:sqlite:corp.db`
+
+    Raises
+    ------
+    DatabaseError
+        If the URL is not a supported JDBC URL
+
+    Returns
+    -------
+    tuple[str, dict]
+        Subprotocol and its connection arguments
+    """
+    if not url.startswith('jdbc:'):
+        raise DatabaseError(f"'{url}' is not a JDBC URL")
+
+    subprotocol, _, rest = url[len('jdbc:'):].partition(':')
+    if subprotocol not in DBAPI_MODULES:
+        raise DatabaseError(f"Database '{subprotocol}' is not supported, expected one of {sorted(DBAPI_MODULES)}")
+
+    if subprotocol == 'sqlite':
+        return subprotocol, {'database': rest.split('?')[0]}
+
+    parts = urlsplit(rest)
+    arguments = {'host': parts.hostname or 'localhost', 'database': parts.path.lstrip('/')}
+    if parts.port:
+        arguments['port'] = parts.port
+    arguments['options'] = dict(parse_qsl(parts.query))
+    return subprotocol, arguments
+
+
+def import_dbapi(subprotocol: str):
+    """Imports the DB-API module for a subprotocol
+
+    Raises:
+        DatabaseError: If the module is not installed
+    """
+    module_name, package = DBAPI_MODULES[subprotocol]
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise DatabaseError(f"The '{module_name}' module is required for {subprotocol} databases. Install it with `pip install {package}`") from None
+
+
+def connect(url: str, user: str = None, password: str = None):
+    """
+    Opens a DB-API connection from a JDBC URL
+
+    Returns
+    -------
+    tuple[Connection, module]
+        The connection and its DB-API module
+    """
+    subprotocol, arguments = parse_jdbc_url(url)
+    module = import_dbapi(subprotocol)
+
+    if subprotocol == 'sqlite':
+        return module.connect(arguments['database']), module
+    if subprotocol in ['mysql', 'mariadb']:
+        connection = module.connect(host=arguments['host'], port=arguments.get('port', 3306), user=user,
+                                    password=password, database=arguments['database'])
+        return connection, module
+    connection = module.connect(host=arguments['host'], port=arguments.get('port', 5432), user=user,
+                                password=password, dbname=arguments['database'])
+    return connection, module
+
+
+def placeholder(module, position: int) -> str:
+    """Gets the parameter placeholder of a DB-API module's paramstyle"""
+    style = getattr(module, 'paramstyle', 'qmark')
+    if style == 'qmark':
+        return '?'
+    if style == 'numeric':
+        return f":{position + 1}"
+    return '%s'
+
+
+class ConnectionPool():
+    """Keeps idle connections per URL and user for reuse
+
+    Connections are returned to the pool by the `connection` context
+    manager, rolled back if the block raised.
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, url: str, user: str = None, password: str = None):
+        """
+        Yields a pooled connection and its DB-API module
+        """
+        key = (url, user)
+        with self._lock:
+            idle = self._idle.get(key, [])
+            pooled = idle.pop() if idle else None
+
+        connection, module = pooled or connect(url, user, password)
+        try:
+            yield connection, module
+        except BaseException:
+            try:
+                connection.rollback()
+            finally:
+                connection.close()
+            raise
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((connection, module))
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pooled = [entry for idle in self._idle.values() for entry in idle]
+            self._idle.clear()
+        for connection, _ in pooled:
+            connection.close()
+
+
+default_pool = ConnectionPool()
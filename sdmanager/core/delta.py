@@ -0,0 +1,214 @@
+import json
+import os
+from typing import Iterable, NamedTuple
+from sdmanager.core.sql_generator import CURRENT_TIMESTAMP, InsertStatement, SqlExpression, sql_literal
+
+# Note: Only the configuration tables the generated SQL inserts into are
+# compared, so node registration (`sym_node`, `sym_node_security`, ...) is
+# never touched. Channels are inserted and updated but never deleted, as
+# the full script only clears the configured channels and SymmetricDS has
+# built-in channels of its own.
+
+SNAPSHOT_VERSION = 1
+
+
+class ConfigTable(NamedTuple):
+    """A `sym_*` table of the configuration and the columns compared"""
+    name: str
+    key: tuple
+    # Columns the generated SQL may set, with the table default used when
+    # a statement leaves one out
+    columns: dict
+    deletable: bool = True
+
+
+# In foreign key order, parents first
+CONFIG_TABLES = [
+    ConfigTable('sym_channel', ('channel_id',), {
+        'processing_order': 1, 'max_batch_size': 1000, 'max_batch_to_send': 60, 'max_data_to_route': 100000,
+        'enabled': 1, 'description': None, 'queue': 'default'}, deletable=False),
+    ConfigTable('sym_node_group', ('node_group_id',), {'description': None}),
+    ConfigTable('sym_node_group_link', ('source_node_group_id', 'target_node_group_id'), {'data_event_action': 'W'}),
+    ConfigTable('sym_trigger', ('trigger_id',), {
+        'source_table_name': None, 'channel_id': None, 'sync_on_insert': 1, 'sync_on_update': 1, 'sync_on_delete': 1,
+        'sync_on_incoming_batch': 0}),
+    ConfigTable('sym_router', ('router_id',), {
+        'source_node_group_id': None, 'target_node_group_id': None, 'router_type': None, 'router_expression': None}),
+    ConfigTable('sym_trigger_router', ('trigger_id', 'router_id'), {'initial_load_order': 1, 'initial_load_select': None}),
+]
+TABLES = {table.name: table for table in CONFIG_TABLES}
+
+
+class RowChange(NamedTuple):
+    action: str
+    table: str
+    key: tuple
+    statement: str
+
+
+def normalize(value):
+    """Compares values as text, with empty strings as null like some databases store them"""
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+def desired_rows(statements: Iterable[str]) -> dict[str, dict[tuple, tuple[dict, InsertStatement]]]:
+    """
+    Collects the rows the generated inserts write to each configuration
+    table, keyed by primary key, with defaults for the columns left out
+
+    Raises
+    ------
+    ValueError
+        If a statement is not an insert into a configuration table, or two
+        inserts write the same row
+
+    Returns
+    -------
+    dict[str, dict[tuple, tuple[dict, InsertStatement]]]
+        Table name to primary key to row and statement
+    """
+    rows = {table.name: {} for table in CONFIG_TABLES}
+    for statement in statements:
+        if not isinstance(statement, InsertStatement) or statement.table.lower() not in TABLES:
+            raise ValueError(f"Unable to compare statement: {statement}")
+        table = TABLES[statement.table.lower()]
+        values = dict(zip((column.lower() for column in statement.column_names), statement.params))
+        row = {column: values.get(column, default) for column, default in table.columns.items()}
+        key = tuple(normalize(values.get(column)) for column in table.key)
+        if key in rows[table.name]:
+            raise ValueError(f"Row {key} of {table.name} is generated twice")
+        rows[table.name][key] = (row, statement)
+    return rows
+
+
+def builder_rows(builder) -> dict[str, dict[tuple, tuple[dict, InsertStatement]]]:
+    """Collects the rows of the configuration a builder generates"""
+    return desired_rows(statement for queries in builder.sql_statement_sections().values() for statement in queries())
+
+
+def read_database_rows(cursor) -> dict[str, dict[tuple, dict]]:
+    """Reads the compared columns of every configuration table"""
+    rows = {}
+    for table in CONFIG_TABLES:
+        columns = [*table.key, *table.columns]
+        cursor.execute(f"select {', '.join(columns)} from {table.name}")
+        rows[table.name] = {}
+        for values in cursor.fetchall():
+            key = tuple(normalize(value) for value in values[:len(table.key)])
+            rows[table.name][key] = dict(zip(table.columns, values[len(table.key):]))
+    return rows
+
+
+def snapshot_document(desired: dict) -> dict:
+    return {
+        'version': SNAPSHOT_VERSION,
+        'tables': {
+            name: [{**dict(zip(TABLES[name].key, key)), **{column: plain(value) for column, value in row.items()}}
+                   for key, (row, _) in entries.items()]
+            for name, entries in desired.items()
+        },
+    }
+
+
+def plain(value):
+    return str(value) if isinstance(value, SqlExpression) else value
+
+
+def write_snapshot(path: str, desired: dict) -> None:
+    """Writes the generated configuration rows, to diff the next build against"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as snapshot_file:
+        json.dump(snapshot_document(desired), snapshot_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> dict[str, dict[tuple, dict]]:
+    """
+    Reads configuration rows written by `write_snapshot`
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot
+    """
+    with open(path) as snapshot_file:
+        document = json.load(snapshot_file)
+    if not isinstance(document, dict) or document.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a configuration snapshot")
+
+    rows = {table.name: {} for table in CONFIG_TABLES}
+    for name, entries in document.get('tables', {}).items():
+        if name not in TABLES:
+            continue
+        table = TABLES[name]
+        for entry in entries:
+            key = tuple(normalize(entry.get(column)) for column in table.key)
+            rows[name][key] = {column: entry.get(column, default) for column, default in table.columns.items()}
+    return rows
+
+
+def diff_rows(desired: dict, current: dict) -> list[RowChange]:
+    """
+    Finds the deletes, updates and inserts turning the current rows into
+    the desired ones. Deletes come first, children before parents, then
+    updates and inserts, parents before children.
+
+    Parameter
+    ---------
+    desired : dict
+        Rows of `desired_rows`
+    current : dict
+        Rows of `read_database_rows` or `read_snapshot`
+
+    Returns
+    -------
+    list[RowChange]
+        Changes in the order they are applied
+    """
+    deletes = []
+    for table in reversed(CONFIG_TABLES):
+        if not table.deletable:
+            continue
+        for key in current.get(table.name, {}):
+            if key not in desired[table.name]:
+                deletes.append(RowChange('delete', table.name, key, delete_statement(table, key)))
+
+    upserts = []
+    for table in CONFIG_TABLES:
+        existing = current.get(table.name, {})
+        for key, (row, statement) in desired[table.name].items():
+            if key not in existing:
+                upserts.append(RowChange('insert', table.name, key, statement))
+                continue
+            changed = {column: value for column, value in row.items() if normalize(value) != normalize(existing[key].get(column))}
+            if changed:
+                upserts.append(RowChange('update', table.name, key, update_statement(table, key, changed)))
+
+    return deletes + upserts
+
+
+def key_condition(table: ConfigTable, key: tuple) -> str:
+    return ' and '.join(f"{column} = {sql_literal(value)}" if value is not None else f"{column} is null"
+                        for column, value in zip(table.key, key))
+
+
+def delete_statement(table: ConfigTable, key: tuple) -> str:
+    return f"delete from {table.name} where {key_condition(table, key)};"
+
+
+def update_statement(table: ConfigTable, key: tuple, changed: dict) -> str:
+    assignments = [f"{column} = {sql_literal(value)}" for column, value in changed.items()]
+    assignments.append(f"last_update_time = {CURRENT_TIMESTAMP}")
+    return f"update {table.name} set {', '.join(assignments)} where {key_condition(table, key)};"
+
+
+def format_summary(changes: list[RowChange]) -> str:
+    """Counts the changes by action and table"""
+    if not changes:
+        return 'No configuration change'
+    counts = {}
+    for change in changes:
+        counts[(change.action, change.table)] = counts.get((change.action, change.table), 0) + 1
+    return ', '.join(f"{count} {action}(s) on {table}" for (action, table), count in counts.items())
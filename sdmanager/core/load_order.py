@@ -0,0 +1,277 @@
+from typing import Iterable, Iterator, NamedTuple
+from sdmanager.core import sql_generator
+
+# Note: Tables are loaded in tiers of the foreign key graph read from the
+# table metadata (a Torque schema or database catalog), so a row is only
+# loaded after the rows it references. Tables of the same tier do not
+# reference each other and share an `initial_load_order`, letting
+# SymmetricDS load them in parallel. Tables of a foreign key cycle share a
+# tier, as no order loads them without violating a key.
+#
+# A table with more `rows` than `load-chunk-rows` is loaded in chunks, one
+# capture-disabled trigger per range of its primary key, each range set as
+# the `initial_load_select` of the trigger's routers. Its capture trigger is
+# then left out of the initial load.
+
+LOAD_ORDER_START = 100
+LOAD_ORDER_STEP = 10
+# `initial_load_order` of trigger routers left out of the initial load
+NOT_LOADED = -1
+DEFAULT_CHUNK_ROWS = 1000000
+
+
+class TableLoad(NamedTuple):
+    """How a table is initially loaded"""
+    order: int
+    # `initial_load_select` of each chunk, empty if loaded whole
+    chunks: tuple = ()
+
+
+DEFAULT_LOAD = TableLoad(LOAD_ORDER_START)
+
+
+def table_dependencies(names: Iterable[str], metadata: dict) -> dict[str, list[str]]:
+    """
+    Maps each table to the other tables it references by foreign key.
+    Tables missing from `names` are ignored, as they are not loaded.
+
+    Parameter
+    ---------
+    names : Iterable[str]
+        Configured table names
+    metadata : dict
+        Catalog snapshot tables by name, see `catalog`
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Referenced tables of the tables with any
+    """
+    names = set(names)
+    dependencies = {}
+    for name in names:
+        table = metadata.get(name)
+        if table is None:
+            continue
+        referenced = sorted({foreign_key['foreign_table'] for foreign_key in table.get('foreign_keys', [])
+                             if foreign_key['foreign_table'] in names and foreign_key['foreign_table'] != name})
+        if referenced:
+            dependencies[name] = referenced
+    return dependencies
+
+
+def load_tiers(names: list[str], dependencies: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Groups tables into tiers loaded one after the other. A table's tier
+    comes after the tiers of every table it references.
+
+    Parameter
+    ---------
+    names : list[str]
+        Configured table names, the order kept within each tier
+    dependencies : dict[str, list[str]]
+        The `table_dependencies`
+
+    Returns
+    -------
+    list[list[str]]
+        Table names of each tier
+    """
+    tier_of = {}
+    for component in strongly_connected(names, dependencies):
+        members = set(component)
+        referenced = [tier_of[dependency] for name in component for dependency in dependencies.get(name, [])
+                      if dependency not in members]
+        tier = max(referenced) + 1 if referenced else 0
+        for name in component:
+            tier_of[name] = tier
+
+    tiers = [[] for _ in range(max(tier_of.values(), default=-1) + 1)]
+    for name in names:
+        tiers[tier_of[name]].append(name)
+    return tiers
+
+
+def strongly_connected(names: list[str], dependencies: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Finds the tables referencing each other through a cycle, with Tarjan's
+    algorithm. Components come after every component they reference.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root in names:
+        if root in index:
+            continue
+        # Iterative depth first search, each frame a table and its next edge
+        frames = [(root, 0)]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while frames:
+            name, edge = frames[-1]
+            edges = dependencies.get(name, [])
+            if edge < len(edges):
+                frames[-1] = (name, edge + 1)
+                dependency = edges[edge]
+                if dependency not in index:
+                    index[dependency] = low[dependency] = len(index)
+                    stack.append(dependency)
+                    on_stack.add(dependency)
+                    frames.append((dependency, 0))
+                elif dependency in on_stack:
+                    low[name] = min(low[name], index[dependency])
+                continue
+
+            frames.pop()
+            if frames:
+                parent = frames[-1][0]
+                low[parent] = min(low[parent], low[name])
+            if low[name] == index[name]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == name:
+                        break
+                components.append(component)
+    return components
+
+
+def initial_load_orders(tiers: list[list[str]]) -> dict[str, int]:
+    """Numbers the tiers from `LOAD_ORDER_START` in steps of `LOAD_ORDER_STEP`"""
+    return {name: LOAD_ORDER_START + tier * LOAD_ORDER_STEP for tier, names in enumerate(tiers) for name in names}
+
+
+def chunk_conditions(column: str, low: int, high: int, chunks: int) -> list[str]:
+    """
+    Splits the key range `low` to `high` into `chunks` ranges of about the
+    same size. The first and last ranges are open ended, so keys outside
+    the range are loaded too.
+
+    Returns
+    -------
+    list[str]
+        Conditions on the `t` alias SymmetricDS gives the loaded table, e.g.
+        `t.tran_id >= 251 and t.tran_id < 501`
+    """
+    chunks = min(chunks, high - low + 1)
+    if chunks < 2:
+        return []
+    bounds = [low + (high - low + 1) * idx // chunks for idx in range(1, chunks)]
+    conditions = [f"t.{column} < {bounds[0]}"]
+    conditions.extend(f"t.{column} >= {start} and t.{column} < {end}" for start, end in zip(bounds, bounds[1:]))
+    conditions.append(f"t.{column} >= {bounds[-1]}")
+    return conditions
+
+
+def table_chunks(table: dict, metadata: dict = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> list[str]:
+    """
+    Gets the `initial_load_select` of each chunk a table is loaded in
+
+    Parameter
+    ---------
+    table : dict
+        Configured table, with the estimated `rows` and the `key-range` of
+        its integer primary key
+    metadata : dict
+        The table's catalog snapshot, if any, giving the key column
+    chunk_rows : int
+        Most rows loaded whole
+
+    Raises
+    ------
+    ValueError
+        If the key range has no column and the table has no single column
+        primary key
+
+    Returns
+    -------
+    list[str]
+        Chunk conditions, empty if the table is loaded whole
+    """
+    rows = table.get('rows')
+    key_range = table.get('key-range')
+    if not rows or rows <= chunk_rows or not key_range:
+        return []
+
+    column = key_range.get('column')
+    if column is None:
+        primary_key = (metadata or {}).get('primary_key', [])
+        if len(primary_key) != 1:
+            raise ValueError(f"{table['name']}: 'key-range' requires a 'column' unless the table schema gives a single column primary key")
+        column = primary_key[0]
+    return chunk_conditions(column, key_range['min'], key_range['max'], -(-rows // chunk_rows))
+
+
+def key_range_error(key_range) -> str:
+    """
+    Checks a table's `key-range`
+
+    Returns
+    -------
+    str | None
+        The error, or None if valid
+    """
+    if not isinstance(key_range, dict) or any(isinstance(key_range.get(key), bool) or not isinstance(key_range.get(key), int)
+                                             for key in ['min', 'max']):
+        return "'key-range' must have integer 'min' and 'max' keys"
+    if key_range['min'] > key_range['max']:
+        return "'key-range' 'min' must not be greater than 'max'"
+    if 'column' in key_range and (not isinstance(key_range['column'], str) or not key_range['column'].isidentifier()):
+        return "'key-range' 'column' must be a column name"
+    return None
+
+
+def reload_requests(builder, engine_names: list[str], table_names: list[str] = ()) -> Iterator[str]:
+    """
+    Generates the `sym_table_reload_request` rows reloading tables to
+    nodes, through the trigger routers of their initial load, so chunked
+    tables are reloaded chunk by chunk. Requests are in load order and
+    nodes are identified by their external ID, SymmetricDS' default node ID.
+
+    Parameter
+    ---------
+    builder : ReplicationBuilder
+        Builder of the replication
+    engine_names : list[str]
+        Engine names of the nodes to reload
+    table_names : list[str]
+        Tables to reload, all tables if empty
+
+    Raises
+    ------
+    ValueError
+        If a node or table is not configured
+
+    Returns
+    -------
+    Iterator[str]
+        Insert statements
+    """
+    nodes = {node['engine_name']: node for node in builder.properties['nodes']}
+    unknown = [name for name in engine_names if name not in nodes]
+    if unknown:
+        raise ValueError(f"Unknown node(s): {', '.join(unknown)}")
+    tables = [table for table in builder.properties['tables'] if not table_names or table['name'] in table_names]
+    unknown = sorted(set(table_names) - {table['name'] for table in tables})
+    if unknown:
+        raise ValueError(f"Unknown table(s): {', '.join(unknown)}")
+
+    parent = builder.parent_node()
+    router_targets = {router.router_id: router.target for router in builder.iter_routers()}
+    routers = builder.column_routers()
+    plan = builder.load_plan()
+    tables.sort(key=lambda table: plan.get(table['name'], DEFAULT_LOAD).order)
+    for table in tables:
+        trigger_routers = builder.load_trigger_routers(table, plan.get(table['name'], DEFAULT_LOAD), routers)
+        for trigger_id, router_id, select in trigger_routers:
+            for engine_name in engine_names:
+                node = nodes[engine_name]
+                if router_targets.get(router_id) != node['group_id']:
+                    continue
+                source = nodes.get(node.get('upstream'), parent)
+                yield sql_generator.create_table_reload_request(node['external_id'], source['external_id'], trigger_id, router_id, select)
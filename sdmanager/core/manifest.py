@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = '.sdmanager-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def fingerprint(*values) -> str:
+    """
+    Hashes JSON serialisable values independently of dict ordering
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest
+    """
+    encoded = json.dumps(values, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def fingerprint_entries(entries) -> str:
+    """
+    Hashes an iterable of JSON serialisable values one at a time, for
+    sequences too large to serialise at once
+    """
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(json.dumps(entry, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def file_hash(path: str):
+    """
+    Hashes a file's contents
+
+    Returns
+    -------
+    str | None
+        SHA-256 hex digest, or None if the file does not exist
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as hashed_file:
+            for block in iter(lambda: hashed_file.read(1 << 16), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class BuildManifest():
+    """Input and output hashes of files generated into an output directory
+
+    The manifest lets a rebuild skip nodes and SQL sections whose inputs
+    have not changed since the previous build, as long as the file on disk
+    still matches the hash recorded when it was written.
+
+    Layout
+    ------
+    {
+        "version": 1,
+        "nodes": {"<engine_name>": {"input": "<hash>", "output": "<hash>"}},
+        "sql": {
+            "template": "<hash>",
+            "output": "<hash>",
+            "sections": {"<placeholder>": {"input": "<hash>", "offset": 0, "length": 0}}
+        }
+    }
+    """
+
+    def __init__(self, output_dir: str, node_suffix: str = '.properties') -> None:
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.output_dir = output_dir
+        # Extension of each node's output file, e.g. of its bundle
+        self.node_suffix = node_suffix
+        self.previous = self.load()
+        self.current = {'version': MANIFEST_VERSION, 'nodes': {}, 'sql': {}}
+
+    def load(self) -> dict:
+        """Reads the previous build's manifest, ignoring a missing or unreadable one"""
+        try:
+            with open(self.path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest
+
+    def node_unchanged(self, engine_name: str, input_hash: str) -> bool:
+        """Checks if a node's previous output can be kept
+
+        Args:
+            engine_name (str): Node engine name
+            input_hash (str): Fingerprint of the node's template and parameters
+
+        Returns:
+            bool: True if the inputs match and the file is as last written
+        """
+        entry = self.previous.get('nodes', {}).get(engine_name)
+        if not entry or entry.get('input') != input_hash:
+            return False
+        return file_hash(os.path.join(self.output_dir, f"{engine_name}{self.node_suffix}")) == entry.get('output')
+
+    def keep_node(self, engine_name: str) -> None:
+        self.current['nodes'][engine_name] = self.previous['nodes'][engine_name]
+
+    def record_node(self, engine_name: str, input_hash: str, output_hash: str) -> None:
+        self.current['nodes'][engine_name] = {'input': input_hash, 'output': output_hash}
+
+    def removed_nodes(self) -> list[str]:
+        """Engine names built previously but not in the current build"""
+        return sorted(set(self.previous.get('nodes', {})) - set(self.current['nodes']))
+
+    def reusable_sql_sections(self, path: str, template_hash: str, section_hashes: dict[str, str]) -> dict[str, tuple[int, int]]:
+        """Finds sections of the previous SQL file that can be copied as is
+
+        Args:
+            path (str): Path of the previous SQL file
+            template_hash (str): Fingerprint of the current SQL template
+            section_hashes (dict[str, str]): Fingerprint of each section's inputs
+
+        Returns:
+            dict[str, tuple[int, int]]: Byte offset and length of each reusable section
+        """
+        previous = self.previous.get('sql', {})
+        if previous.get('template') != template_hash or file_hash(path) != previous.get('output'):
+            return {}
+
+        reusable = {}
+        for name, entry in previous.get('sections', {}).items():
+            if section_hashes.get(name) == entry.get('input'):
+                reusable[name] = (entry['offset'], entry['length'])
+        return reusable
+
+    def keep_sql(self) -> None:
+        self.current['sql'] = self.previous['sql']
+
+    def record_sql(self, template_hash: str, output_hash: str, section_hashes: dict[str, str], spans: dict[str, tuple[int, int]]) -> None:
+        self.current['sql'] = {
+            'template': template_hash,
+            'output': output_hash,
+            'sections': {
+                name: {'input': section_hashes[name], 'offset': spans[name][0], 'length': spans[name][1]}
+                for name in spans
+            }
+        }
+
+    def save(self) -> None:
+        """Writes the current build's manifest, carrying over parts not rebuilt"""
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'nodes': self.current['nodes'] or self.previous.get('nodes', {}),
+            'sql': self.current['sql'] or self.previous.get('sql', {})
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
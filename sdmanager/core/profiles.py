@@ -0,0 +1,107 @@
+from typing import Optional
+
+# Note: Profiles are named sets of SymmetricDS engine parameters, selected
+# with `profile` globally or on a node. A node's `parameters` object sets
+# individual engine parameters over its profile.
+
+PROFILES = {
+    # Changes reach other nodes within seconds, at the cost of more
+    # frequent jobs and uncompressed transfers on a fast network
+    'low-latency': {
+        'job.routing.period.time.ms': 1000,
+        'job.push.period.time.ms': 1000,
+        'job.pull.period.time.ms': 1000,
+        'push.thread.per.server.count': 20,
+        'pull.thread.per.server.count': 20,
+        'http.compression': 'false',
+        'stream.to.file.threshold.bytes': 10485760,
+        'routing.use.channel.threads': 'true',
+    },
+    # Large batches moved with more threads, spooled to disk
+    'high-throughput': {
+        'job.routing.period.time.ms': 5000,
+        'job.push.period.time.ms': 10000,
+        'job.pull.period.time.ms': 10000,
+        'push.thread.per.server.count': 20,
+        'pull.thread.per.server.count': 20,
+        'http.compression': 'true',
+        'compression.level': 1,
+        'transport.max.bytes.to.sync': 10485760,
+        'stream.to.file.threshold.bytes': 0,
+        'routing.use.channel.threads': 'true',
+    },
+    # Fewer, well compressed transfers over slow or metered links
+    'low-bandwidth-wan': {
+        'job.routing.period.time.ms': 10000,
+        'job.push.period.time.ms': 60000,
+        'job.pull.period.time.ms': 60000,
+        'push.thread.per.server.count': 2,
+        'pull.thread.per.server.count': 2,
+        'http.compression': 'true',
+        'compression.level': 9,
+        'transport.max.bytes.to.sync': 524288,
+        'stream.to.file.threshold.bytes': 0,
+        'http.timeout.ms': 600000,
+        'routing.use.channel.threads': 'false',
+    },
+}
+
+# Engine parameters already written by the node templates
+TEMPLATE_PLACEHOLDERS = {
+    'job.routing.period.time.ms': 'job_routing_period_time_ms',
+    'job.push.period.time.ms': 'job_push_period_time_ms',
+    'job.pull.period.time.ms': 'job_pull_period_time_ms',
+    'job.purge.period.time.ms': 'job_purge_period_time_ms',
+    'auto.registration': 'auto_registration',
+    'initial.load.create.first': 'initial_load_create_first',
+}
+
+PERFORMANCE_PLACEHOLDER = 'performance_properties'
+
+
+def profile_parameters(name: Optional[str]) -> dict:
+    """
+    Gets the engine parameters of a profile
+
+    Raises
+    ------
+    ValueError
+        If the profile does not exist
+    """
+    if name is None:
+        return {}
+    if name not in PROFILES:
+        raise ValueError(f"Profile '{name}' does not exist, expected one of {sorted(PROFILES)}")
+    return PROFILES[name]
+
+
+def node_engine_parameters(node: dict, default_profile: str = None) -> tuple[Optional[str], dict]:
+    """
+    Merges a node's `parameters` over its profile, or the default profile
+
+    Returns
+    -------
+    tuple[str | None, dict]
+        The profile name and the engine parameters
+    """
+    name = node.get('profile', default_profile)
+    return name, {**profile_parameters(name), **node.get('parameters', {})}
+
+
+def render_performance_properties(name: Optional[str], parameters: dict) -> str:
+    """
+    Renders engine parameters not written by the templates, appended to a
+    node's properties file. Empty if there are none.
+    """
+    lines = [f"{key}={format_value(value)}" for key, value in parameters.items() if key not in TEMPLATE_PLACEHOLDERS]
+    if not lines:
+        return ''
+
+    heading = f"# Performance profile: {name}" if name else '# Performance parameters'
+    return '\n\n' + heading + '\n' + '\n'.join(lines)
+
+
+def format_value(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
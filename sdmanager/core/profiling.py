@@ -0,0 +1,105 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, NamedTuple
+
+
+class PhaseMetrics(NamedTuple):
+    """Wall time, CPU time and traced memory peak of a build phase"""
+    phase: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_bytes: int
+
+
+class BuildProfiler():
+    """Records metrics of each phase of a build
+
+    Pass a profiler to `ReplicationBuilder` to record parsing, validation,
+    node file and SQL generation phases along with node, table and statement
+    counts. Listeners are called with each phase's `PhaseMetrics` as soon as
+    it ends, e.g. to ship metrics to a monitoring system:
+
+        profiler = BuildProfiler()
+        profiler.listeners.append(lambda metrics: statsd.timing(metrics.phase, metrics.wall_seconds))
+        ReplicationBuilder('properties.json', 'output', profiler=profiler).generate_files()
+        print(profiler.summary())
+    """
+
+    def __init__(self, trace_memory: bool = True, cprofile: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.counts = Counter()
+        self.listeners: list[Callable[[PhaseMetrics], None]] = []
+        self.cprofile = cProfile.Profile() if cprofile else None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measures the enclosed block as a phase"""
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if self.cprofile is not None:
+                self.cprofile.disable()
+            peak = 0
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+
+            metrics = PhaseMetrics(name, wall, cpu, peak)
+            self.phases.append(metrics)
+            for listener in self.listeners:
+                listener(metrics)
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counts[name] += value
+
+    def to_dict(self) -> dict:
+        return {
+            'phases': [metrics._asdict() for metrics in self.phases],
+            'counts': dict(self.counts),
+            'total_wall_seconds': sum(metrics.wall_seconds for metrics in self.phases),
+        }
+
+    def summary(self) -> str:
+        """Formats the phases and counts as a table"""
+        lines = [f"{'Phase':<20} {'Wall s':>9} {'CPU s':>9} {'Peak KiB':>10}"]
+        for metrics in self.phases:
+            lines.append(f"{metrics.phase:<20} {metrics.wall_seconds:>9.4f} {metrics.cpu_seconds:>9.4f} {metrics.peak_bytes / 1024:>10.1f}")
+        lines.append(f"{'total':<20} {sum(metrics.wall_seconds for metrics in self.phases):>9.4f} "
+                     f"{sum(metrics.cpu_seconds for metrics in self.phases):>9.4f}")
+        if self.counts:
+            lines.append(', '.join(f"{name}: {value}" for name, value in sorted(self.counts.items())))
+        return '\n'.join(lines)
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+            json_file.write('\n')
+
+    def dump_stats(self, path: str) -> None:
+        """Writes the cProfile statistics of all phases, readable with `pstats`
+
+        Raises:
+            ValueError: If the profiler was created without cprofile
+        """
+        if self.cprofile is None:
+            raise ValueError('cProfile statistics were not recorded, create the profiler with cprofile=True')
+        self.cprofile.dump_stats(path)
@@ -0,0 +1,275 @@
+import glob
+import json
+import os
+import tempfile
+from typing import Callable, Iterator
+
+# Note: Only the per-node and per-table arrays grow with the deployment,
+# so they are streamed while the remaining keys are read as usual.
+STREAMED_KEYS = ('nodes', 'tables')
+PROPERTIES_FILE = 'properties.json'
+
+_decoder = json.JSONDecoder()
+
+
+class _JsonStream():
+    """Decodes a JSON text file incrementally, one value at a time
+    """
+
+    def __init__(self, json_file, chunk_size: int = 1 << 16) -> None:
+        self.file = json_file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at character {self.offset + self.pos} of {self.file.name}")
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, '' at the end"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """Decodes the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise self.error(f"Invalid JSON: {e.msg}")
+
+            # A number or literal may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("Expecting ',' or ']'")
+
+    def iter_object(self, streamed_key: str = None) -> Iterator[tuple[str, object]]:
+        """
+        Yields top level keys and values. The value of streamed_key is
+        yielded as an iterator over its array items.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self.error('Expecting property name')
+            self.expect(':')
+
+            if key == streamed_key and self.peek() == '[':
+                items = self.iter_array()
+                yield key, items
+                for _ in items:
+                    pass
+            elif key in STREAMED_KEYS and self.peek() == '[':
+                for _ in self.iter_array():
+                    pass
+                yield key, None
+            else:
+                yield key, self.value()
+
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("Expecting ',' or '}'")
+
+
+def iter_json_array(path: str, key: str) -> Iterator:
+    """
+    Streams the items of a top level array from a JSON object file
+    without decoding the rest of the file into memory
+    """
+    with open(path, 'r', encoding='utf-8') as json_file:
+        for name, value in _JsonStream(json_file).iter_object(key):
+            if name == key:
+                if value is None:
+                    return
+                yield from value
+                return
+
+
+def iter_jsonl(path: str) -> Iterator:
+    """Streams the entries of a JSON lines file, or of a JSON array file"""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as json_file:
+            stream = _JsonStream(json_file)
+            if stream.peek() == '[':
+                yield from stream.iter_array()
+            else:
+                yield stream.value()
+        return
+
+    with open(path, 'r', encoding='utf-8') as jsonl_file:
+        for line_number, line in enumerate(jsonl_file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number} of {path}: {e.msg}")
+
+
+class StreamedEntries():
+    """A re-iterable sequence of entries read from disk on demand
+
+    The first complete pass streams entries from their sources and spools
+    them to a temporary JSON lines file, so later passes read compact lines
+    instead of re-parsing the sources. Entries are never all held in memory.
+    """
+
+    def __init__(self, key: str, sources: list[Callable[[], Iterator]]) -> None:
+        self.key = key
+        self.sources = sources
+        self._spool = None
+        self._count = None
+
+    def __iter__(self) -> Iterator:
+        if self._spool is not None:
+            yield from iter_jsonl(self._spool)
+            return
+
+        spool = tempfile.NamedTemporaryFile('w', suffix='.jsonl', prefix=f"sdmanager-{self.key}-", delete=False)
+        count = 0
+        complete = False
+        try:
+            for source in self.sources:
+                for entry in source():
+                    spool.write(json.dumps(entry, separators=(',', ':')))
+                    spool.write('\n')
+                    count += 1
+                    yield entry
+            complete = True
+        finally:
+            spool.close()
+            if complete and self._spool is None:
+                self._spool = spool.name
+                self._count = count
+            else:
+                os.remove(spool.name)
+
+    def __len__(self) -> int:
+        if self._count is None:
+            for _ in self:
+                pass
+        return self._count
+
+    def __del__(self) -> None:
+        if self._spool is not None:
+            try:
+                os.remove(self._spool)
+            except (OSError, TypeError):
+                pass
+
+
+def open_properties(path: str) -> dict:
+    """
+    Opens replication properties with the `nodes` and `tables` arrays
+    streamed rather than loaded
+
+    Parameter
+    ---------
+    path : str
+        A JSON properties file, or a directory holding `properties.json`
+        with the other keys and `nodes`/`tables` fragments as
+        `nodes.jsonl`, `nodes/*.jsonl` or `nodes/*.json`
+
+    Raises
+    ------
+    ValueError
+        If a file is not valid JSON
+
+    Returns
+    -------
+    dict
+        Properties with `StreamedEntries` for `nodes` and `tables`
+    """
+    if os.path.isdir(path):
+        return open_properties_directory(path)
+
+    properties = {}
+    found = set()
+    with open(path, 'r', encoding='utf-8') as json_file:
+        for key, value in _JsonStream(json_file).iter_object():
+            if key in STREAMED_KEYS and value is None:
+                found.add(key)
+            else:
+                properties[key] = value
+
+    for key in found:
+        properties[key] = StreamedEntries(key, [lambda key=key: iter_json_array(path, key)])
+    return properties
+
+
+def open_properties_directory(directory: str) -> dict:
+    properties = {}
+    properties_path = os.path.join(directory, PROPERTIES_FILE)
+    if os.path.isfile(properties_path):
+        properties = open_properties(properties_path)
+
+    for key in STREAMED_KEYS:
+        sources = []
+        if isinstance(properties.get(key), StreamedEntries):
+            sources.extend(properties[key].sources)
+        elif isinstance(properties.get(key), list):
+            sources.append(lambda entries=properties[key]: iter(entries))
+
+        fragments = [os.path.join(directory, f"{key}.jsonl")]
+        fragments += sorted(glob.glob(os.path.join(directory, key, '*.jsonl')) + glob.glob(os.path.join(directory, key, '*.json')))
+        for fragment in fragments:
+            if os.path.isfile(fragment):
+                sources.append(lambda fragment=fragment: iter_jsonl(fragment))
+
+        if sources:
+            properties[key] = StreamedEntries(key, sources)
+
+    return properties
@@ -1,9 +1,14 @@
+import hashlib
 import json
 import os
-import copy
 import sys
-from string import Template
-from sdmanager.core import Validator, sql_generator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+from sdmanager.core import Validator, bundle, capacity, catalog, load_order, profiles, properties_reader, sql_generator, sql_writer, templates, topology, torque
+from sdmanager.core.manifest import BuildManifest, fingerprint, fingerprint_entries
+from sdmanager.core.profiling import BuildProfiler
 
 # Output: {'name': 'Bob', 'languages': ['English', 'Fench']}
 
@@ -14,14 +19,75 @@ class ReplicationBuilder():
     child_node_default_properties = {}
     parent_node_default_properties = {}
 
-    def __init__(self, properties, output_dir=None) -> None:
+    # Properties each `sql.st` section is generated from. Used to detect
+    # the sections an incremental build has to regenerate.
+    sql_section_inputs = {
+        'channels_list': ('channels',),
+        'channel': ('channels', 'channel-plan'),
+        'group': ('groups',),
+        'group_links': ('groups', 'links'),
+        'table_triggers': ('replication-arch', 'tables'),
+        'initial_load_table_triggers': ('tables', 'load-plan'),
+        'router': ('replication-arch', 'route-by'),
+        'router_triggers': ('replication-arch', 'tables', 'load-plan'),
+        'initial_load_router_triggers': ('replication-arch', 'tables', 'load-plan'),
+    }
+    # Section inputs derived from the properties by a builder method, so a
+    # section only depends on the part of a key it is generated from
+    derived_sql_inputs = {
+        'route-by': 'column_routers',
+        'channel-plan': 'channel_plans',
+        'load-plan': 'load_plan',
+    }
+
+    def __init__(self, properties, output_dir=None, jobs: int = 1, template_dirs: list[str] = None,
+                 incremental: bool = True, insert_batch_size: int = 1, dialect: str = None,
+                 streaming: bool = False, table_schema: str = None, catalog_cache=None,
+                 profiler: BuildProfiler = None, bundle_format: str = None, combined_bundle: bool = False) -> None:
         
-        self.parse_properties(properties)
-        result, txt = Validator(self.properties).validate()
-        if not result:
-            raise ValueError(f"Validation Error: {txt}")
+        self.streaming = streaming
+        self.profiler = profiler
+        with self.profile_phase('parse_properties'):
+            self.parse_properties(properties)
+        self.table_metadata = {}
+        if table_schema is not None or 'table-schema' in self.properties:
+            with self.profile_phase('table_schema'):
+                self.resolve_table_schema(table_schema, catalog_cache)
+        with self.profile_phase('validate'):
+            if self.is_streamed():
+                # Single pass over the streamed entries
+                report = Validator(self.properties).validate_all()
+                if not report.valid:
+                    raise ValueError(f"Validation Error: {report}")
+            else:
+                result, txt = Validator(self.properties).validate()
+                if not result:
+                    raise ValueError(f"Validation Error: {txt}")
+
+        self.resolve_node_groups()
+
+        # Rows per multi-row insert, 1 keeps single-row inserts
+        self.insert_batch_size = max(1, insert_batch_size or 1)
+        self.dialect = dialect or sql_generator.dialect_for_driver(self.parent_node().get('db_driver', ''))
 
         self.output_dir = output_dir
+        self.jobs = max(1, jobs or 1)
+
+        # Nodes are written as bundles, or all into one combined archive
+        if (bundle_format or combined_bundle) and output_dir is None:
+            raise ValueError('Node bundles require an output directory')
+        if bundle_format is not None and bundle_format not in bundle.BUNDLE_FORMATS:
+            raise ValueError(f"Bundle format must be one of {bundle.BUNDLE_FORMATS}")
+        self.bundle_format = bundle_format or ('tar.gz' if combined_bundle else None)
+        self.combined_bundle = combined_bundle
+        self.node_suffix = bundle.bundle_suffix(self.bundle_format) if self.bundle_format and not combined_bundle else '.properties'
+
+        self.manifest = None
+        if output_dir != None and incremental:
+            self.manifest = BuildManifest(output_dir, self.node_suffix)
+        self.skipped_nodes = []
+        self.reused_sql_sections = []
+        self.templates = templates.registry_for(template_dirs)
         self.common_default_properties = {
             "job_routing_period_time_ms":5000,
             "job_push_period_time_ms":10000,
@@ -43,162 +109,755 @@ class ReplicationBuilder():
         """
         Parameter
         ---------
-        json : str
-            Path to JSON file to be parsed for properties
+        json : str | dict
+            Path to JSON file to be parsed for properties, or already
+            parsed properties. Directories of properties fragments, and
+            files when streaming, are read with `properties_reader`.
         """
+        if isinstance(path_to_json, dict):
+            self.properties = path_to_json
+            self.properties_dir = os.getcwd()
+            return
+
+        self.properties_dir = os.path.dirname(os.path.abspath(path_to_json))
+        if os.path.isdir(path_to_json):
+            self.properties_dir = os.path.abspath(path_to_json)
+
+        if self.streaming or os.path.isdir(path_to_json):
+            try:
+                self.properties = properties_reader.open_properties(path_to_json)
+            except Exception as e:
+                sys.exit(f"Unable to upon supplied config file: {e}")
+            return
+
+        self.properties = load_properties(path_to_json)
+
+    def resolve_table_schema(self, table_schema: str = None, cache=None) -> None:
+        """
+        Reads the Torque XML schema named by `table_schema`, or by the
+        `table-schema` property, into `table_metadata` and adds its tables
+        to the `tables` section. Configured tables keep their entries.
+
+        The property is a path relative to the properties file, or an
+        object with `path` and the `channel`, `route`, `include` and
+        `exclude` applied to tables added from the schema. Instead of a
+        `path`, a `url` reads the schema of a database by JDBC URL, with
+        the `user` and `password` defaulting to the parent node's.
+
+        Parameter
+        ---------
+        table_schema : str
+            Torque XML schema file, overriding the property
+        cache : CatalogCache
+            Cache of parsed schemas, defaults to the user's catalog cache
+        """
+        options = self.properties.get('table-schema')
+        if table_schema is None and options is None:
+            return
+
+        if not isinstance(options, dict):
+            options = {'path': options}
+        path = table_schema or options.get('path')
+        url = None if table_schema else options.get('url')
+        if not path and not url:
+            sys.exit("Unable to read table schema: 'path' or 'url' key is required for table-schema configuration")
+        if path and table_schema is None:
+            path = os.path.join(self.properties_dir, path)
+
+        cache = cache if cache is not None else catalog.CatalogCache()
         try:
-            with open(path_to_json) as f:
-                self.properties = json.load(f)
+            if path:
+                snapshot = torque.read_torque_schema(path, cache)
+            else:
+                parent = self.parent_node()
+                snapshot, _ = catalog.discover_catalog(url, options.get('user', parent.get('db_user')),
+                                                       options.get('password', parent.get('db_password')), cache=cache)
         except Exception as e:
-            sys.exit(f"Unable to upon supplied config file: {e}")
-    
-    def generate_files(self):
-        self.generate_node_property_files()
+            sys.exit(f"Unable to read table schema: {e}")
+        self.table_metadata = {table['name']: table for table in snapshot['tables']}
 
-        sql_mappings = {}
-        sql_mappings['group'], sql_mappings['group_links'], = self.build_group_queries()
-        sql_mappings['channels_list'], sql_mappings['channel'], = self.build_channel_query()
-        sql_mappings['table_triggers'], sql_mappings['initial_load_table_triggers'] = self.build_table_trigger_queries()
-        sql_mappings['router'] = self.build_router_query()
-        sql_mappings['router_triggers'], sql_mappings['initial_load_router_triggers'] = self.build_router_trigger_queries()
+        channels = self.properties.get('channels') or [{'id': 'default'}]
+        route = options.get('route')
+        if route is None and self.properties.get('replication-arch') not in ['parent-child', 'child-parent']:
+            route = 'parent-child'
+        self.properties['tables'] = catalog.tables_section(
+            snapshot, self.properties.get('tables', []), options.get('channel', channels[0]['id']), route,
+            options.get('include', []), options.get('exclude', []))
 
-        self.generate_sql_file(sql_mappings)
-    
-    def build_group_queries(self) -> tuple[str, str]:
-        gp_link_sql = ''
-        gp_sql = ''
-         # Groups
-        for idx,group in enumerate(self.properties['groups']):
-            # links
-            groups_buffer = copy.copy(self.properties['groups'])
-            groups_buffer.pop(idx)
-            for gp in groups_buffer:
-                gp_link_sql += f"{sql_generator.create_node_group_link(group['id'], gp['id'], group['sync'])}\n\n"
-            
-            gp_sql += f"{sql_generator.create_node_group(group['id'], ['description'])}\n\n"
-        
-        return gp_sql, gp_link_sql
+    def is_streamed(self) -> bool:
+        """
+        Checks if nodes or tables are streamed from disk rather than loaded
+        """
+        return any(isinstance(self.properties.get(key), properties_reader.StreamedEntries)
+                   for key in properties_reader.STREAMED_KEYS)
     
-    def build_channel_query(self) -> tuple[str, str]:
-        channel_list =' '
-        channel_sql = ''
-        for idx,channel in enumerate(self.properties['channels']):
+    def resolve_node_groups(self):
+        """
+        Sets the parent and child group IDs used by the routers, and the
+        tiers of router nodes between them
+        """
+        tree_nodes = []
+        for node in self.properties['nodes']:
+            if node['type'] == 'parent':
+                self.parent_group = node['group_id']
+            elif node['type'] == 'child':
+                self.child_group = node['group_id']
+            if node['type'] != 'child' or node.get('upstream'):
+                tree_nodes.append(node)
+        self.node_tree = topology.node_tree(tree_nodes)
 
-            channel_sql += f"{sql_generator.create_channel(channel['id'])}\n\n"
-            channel_list += f"'{channel['id']}'"
-            if (idx + 1) != len(self.properties['channels']):
-                channel_list += ","
+    def tiers(self) -> list[str]:
+        """
+        Gets the groups rows pass through from the parent group, through
+        the router groups, to the child group
+        """
+        return [self.parent_group, *self.node_tree.router_groups, self.child_group]
 
-        return channel_list, channel_sql
-    
-    def build_table_trigger_queries(self) -> tuple[str, str]:
-        table_trigger = ''
-        load_only_table_triggers = ''
+    def parent_node(self) -> dict:
+        """
+        Gets the parent node, whose database holds the SymmetricDS configuration
+        """
+        for node in self.properties['nodes']:
+            if node['type'] == 'parent':
+                return node
+        return {}
+
+    def profile_phase(self, name: str):
+        """
+        Measures the enclosed block as a phase of the build profiler, if any
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+
+    def generate_files(self) -> list[tuple[str, str]]:
+        with self.profile_phase('node_properties'):
+            failures = self.generate_node_property_files()
+        with self.profile_phase('sql'):
+            self.generate_sql_file()
+        if self.profiler is not None:
+            self.profiler.count('tables', len(self.properties['tables']))
+
+        if failures:
+            print(f"Unable to generate properties for {len(failures)} node(s):")
+            for engine_name, error in failures:
+                print(f"  {engine_name}: {error}")
+
+        return failures
+
+    def sql_sections(self) -> dict[str, Callable[[], Iterable[str]]]:
+        """
+        Maps each `sql.st` placeholder to a callable streaming its section
+        """
+        sections = {
+            name: (lambda queries=queries: self._statements(queries()))
+            for name, queries in self.sql_statement_sections().items()
+        }
+        sections['channels_list'] = self.iter_channels_list
+        return sections
+
+    def sql_statement_sections(self) -> dict[str, Callable[[], Iterable[str]]]:
+        """
+        Maps each `sql.st` placeholder made of whole statements to a callable
+        yielding the section's statements
+        """
+        return {
+            'channel': self.iter_channel_queries,
+            'group': self.iter_group_queries,
+            'group_links': self.iter_group_link_queries,
+            'table_triggers': self.iter_table_trigger_queries,
+            'initial_load_table_triggers': self.iter_initial_load_table_trigger_queries,
+            'router': self.iter_router_queries,
+            'router_triggers': self.iter_router_trigger_queries,
+            'initial_load_router_triggers': self.iter_initial_load_router_trigger_queries,
+        }
+
+    def _statements(self, queries: Iterable[str]) -> Iterator[str]:
+        if self.insert_batch_size > 1:
+            queries = sql_generator.batch_inserts(queries, self.insert_batch_size, self.dialect)
+        for query in queries:
+            if self.profiler is not None:
+                self.profiler.count('statements')
+            yield f"{query}\n\n"
+
+    def iter_group_queries(self) -> Iterator[str]:
+        for group in self.properties['groups']:
+            yield sql_generator.create_node_group(group['id'], group.get('description', ''))
+
+    def iter_group_link_queries(self) -> Iterator[str]:
+        for link in self.iter_group_links():
+            yield sql_generator.create_node_group_link(link.source, link.target, link.data_event_action)
+
+    def iter_group_links(self) -> Iterator[topology.GroupLink]:
+        """
+        Yields the declared group links. Without a `links` section, yields
+        links between adjacent tiers if there are router nodes, else links
+        between every pair of groups.
+        """
+        if 'links' in self.properties:
+            return topology.iter_declared_links(self.properties['links'], self.properties['groups'])
+        if self.node_tree.router_groups:
+            return topology.iter_tier_links(self.tiers(), self.properties['groups'])
+        return topology.iter_all_pairs(self.properties['groups'])
+
+    def iter_channels_list(self) -> Iterator[str]:
+        yield ' '
+        for idx, channel in enumerate(self.properties['channels']):
+            if idx:
+                yield ','
+            yield f"'{channel['id']}'"
+
+    def iter_channel_queries(self) -> Iterator[str]:
+        plans = self.channel_plans()
+        for channel in self.properties['channels']:
+            plan = plans.get(channel['id'])
+            if plan is None:
+                yield sql_generator.create_channel(channel['id'])
+                continue
+
+            yield sql_generator.create_channel(
+                channel['id'], plan.processing_order, plan.max_batch_size or 100000,
+                max_batch_to_send=plan.max_batch_to_send, max_data_to_route=plan.max_data_to_route, queue=plan.queue)
+
+    def channel_plans(self) -> dict[str, capacity.ChannelPlan]:
+        """
+        Plans channel batching, ordering and queues from the tables'
+        expected rates and the channels' tuning fields. Empty if neither
+        is configured, keeping the default channel settings.
+        """
+        channels = self.properties['channels']
+        planned = any(key in channel for channel in channels for key in capacity.CHANNEL_TUNING_KEYS) \
+            or any('rows-per-second' in table for table in self.properties['tables'])
+        if not planned:
+            return {}
+        return {plan.channel_id: plan for plan in self.plan_channels()}
+
+    def plan_channels(self) -> list[capacity.ChannelPlan]:
+        """
+        Plans every channel for the job periods of the global profile
+        """
+        profile = profiles.profile_parameters(self.properties.get('profile'))
+        return capacity.plan_channels(
+            self.properties['channels'], self.properties['tables'],
+            profile.get('job.push.period.time.ms', self.common_default_properties['job_push_period_time_ms']),
+            profile.get('job.routing.period.time.ms', self.common_default_properties['job_routing_period_time_ms']))
+
+    def iter_table_trigger_queries(self) -> Iterator[str]:
+        # Router nodes capture the rows they receive to route them onward
+        relay = bool(self.node_tree.router_groups)
+        routers = self.column_routers() if relay else {}
+        for table in self.properties['tables']:
+            yield sql_generator.create_table_trigger(table, sync_on_incoming=relay and bool(self.table_router_ids(table, routers)))
+
+    def iter_initial_load_table_trigger_queries(self) -> Iterator[str]:
+        plan = self.load_plan()
         for table in self.properties['tables']:
-            table_trigger += f"{sql_generator.create_table_trigger(table)}\n\n"
-            if 'initial-load' in table and table['initial-load']:
-                load_only_table_triggers += f"{sql_generator.create_table_load_only_trigger(table)}\n\n"
+            chunks = plan.get(table['name'], load_order.DEFAULT_LOAD).chunks
+            if chunks:
+                for idx in range(1, len(chunks) + 1):
+                    yield sql_generator.create_table_load_only_trigger(table, sql_generator.chunk_trigger_id(table, idx))
+            elif 'initial-load' in table and table['initial-load']:
+                yield sql_generator.create_table_load_only_trigger(table)
 
-        return table_trigger, load_only_table_triggers
+    def iter_router_queries(self) -> Iterator[str]:
+        for router in self.iter_routers():
+            if router.expression is None:
+                yield sql_generator.create_router(router.router_id, router.source, router.target)
+            else:
+                yield sql_generator.create_column_router(router.router_id, router.source, router.target, expression=router.expression)
 
-    def build_router_query(self)  -> str:
+    def iter_routers(self) -> Iterator[topology.Router]:
+        """
+        Yields the routers of the replication architecture, followed by the
+        column routers of tables routed by column
+        """
         arch = self.properties['replication-arch']
-        router_sql = ''
-
-        if arch == 'bi-directional':
-            router_sql = f"{sql_generator.create_router('parent_2_child', self.parent_group, self.child_group)}\n\n"
-            router_sql += f"{sql_generator.create_router('child_2_parent', self.child_group, self.parent_group)}\n\n"
-            router_sql += f"{sql_generator.create_router('parent_2_one_child', self.child_group, self.parent_group, 'column')}\n\n" #TODO Implement column router generator
-        elif arch == 'parent-child':
-            router_sql = sql_generator.create_router('parent_2_child',self.parent_group, self.child_group)
-        elif arch == 'child-parent':
-            router_sql =sql_generator.create_router('child_2_parent', self.child_group, self.parent_group)
-        
-        return router_sql
-        
-    def build_router_trigger_queries(self):
-        router_triggers = ''
-        initial_load_router_triggers = ''
 
+        if arch in ['bi-directional', 'parent-child']:
+            yield from self.tier_routers('parent-child')
+        if arch in ['bi-directional', 'child-parent']:
+            yield from self.tier_routers('child-parent')
+
+        if arch != 'child-parent':
+            # Column routers pick the child nodes of the last tier
+            source = self.tiers()[-2]
+            for expression, router_id in self.column_routers().items():
+                yield topology.Router(router_id, source, self.child_group, expression)
+
+    def tier_routers(self, route: str) -> list[topology.Router]:
+        """
+        Gets the routers sending rows down the tiers for `parent-child`, or
+        up the tiers for `child-parent`, one per pair of adjacent tiers.
+        Without router nodes, that is `parent_2_child` or `child_2_parent`.
+        """
+        tiers = self.tiers() if route == 'parent-child' else self.tiers()[::-1]
+        if len(tiers) == 2:
+            return [topology.Router('parent_2_child' if route == 'parent-child' else 'child_2_parent', *tiers)]
+        return [topology.Router(f"{source}_2_{target}", source, target) for source, target in zip(tiers, tiers[1:])]
+
+    def column_routers(self) -> dict[str, str]:
+        """
+        Maps the column router expression of each table's `route-by` to
+        the ID of its parent to child router. Tables sharing an expression
+        share a router.
+        """
+        routers = {}
         for table in self.properties['tables']:
-            initial_load_router_triggers += self.build_router_initial_load_trigger_query(table)
-            if self.properties['replication-arch'] == 'bi-directional':
-                if table['route'] == 'parent-child':
-                    router_triggers += f"{sql_generator.create_router_trigger(table['name'], 'parent_2_child')}\n\n"
-                elif table['route'] == 'child-parent':
-                    router_triggers += f"{sql_generator.create_router_trigger(table['name'], 'child_2_parent')}\n\n"
+            if table.get('route-by'):
+                expression = sql_generator.column_router_expression(table['route-by'])
+                if expression not in routers:
+                    routers[expression] = sql_generator.column_router_id(expression, routers.values())
+        return routers
+
+    def parent_child_router(self, table, routers: dict[str, str]) -> str:
+        """
+        Gets the router sending a table's rows into the child group: its
+        column router if routed by column, else the last tier's router
+        """
+        if table.get('route-by'):
+            return routers[sql_generator.column_router_expression(table['route-by'])]
+        return self.tier_routers('parent-child')[-1].router_id
 
-            elif self.properties['replication-arch'] == 'parent-child':
-                 router_triggers += f"{sql_generator.create_router_trigger(table['name'], 'parent_2_child')}\n\n"
+    def route_router_ids(self, table, route: str, routers: dict[str, str]) -> list[str]:
+        """
+        Gets the IDs of the routers sending a table's rows along a route,
+        through every tier
 
-            elif self.properties['replication-arch'] == 'child-parent':
-                 router_triggers += f"{sql_generator.create_router_trigger(table['name'], 'child_2_parent')}\n\n"
+        Parameter
+        ---------
+        table : dict
+            Configured table
+        route : str
+            `parent-child` or `child-parent`
+        routers : dict[str, str]
+            The `column_routers`
+        """
+        if route == 'parent-child':
+            return [router.router_id for router in self.tier_routers(route)[:-1]] + [self.parent_child_router(table, routers)]
+        elif route == 'child-parent':
+            return [router.router_id for router in self.tier_routers(route)]
+        return []
 
-        return router_triggers, initial_load_router_triggers
-    
-    def build_router_initial_load_trigger_query(self, table):
-        query = ''
-
-        if 'initial-load' in table and table['initial-load'] == 1:
-            if table['initial-load-route'] == 'parent-child':
-                query = f"{sql_generator.create_router_trigger(table['name'], 'parent_2_child')}\n\n"
-            elif table['initial-load-route'] == 'child-parent':
-                query = f"{sql_generator.create_router_trigger(table['name'], 'child_2_parent')}\n\n"
-        
-        return query
+    def iter_router_trigger_queries(self) -> Iterator[str]:
+        routers = self.column_routers()
+        plan = self.load_plan()
+        for table in self.properties['tables']:
+            load = plan.get(table['name'], load_order.DEFAULT_LOAD)
+            # Chunked tables are loaded by their chunk triggers instead
+            order = load_order.NOT_LOADED if load.chunks else load.order
+            for router_id in self.table_router_ids(table, routers):
+                yield sql_generator.create_router_trigger(table['name'], router_id, order)
+
+    def table_router_ids(self, table, routers: dict[str, str]) -> list[str]:
+        """
+        Gets the IDs of the routers a table's captured rows are sent through
+
+        Parameter
+        ---------
+        table : dict
+            Configured table
+        routers : dict[str, str]
+            The `column_routers`
+        """
+        arch = self.properties['replication-arch']
+        route = table.get('route') if arch == 'bi-directional' else arch
+        return self.route_router_ids(table, route, routers)
+
+    def iter_initial_load_router_trigger_queries(self) -> Iterator[str]:
+        routers = self.column_routers()
+        plan = self.load_plan()
+        for table in self.properties['tables']:
+            load = plan.get(table['name'], load_order.DEFAULT_LOAD)
+            if load.chunks or ('initial-load' in table and table['initial-load'] == 1):
+                for trigger_id, router_id, select in self.load_trigger_routers(table, load, routers):
+                    yield sql_generator.create_router_trigger(trigger_id, router_id, load.order, select)
+
+    def load_trigger_routers(self, table, load: load_order.TableLoad, routers: dict[str, str]) -> Iterator[tuple[str, str, str]]:
+        """
+        Yields the trigger ID, router ID and `initial_load_select` of each
+        trigger router a table is initially loaded through: the routers of
+        its `initial-load-route`, or else of its route, with its chunk
+        triggers if chunked, else its load only or capture trigger
+
+        Parameter
+        ---------
+        table : dict
+            Configured table
+        load : TableLoad
+            The table's entry of `load_plan`
+        routers : dict[str, str]
+            The `column_routers`
+        """
+        initial_load = 'initial-load' in table and table['initial-load'] == 1
+        if initial_load:
+            router_ids = self.route_router_ids(table, table['initial-load-route'], routers)
+        else:
+            router_ids = self.table_router_ids(table, routers)
+
+        if load.chunks:
+            for idx, select in enumerate(load.chunks, 1):
+                for router_id in router_ids:
+                    yield sql_generator.chunk_trigger_id(table, idx), router_id, select
+            return
+        trigger_id = sql_generator.load_only_trigger_id(table) if initial_load else table['name']
+        for router_id in router_ids:
+            yield trigger_id, router_id, None
+
+    def load_plan(self) -> dict[str, load_order.TableLoad]:
+        """
+        Plans the initial load of the tables: their `initial_load_order`
+        from the tiers of the foreign key graph of `table_metadata`, and the
+        chunks of tables with more `rows` than `load-chunk-rows`. Tables
+        loaded whole in the first tier are left out.
+
+        Raises
+        ------
+        ValueError
+            If a chunked table's key column is unknown
+        """
+        orders = {}
+        if self.table_metadata:
+            names = [table['name'] for table in self.properties['tables']]
+            dependencies = load_order.table_dependencies(names, self.table_metadata)
+            if dependencies:
+                orders = load_order.initial_load_orders(load_order.load_tiers(names, dependencies))
+
+        chunk_rows = self.properties.get('load-chunk-rows', load_order.DEFAULT_CHUNK_ROWS)
+        plan = {}
+        for table in self.properties['tables']:
+            load = load_order.TableLoad(
+                orders.get(table['name'], load_order.LOAD_ORDER_START),
+                tuple(load_order.table_chunks(table, self.table_metadata.get(table['name']), chunk_rows)))
+            if load != load_order.DEFAULT_LOAD:
+                plan[table['name']] = load
+        return plan
+
+    def build_group_queries(self) -> tuple[str, str]:
+        return ''.join(self._statements(self.iter_group_queries())), \
+            ''.join(self._statements(self.iter_group_link_queries()))
+
+    def build_channel_query(self) -> tuple[str, str]:
+        return ''.join(self.iter_channels_list()), \
+            ''.join(self._statements(self.iter_channel_queries()))
+
+    def build_table_trigger_queries(self) -> tuple[str, str]:
+        return ''.join(self._statements(self.iter_table_trigger_queries())), \
+            ''.join(self._statements(self.iter_initial_load_table_trigger_queries()))
+
+    def build_router_query(self) -> str:
+        return ''.join(self._statements(self.iter_router_queries()))
+
+    def build_router_trigger_queries(self) -> tuple[str, str]:
+        return ''.join(self._statements(self.iter_router_trigger_queries())), \
+            ''.join(self._statements(self.iter_initial_load_router_trigger_queries()))
+
+    def build_router_initial_load_trigger_query(self, table) -> str:
+        load = self.load_plan().get(table['name'], load_order.DEFAULT_LOAD)
+        if load.chunks or ('initial-load' in table and table['initial-load'] == 1):
+            return ''.join(f"{sql_generator.create_router_trigger(trigger_id, router_id, load.order, select)}\n\n"
+                           for trigger_id, router_id, select in self.load_trigger_routers(table, load, self.column_routers()))
+
+        return ''
 
     parent_group = ''
     child_group = ''
-    def generate_node_property_files(self):
-        print(os.environ['SDMANAGER_BASE_DIR'])
+    node_tree = topology.NodeTree((), {}, {})
+    # Nodes rendered per batch of process pool work
+    node_window = 1024
+
+    def generate_node_property_files(self, nodes: Iterable[dict] = None) -> list[tuple[str, str]]:
         """
-        Generates property file for each node
+        Generates property file for each node, or only the given nodes
+
+        Nodes are rendered through a process pool when `jobs` is greater than
+        1. Output is in node order and a node that fails to render does not
+        get a file written.
+
+        When building incrementally, nodes whose template and parameters are
+        unchanged since the last build keep their existing file. Nodes of a
+        combined bundle are always rendered, into a new archive.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            Engine name and error message of each node that failed
         """
-        for node in self.properties['nodes']:
-            result = ''
-            parameters = {}
+        self.skipped_nodes = []
+        tasks = self.iter_node_tasks(nodes)
+        failures = []
+        archive = None
+        if self.combined_bundle:
+            archive = bundle.CombinedArchive(os.path.join(self.output_dir, bundle.combined_archive_name(self.bundle_format)), self.bundle_format)
 
-            if node['type'] == 'parent':
-                self.parent_group = node['group_id']
-                parameters = { **self.parent_node_default_properties, **node}
-            else:
-                self.child_group = node['group_id']
-                parameters = { **self.child_node_default_properties, **node}
+        # Nodes are rendered a window at a time so streamed nodes are
+        # never all held in memory
+        executor = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            while True:
+                window = list(islice(tasks, self.node_window))
+                if not window:
+                    break
 
-            # Substite template placeholders with generated parameter
-            try:
-                with open(os.path.join(os.environ['SDMANAGER_BASE_DIR'], 'templates', f"{node['type']}.st"), 'r') as template_file:
-                    src = Template(template_file.read())            
-                    result = src.substitute(parameters)
-            except FileNotFoundError:
-                print(f"Template for {node['type']} was not found")
-            except Exception:
-                print(f"Unable to generate {node['type']} template for {node['external_id']}")
-
-            if self.output_dir != None:
-                # Writes propertes file for node
-                with open(os.path.join(self.output_dir, f'{node["engine_name"]}.properties'), 'w') as node_properties_file:
-                                node_properties_file.writelines(result)
+                node_tasks = [task for task, _ in window]
+                if executor is not None:
+                    chunksize = max(1, len(node_tasks) // (self.jobs * 4))
+                    results = executor.map(_write_node_properties, node_tasks, chunksize=chunksize)
+                else:
+                    results = map(_write_node_properties, node_tasks)
+
+                if self.profiler is not None:
+                    self.profiler.count('nodes_rendered', len(window))
+                for (_, input_hash), (engine_name, result, output_hash, error) in zip(window, results):
+                    if error is not None:
+                        failures.append((engine_name, error))
+                    elif archive is not None:
+                        archive.add(engine_name, result)
+                    elif result is not None:
+                        print(result)
+                    elif self.manifest is not None:
+                        self.manifest.record_node(engine_name, input_hash, output_hash)
+        except BaseException:
+            if archive is not None:
+                archive.abort()
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        if archive is not None:
+            archive.close()
+
+        if self.profiler is not None:
+            self.profiler.count('nodes_skipped', len(self.skipped_nodes))
+            self.profiler.count('nodes_failed', len(failures))
+
+        if self.manifest is not None and archive is None:
+            self.manifest.save()
+            if self.skipped_nodes:
+                print(f"Skipped {len(self.skipped_nodes)} unchanged node properties file(s)")
+            removed = self.manifest.removed_nodes()
+            if removed:
+                print(f"Properties files of nodes no longer configured were left in place: {', '.join(removed)}")
+
+        return failures
+
+    def iter_node_tasks(self, nodes: Iterable[dict] = None) -> Iterator[tuple[tuple, str]]:
+        """
+        Yields the render task and input fingerprint of each node, or each
+        of the given nodes, needing its properties file generated, skipping
+        unchanged nodes
+        """
+        templates = {}
+        manifest = None if self.combined_bundle else self.manifest
+        for node in self.properties['nodes'] if nodes is None else nodes:
+            if node['type'] not in templates:
+                templates[node['type']] = self.read_node_template(node['type'])
+            template = templates[node['type']]
+            parameters = self.node_parameters(node)
+
+            input_hash = None
+            if manifest is not None:
+                input_hash = fingerprint(template.fingerprint if template else None, parameters)
+                if manifest.node_unchanged(node['engine_name'], input_hash):
+                    manifest.keep_node(node['engine_name'])
+                    self.skipped_nodes.append(node['engine_name'])
+                    continue
+
+            output_path = None
+            if self.output_dir != None and not self.combined_bundle:
+                output_path = os.path.join(self.output_dir, f'{node["engine_name"]}{self.node_suffix}')
+            yield (node, template, parameters, output_path, self.bundle_format), input_hash
+
+    def node_parameters(self, node) -> dict:
+        """
+        Merges a node's configuration over the defaults for its type and
+        the engine parameters of its performance profile. Nodes registering
+        with an upstream node default to its sync URL as registration URL.
+        """
+        defaults = self.child_node_default_properties if node['type'] == 'child' else self.parent_node_default_properties
+        registration = {}
+        upstream = self.node_tree.upstream.get(node['engine_name'])
+        if upstream is not None:
+            registration['registration_url' if node['type'] == 'router' else 'url'] = self.node_tree.sync_urls.get(upstream)
+        profile, engine_parameters = profiles.node_engine_parameters(node, self.properties.get('profile'))
+
+        # Profile < node keys < node `parameters`
+        templated = {}
+        extra = {}
+        for key, value in engine_parameters.items():
+            placeholder = profiles.TEMPLATE_PLACEHOLDERS.get(key)
+            if placeholder in defaults:
+                templated[placeholder] = profiles.format_value(value)
             else:
-                print(result)
-    
-    def generate_sql_file(self, mappings):
+                extra[key] = value
+        overrides = {profiles.TEMPLATE_PLACEHOLDERS[key]: templated[profiles.TEMPLATE_PLACEHOLDERS[key]]
+                     for key in node.get('parameters', {}) if profiles.TEMPLATE_PLACEHOLDERS.get(key) in templated}
+
+        return {
+            **defaults, **templated, **registration, **node, **overrides,
+            profiles.PERFORMANCE_PLACEHOLDER: profiles.render_performance_properties(profile, extra),
+        }
+
+    def read_node_template(self, node_type: str):
+        """
+        Gets the compiled properties template for a node type
+
+        Returns
+        -------
+        CompiledTemplate | None
+            Template, or None if the type has no template
+        """
+        try:
+            return self.templates.get(node_type)
+        except FileNotFoundError:
+            return None
+
+    def generate_sql_file(self, mappings=None):
         """
         Generates SQL queries necessary for SymmetricDS to function appropriately
+
+        Sections are streamed into the output in `sql.st` order, so the whole
+        script is never held in memory.
+
+        Parameter
+        ---------
+        mappings : dict[str, str], optional
+            Prebuilt section text keyed by `sql.st` placeholder. Sections are
+            generated from the properties when omitted.
         """
-        result =''
+        sections = self.sql_sections()
+        if mappings is not None:
+            sections = {name: (lambda text=text: (text,)) for name, text in mappings.items()}
+
         try:
-            with open(os.path.join(os.environ['SDMANAGER_BASE_DIR'], 'templates', 'sql.st'), 'r') as template_file:
-                src = Template(template_file.read())            
-                result = src.substitute(mappings)
+            template = self.templates.get('sql')
         except FileNotFoundError:
             print(f"SQL template file not found")
+            return
+
+        try:
+            if self.output_dir == None:
+                sql_writer.write_sql(sql_writer.iter_template(template, sections))
+                print()
+            elif self.manifest is None or mappings is not None:
+                sql_writer.write_sql_file(os.path.join(self.output_dir, 'symmetricds.sql'), sql_writer.iter_template(template, sections))
+            else:
+                self.write_incremental_sql_file(template, sections)
         except Exception as e:
             print(f"Unable to generate sql template: {e}")
 
-        if self.output_dir != None:
-            # Writes propertes file for node
-            with open(os.path.join(self.output_dir, 'symmetricds.sql'), 'w') as node_properties_file:
-                node_properties_file.writelines(result)
-        else:
-            print(result)
\ No newline at end of file
+    def sql_section_hashes(self, names) -> dict[str, str]:
+        """
+        Fingerprints the inputs of each named `sql.st` section
+        """
+        key_hashes = {}
+
+        def key_hash(key):
+            if key not in key_hashes:
+                if key in self.derived_sql_inputs:
+                    value = getattr(self, self.derived_sql_inputs[key])()
+                else:
+                    value = self.properties.get(key)
+                if isinstance(value, properties_reader.StreamedEntries):
+                    key_hashes[key] = fingerprint_entries(value)
+                else:
+                    key_hashes[key] = fingerprint(value)
+            return key_hashes[key]
+
+        hashes = {}
+        for name in names:
+            # Unknown sections depend on everything
+            keys = self.sql_section_inputs.get(name, sorted(self.properties))
+            hashes[name] = fingerprint(name, [key_hash(key) for key in keys], self.sql_options())
+        return hashes
+
+    def sql_options(self) -> list:
+        """
+        Builder settings that affect the generated SQL besides the properties
+        """
+        options = [self.parent_group, self.child_group, self.insert_batch_size, self.dialect]
+        if self.node_tree.router_groups:
+            options.append(list(self.node_tree.router_groups))
+        return options
+
+    def write_incremental_sql_file(self, template, sections):
+        """
+        Rewrites only the sections of `symmetricds.sql` whose inputs changed,
+        copying the others from the previous file. The file is left untouched
+        if no section changed.
+        """
+        path = os.path.join(self.output_dir, 'symmetricds.sql')
+        section_hashes = self.sql_section_hashes(template.placeholders)
+        reuse = self.manifest.reusable_sql_sections(path, template.fingerprint, section_hashes)
+        self.reused_sql_sections = sorted(reuse)
+
+        if set(reuse) == set(section_hashes):
+            self.manifest.keep_sql()
+            self.manifest.save()
+            print("Skipped symmetricds.sql, no section changed")
+            return
+
+        output_hash, spans = sql_writer.write_sql_sections(path, template, sections, reuse)
+        self.manifest.record_sql(template.fingerprint, output_hash, section_hashes, spans)
+        self.manifest.save()
+        if reuse:
+            print(f"Reused {len(reuse)} unchanged SQL section(s): {', '.join(self.reused_sql_sections)}")
+
+
+def load_properties(path_to_json: str) -> dict:
+    """
+    Reads replication properties from a JSON file, exiting with a message
+    if the file cannot be read or parsed
+    """
+    try:
+        with open(path_to_json) as f:
+            return json.load(f)
+    except Exception as e:
+        sys.exit(f"Unable to upon supplied config file: {e}")
+
+
+def _write_node_properties(task) -> tuple[str, str, str, str]:
+    """
+    Renders a node's properties, or its bundle if a bundle format is given,
+    and writes them if an output path is given. Module level so it can run
+    in a process pool worker.
+
+    Returns
+    -------
+    tuple[str, str | bytes, str, str]
+        Engine name, rendered text or bundle when not written to a file,
+        SHA-256 of the written file, and an error message or None
+    """
+    node, template, parameters, output_path, bundle_format = task
+
+    if template is None:
+        return node['engine_name'], None, None, f"Template for {node['type']} was not found"
+
+    # Substite template placeholders with generated parameter
+    try:
+        result = template.render(parameters)
+    except KeyError as e:
+        return node['engine_name'], None, None, f"Unable to generate {node['type']} template for {node['external_id']}: missing {e}"
+    except Exception as e:
+        return node['engine_name'], None, None, f"Unable to generate {node['type']} template for {node['external_id']}: {e}"
+
+    if bundle_format is not None:
+        content = bundle.node_bundle(node['engine_name'], result, bundle_format)
+    elif output_path is None:
+        return node['engine_name'], result, None, None
+    else:
+        content = result.encode('utf-8')
+    if output_path is None:
+        return node['engine_name'], content, None, None
+
+    # Writes propertes file, or bundle, for node
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as node_properties_file:
+            node_properties_file.write(content)
+        os.replace(tmp_path, output_path)
+    except OSError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return node['engine_name'], None, None, f"Unable to write {output_path}: {e}"
+
+    return node['engine_name'], None, hashlib.sha256(content).hexdigest(), None
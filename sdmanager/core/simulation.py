@@ -0,0 +1,460 @@
+import heapq
+import math
+import random
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+from sdmanager.core import capacity
+
+# Note: The simulation is fluid rather than per row: each routing run moves
+# the rows captured since the previous run, as fractional row counts, into
+# batches per target node and channel, and each push or pull moves whole
+# batches. Rows keep their mean and oldest capture time, so end-to-end
+# latency is measured without tracking individual rows, and the cost of a
+# run grows with nodes and job runs rather than with the change rate.
+
+DEFAULT_DURATION = 300
+# SymmetricDS channel defaults for settings the configuration leaves unset
+DEFAULT_MAX_BATCH_SIZE = 100000
+DEFAULT_MAX_BATCH_TO_SEND = 60
+DEFAULT_MAX_DATA_TO_ROUTE = 100000
+LATENCY_BUCKET_SECONDS = 0.1
+BACKLOG_SAMPLES = 40
+# Backlog over the last quarter of the run this much above the second
+# quarter means the layout does not keep up
+GROWTH_RATIO = 1.25
+
+ROUTE, PUSH, PULL, SAMPLE = range(4)
+
+
+class Flow(NamedTuple):
+    """Tables of a channel captured at the same groups and sent through the same routers"""
+    flow_id: int
+    channel: str
+    routers: tuple
+    tables: tuple
+    rows_per_second: float
+    row_bytes: float
+    origins: frozenset
+
+
+class ChannelStats(NamedTuple):
+    channel: str
+    rows: float
+    mean_latency: Optional[float]
+    p95_latency: Optional[float]
+    max_latency: Optional[float]
+    backlog_rows: float
+    growing: bool
+
+
+class LinkStats(NamedTuple):
+    source: str
+    target: str
+    data_event_action: str
+    batches: int
+    rows: float
+    bytes_per_second: float
+    busiest_node_bytes_per_second: float
+    peak_backlog_batches: int
+    backlog_batches: int
+
+
+class SimulationReport():
+    """Latency per channel and traffic per group link of a simulation run
+    """
+
+    def __init__(self, duration: float, nodes: int, channels: list[ChannelStats], links: list[LinkStats],
+                 warnings: list[str], events: int, seconds: float) -> None:
+        self.duration = duration
+        self.nodes = nodes
+        self.channels = channels
+        self.links = links
+        self.warnings = warnings
+        self.events = events
+        self.seconds = seconds
+
+    def to_dict(self) -> dict:
+        return {
+            'duration': self.duration,
+            'nodes': self.nodes,
+            'channels': [stats._asdict() for stats in self.channels],
+            'links': [stats._asdict() for stats in self.links],
+            'warnings': self.warnings,
+            'events': self.events,
+            'seconds': self.seconds,
+        }
+
+    def __str__(self) -> str:
+        def seconds(value):
+            return '-' if value is None else f"{value:.2f}"
+
+        lines = [f"Simulated {self.duration:g}s of {self.nodes} node(s) in {self.seconds:.2f}s ({self.events:,} job runs)", '',
+                 f"{'Channel':<24} {'Rows':>12} {'Mean s':>8} {'p95 s':>8} {'Max s':>8} {'Backlog rows':>13}"]
+        for stats in self.channels:
+            lines.append(f"{stats.channel:<24} {stats.rows:>12,.0f} {seconds(stats.mean_latency):>8} {seconds(stats.p95_latency):>8} "
+                         f"{seconds(stats.max_latency):>8} {stats.backlog_rows:>13,.0f}{'  growing' if stats.growing else ''}")
+
+        lines += ['', f"{'Link':<32} {'Action':>6} {'Batches':>9} {'KiB/s':>10} {'Node KiB/s':>11} {'Peak backlog':>13} {'Backlog':>8}"]
+        for stats in self.links:
+            link = f"{stats.source} -> {stats.target}"
+            lines.append(f"{link:<32} {stats.data_event_action:>6} {stats.batches:>9,} {stats.bytes_per_second / 1024:>10.1f} "
+                         f"{stats.busiest_node_bytes_per_second / 1024:>11.1f} {stats.peak_backlog_batches:>13,} {stats.backlog_batches:>8,}")
+
+        if self.warnings:
+            lines.append('')
+            lines += [f"Warning: {warning}" for warning in self.warnings]
+        return '\n'.join(lines)
+
+
+class ReplicationSimulator():
+    """Discrete-event simulation of a configuration under load
+
+    Rows are captured at `rows-per-second` per table, or the given rates,
+    at every node of the groups a table is captured in. Each node runs its
+    routing, push and pull jobs every period from `node_parameters`, with a
+    random phase. Routing moves up to the channel's `max_data_to_route`
+    captured rows into batches of `max_batch_size` rows for each target
+    node of the table's routers. A push, for `P` group links, or a pull,
+    for `W` links, sends up to `max_batch_to_send` batches per channel in
+    processing order, taking `bytes / bandwidth` seconds when a bandwidth
+    is given. Rows received by a node whose group routes them onward are
+    captured again there.
+
+        report = ReplicationSimulator(ReplicationBuilder('properties.json'), duration=600).run()
+        print(report)
+    """
+
+    def __init__(self, builder, duration: float = DEFAULT_DURATION, rates: dict[str, float] = None,
+                 bandwidth: float = None, seed: int = 0) -> None:
+        self.builder = builder
+        self.duration = duration
+        self.rates = rates or {}
+        self.bandwidth = bandwidth
+        self.random = random.Random(seed)
+        self.warnings = []
+        self.build_model()
+
+    def build_model(self) -> None:
+        """
+        Reads groups, links, channels, routers, tables and job periods
+        from the builder
+
+        Raises
+        ------
+        ValueError
+            If no table has a change rate
+        """
+        builder = self.builder
+        self.nodes = list(builder.properties['nodes'])
+        self.node_groups = [node['group_id'] for node in self.nodes]
+        self.group_nodes = {}
+        for idx, group in enumerate(self.node_groups):
+            self.group_nodes.setdefault(group, []).append(idx)
+        node_ids = {node['engine_name']: idx for idx, node in enumerate(self.nodes)}
+        self.upstream = [node_ids.get(builder.node_tree.upstream.get(node['engine_name'])) for node in self.nodes]
+
+        self.periods = []
+        for node in self.nodes:
+            parameters = builder.node_parameters(node)
+            self.periods.append(tuple(int(parameters[key]) / 1000 for key in
+                                      ['job_routing_period_time_ms', 'job_push_period_time_ms', 'job_pull_period_time_ms']))
+
+        self.links = {(link.source, link.target): link.data_event_action for link in builder.iter_group_links()}
+
+        plans = builder.channel_plans()
+        self.channel_settings = {}
+        for idx, channel in enumerate(builder.properties['channels']):
+            plan = plans.get(channel['id'])
+            self.channel_settings[channel['id']] = (
+                plan.processing_order if plan else 1,
+                (plan and plan.max_batch_size) or DEFAULT_MAX_BATCH_SIZE,
+                (plan and plan.max_batch_to_send) or DEFAULT_MAX_BATCH_TO_SEND,
+                (plan and plan.max_data_to_route) or DEFAULT_MAX_DATA_TO_ROUTE,
+                idx,
+            )
+        self.channel_order = sorted(self.channel_settings, key=lambda channel: self.channel_settings[channel][0::4])
+
+        routers = {router.router_id: router for router in builder.iter_routers()}
+        column_routers = builder.column_routers()
+        grouped = {}
+        for table in builder.properties['tables']:
+            rate = float(self.rates.get(table['name'], table.get('rows-per-second') or 0))
+            router_ids = tuple(builder.table_router_ids(table, column_routers))
+            if rate <= 0 or not router_ids or table.get('channel') not in self.channel_settings:
+                continue
+            entry = grouped.setdefault((table['channel'], router_ids), [[], 0.0, 0.0])
+            entry[0].append(table['name'])
+            entry[1] += rate
+            entry[2] += rate * float(table.get('avg-row-bytes', capacity.DEFAULT_ROW_BYTES))
+
+        if not grouped:
+            raise ValueError("No table has a change rate, set 'rows-per-second' on tables or give rates")
+
+        self.flows = []
+        for (channel, router_ids), (tables, rows, total_bytes) in grouped.items():
+            flow_routers = tuple(routers[router_id] for router_id in router_ids if router_id in routers)
+            sources = {router.source for router in flow_routers}
+            origins = frozenset(sources - {router.target for router in flow_routers}) or frozenset(sources)
+            self.flows.append(Flow(len(self.flows), channel, flow_routers, tuple(tables), rows, total_bytes / rows, origins))
+
+    def target_nodes(self, node: int, group: str) -> list[int]:
+        """
+        Nodes of a group a node routes to. A node with an upstream node
+        only exchanges rows with that node of its upstream's group.
+        """
+        key = (node, group)
+        if key not in self.targets_cache:
+            self.targets_cache[key] = [idx for idx in self.group_nodes.get(group, []) if idx != node and self.linked(node, idx)]
+        return self.targets_cache[key]
+
+    def linked(self, node: int, other: int) -> bool:
+        for lower, upper in [(node, other), (other, node)]:
+            upstream = self.upstream[lower]
+            if upstream is not None and self.node_groups[upstream] == self.node_groups[upper]:
+                return upstream == upper
+        return True
+
+    def run(self) -> SimulationReport:
+        started = time.perf_counter()
+        self.reset()
+
+        events = []
+        for node, group in enumerate(self.node_groups):
+            routing, push, pull = self.periods[node]
+            if group in self.routing_groups:
+                events.append((self.random.uniform(0, routing), len(events), ROUTE, node))
+            if group in self.push_groups:
+                events.append((self.random.uniform(0, push), len(events), PUSH, node))
+            if group in self.pull_groups:
+                events.append((self.random.uniform(0, pull), len(events), PULL, node))
+        for sample in range(1, BACKLOG_SAMPLES + 1):
+            events.append((self.duration * sample / BACKLOG_SAMPLES, len(events), SAMPLE, -1))
+        heapq.heapify(events)
+
+        sequence = len(events)
+        runs = 0
+        while events:
+            now, _, kind, node = heapq.heappop(events)
+            if now > self.duration:
+                break
+            if kind == SAMPLE:
+                self.sample()
+                continue
+
+            runs += 1
+            if kind == ROUTE:
+                self.route(node, now)
+            elif kind == PUSH:
+                for target in list(self.push_targets[node]):
+                    self.sync(node, target, now)
+            else:
+                for source in list(self.pull_sources[node]):
+                    self.sync(source, node, now)
+
+            sequence += 1
+            heapq.heappush(events, (now + self.periods[node][kind], sequence, kind, node))
+
+        return self.report(runs, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        self.routing_groups = set()
+        for flow in self.flows:
+            self.routing_groups.update(router.source for router in flow.routers)
+        self.captured_flows = {group: [flow for flow in self.flows if group in flow.origins] for group in self.routing_groups}
+        self.push_groups = {source for (source, _), action in self.links.items() if action == 'P'}
+        self.pull_groups = {target for (_, target), action in self.links.items() if action == 'W'}
+
+        node_count = len(self.nodes)
+        self.last_capture = [0.0] * node_count
+        # Per node and channel: [flow, rows, mean capture time, oldest capture time, from group, available at]
+        self.captured = [{} for _ in range(node_count)]
+        # Per node pair and channel: [rows, bytes, terminal rows, terminal mean capture, oldest, relayed parts]
+        self.outgoing = {}
+        self.push_targets = [set() for _ in range(node_count)]
+        self.pull_sources = [set() for _ in range(node_count)]
+        self.relay_cache = {}
+        self.targets_cache = {}
+
+        self.unrouted_rows = dict.fromkeys(self.channel_settings, 0.0)
+        self.unsent_rows = dict.fromkeys(self.channel_settings, 0.0)
+        self.backlog_samples = {channel: [] for channel in self.channel_settings}
+        self.latency_histogram = {channel: {} for channel in self.channel_settings}
+        self.latency_totals = {channel: [0.0, 0.0, None] for channel in self.channel_settings}
+        # Per group link: [batches, rows, bytes, waiting batches, peak waiting batches]
+        self.link_totals = {}
+        self.pair_bytes = {}
+
+    def relays(self, flow: Flow, from_group: str, group: str) -> bool:
+        """Checks if rows of a flow received from a group are routed onward"""
+        key = (flow.flow_id, from_group, group)
+        if key not in self.relay_cache:
+            self.relay_cache[key] = any(router.source == group and router.target != from_group for router in flow.routers)
+        return self.relay_cache[key]
+
+    def route(self, node: int, now: float) -> None:
+        group = self.node_groups[node]
+        captured = self.captured[node]
+
+        elapsed = now - self.last_capture[node]
+        if elapsed > 0:
+            for flow in self.captured_flows[group]:
+                rows = flow.rows_per_second * elapsed
+                captured.setdefault(flow.channel, deque()).append([flow, rows, now - elapsed / 2, self.last_capture[node], None, now])
+                self.unrouted_rows[flow.channel] += rows
+        self.last_capture[node] = now
+
+        for channel, segments in captured.items():
+            _, max_batch_size, _, max_data_to_route, _ = self.channel_settings[channel]
+            budget = max_data_to_route
+            # Every node of a target group receives the same batch
+            batches = {}
+            while segments and budget > 0 and segments[0][5] <= now:
+                segment = segments[0]
+                flow, rows, mean, oldest, from_group, _ = segment
+                if rows > budget:
+                    segment[1] -= budget
+                    rows = budget
+                else:
+                    segments.popleft()
+                budget -= rows
+                self.unrouted_rows[channel] -= rows
+
+                for router in flow.routers:
+                    if router.source != group or router.target == from_group:
+                        continue
+                    targets = self.target_nodes(node, router.target)
+                    if not targets:
+                        continue
+                    target_rows = rows / len(targets) if router.expression is not None else rows
+                    batch = batches.get(router.target)
+                    if batch is None:
+                        batch = batches[router.target] = [0.0, 0.0, 0.0, 0.0, oldest, []]
+                    batch[0] += target_rows
+                    batch[1] += target_rows * flow.row_bytes
+                    batch[4] = min(batch[4], oldest)
+                    if self.relays(flow, group, router.target):
+                        batch[5].append((flow, target_rows, mean, oldest))
+                    else:
+                        batch[2] += target_rows
+                        batch[3] += target_rows * mean
+
+            for target_group, batch in batches.items():
+                if batch[2]:
+                    batch[3] /= batch[2]
+                self.queue_batches(node, target_group, channel, tuple(batch), max_batch_size)
+
+    def queue_batches(self, node: int, target_group: str, channel: str, batch: tuple, max_batch_size: int) -> None:
+        """Queues a routed batch, split by the channel's max batch size, for every node of a target group"""
+        source_group = self.node_groups[node]
+        action = self.links.get((source_group, target_group))
+        if action not in ['P', 'W']:
+            warning = f"No push or pull group link {source_group} -> {target_group}, rows routed to it are never sent"
+            if warning not in self.warnings:
+                self.warnings.append(warning)
+            return
+
+        rows = batch[0]
+        count = max(1, math.ceil(rows / max_batch_size))
+        if count > 1:
+            share = 1 / count
+            batch = (rows * share, batch[1] * share, batch[2] * share, batch[3], batch[4],
+                     [(flow, part_rows * share, mean, oldest) for flow, part_rows, mean, oldest in batch[5]])
+
+        targets = self.target_nodes(node, target_group)
+        for target in targets:
+            queues = self.outgoing.get((node, target))
+            if queues is None:
+                queues = self.outgoing[(node, target)] = {}
+                if action == 'P':
+                    self.push_targets[node].add(target)
+                else:
+                    self.pull_sources[target].add(node)
+            queue = queues.get(channel)
+            if queue is None:
+                queue = queues[channel] = deque()
+            queue.extend([batch] * count)
+
+        totals = self.link_totals.setdefault((source_group, target_group), [0, 0.0, 0.0, 0, 0])
+        totals[3] += count * len(targets)
+        totals[4] = max(totals[4], totals[3])
+        self.unsent_rows[channel] += rows * len(targets)
+
+    def sync(self, node: int, target: int, now: float) -> None:
+        """Sends the waiting batches of a node to a target, as a push or a pull"""
+        queues = self.outgoing[(node, target)]
+        source_group, target_group = self.node_groups[node], self.node_groups[target]
+        totals = self.link_totals[(source_group, target_group)]
+        arrival = now
+        sent_bytes = 0.0
+        for channel in self.channel_order:
+            queue = queues.get(channel)
+            if not queue:
+                continue
+            max_batch_to_send = self.channel_settings[channel][2]
+            for _ in range(min(len(queue), max_batch_to_send)):
+                rows, size, terminal_rows, terminal_mean, oldest, parts = queue.popleft()
+                if self.bandwidth:
+                    arrival += size / self.bandwidth
+                sent_bytes += size
+                totals[0] += 1
+                totals[1] += rows
+                totals[3] -= 1
+                self.unsent_rows[channel] -= rows
+
+                if terminal_rows:
+                    self.record_latency(channel, terminal_rows, arrival - terminal_mean, arrival - oldest)
+                for flow, part_rows, mean, part_oldest in parts:
+                    self.captured[target].setdefault(channel, deque()).append([flow, part_rows, mean, part_oldest, source_group, arrival])
+                    self.unrouted_rows[channel] += part_rows
+
+        totals[2] += sent_bytes
+        self.pair_bytes[(node, target)] = self.pair_bytes.get((node, target), 0.0) + sent_bytes
+
+    def record_latency(self, channel: str, rows: float, latency: float, max_latency: float) -> None:
+        histogram = self.latency_histogram[channel]
+        bucket = int(latency / LATENCY_BUCKET_SECONDS)
+        histogram[bucket] = histogram.get(bucket, 0.0) + rows
+        totals = self.latency_totals[channel]
+        totals[0] += rows
+        totals[1] += rows * latency
+        totals[2] = max_latency if totals[2] is None else max(totals[2], max_latency)
+
+    def sample(self) -> None:
+        for channel in self.channel_settings:
+            self.backlog_samples[channel].append(max(0.0, self.unrouted_rows[channel] + self.unsent_rows[channel]))
+
+    def report(self, runs: int, seconds: float) -> SimulationReport:
+        channels = []
+        for channel in self.channel_order:
+            rows, latency_sum, max_latency = self.latency_totals[channel]
+            p95 = None
+            if rows:
+                cumulative = 0.0
+                for bucket in sorted(self.latency_histogram[channel]):
+                    cumulative += self.latency_histogram[channel][bucket]
+                    if cumulative >= rows * 0.95:
+                        p95 = (bucket + 1) * LATENCY_BUCKET_SECONDS
+                        break
+
+            samples = self.backlog_samples[channel]
+            quarter = max(1, len(samples) // 4)
+            early = samples[quarter:2 * quarter]
+            late = samples[-quarter:]
+            growing = bool(early and late) and sum(late) / len(late) > GROWTH_RATIO * sum(early) / len(early) + 1
+            if growing:
+                self.warnings.append(f"Backlog of channel {channel} keeps growing, the layout does not keep up with the change rate")
+            channels.append(ChannelStats(channel, rows, latency_sum / rows if rows else None, p95, max_latency,
+                                         samples[-1] if samples else 0.0, growing))
+
+        busiest = {}
+        for (node, target), sent_bytes in self.pair_bytes.items():
+            key = (self.node_groups[node], self.node_groups[target])
+            busiest[key] = max(busiest.get(key, 0.0), sent_bytes)
+
+        links = []
+        for (source, target), (batches, rows, sent_bytes, waiting, peak) in self.link_totals.items():
+            links.append(LinkStats(source, target, self.links[(source, target)], batches, rows, sent_bytes / self.duration,
+                                   busiest.get((source, target), 0.0) / self.duration, peak, waiting))
+
+        return SimulationReport(self.duration, len(self.nodes), channels, links, self.warnings, runs, seconds)
@@ -1,15 +1,169 @@
 # Note: Generally avoided multiline string to ensure consistency
 # in built SQL thus enabling unit tests.
 
+import re
+from typing import Iterable, Iterator
 
-def create_channel(channel_id, processing_order: int=1, max_batch_size: int=100000, enabled: int=1, description: str="") -> str:
-    return f"insert into sym_channel (channel_id, processing_order, max_batch_size, enabled, description) values ('{channel_id}', {processing_order}, {max_batch_size}, {enabled}, '{description}');"
+
+class SqlExpression(str):
+    """SQL text inserted into a statement as is rather than as a literal"""
+
+
+CURRENT_TIMESTAMP = SqlExpression('current_timestamp')
+
+
+def sql_literal(value) -> str:
+    """Formats a Python value as a SQL literal"""
+    if isinstance(value, SqlExpression):
+        return str(value)
+    if value is None:
+        return 'null'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class InsertStatement(str):
+    """
+    A single-row insert statement that keeps its table, columns and values
+    so rows for the same table can be batched or executed with parameters
+    """
+
+    def __new__(cls, table: str, columns: str, params: tuple, separator: str = ', '):
+        values = separator.join(sql_literal(param) for param in params)
+        statement = super().__new__(cls, f"insert into {table} ({columns}) values ({values});")
+        statement.table = table
+        statement.columns = columns
+        statement.params = tuple(params)
+        statement.separator = separator
+        statement.values = values
+        return statement
+
+    def __getnewargs__(self):
+        return self.table, self.columns, self.params, self.separator
+
+    @property
+    def column_names(self) -> list[str]:
+        return [column.strip() for column in self.columns.split(',')]
+
+
+# Dialect of each known JDBC driver and the most rows the dialect accepts
+# in a single multi-row insert (None for no limit)
+DRIVER_DIALECTS = {
+    'com.mysql.jdbc.Driver': 'mysql',
+    'com.mysql.cj.jdbc.Driver': 'mysql',
+    'org.mariadb.jdbc.Driver': 'mysql',
+    'org.postgresql.Driver': 'postgresql',
+    'org.sqlite.JDBC': 'sqlite',
+    'org.h2.Driver': 'h2',
+    'org.apache.derby.jdbc.EmbeddedDriver': 'derby',
+    'org.apache.derby.jdbc.ClientDriver': 'derby',
+    'com.ibm.db2.jcc.DB2Driver': 'db2',
+    'com.microsoft.sqlserver.jdbc.SQLServerDriver': 'mssql',
+    'net.sourceforge.jtds.jdbc.Driver': 'mssql',
+    'oracle.jdbc.OracleDriver': 'oracle',
+    'oracle.jdbc.driver.OracleDriver': 'oracle',
+}
+DIALECT_MAX_ROWS = {
+    'ansi': None,
+    'mysql': None,
+    'postgresql': None,
+    'sqlite': 500,
+    'h2': None,
+    'derby': None,
+    'db2': None,
+    'mssql': 1000,
+    'oracle': 1000,
+}
+
+
+# Target node attributes a column router expression can compare with
+COLUMN_ROUTER_NODE_ATTRIBUTES = ['EXTERNAL_ID', 'NODE_ID', 'NODE_GROUP_ID', 'REDIRECT_NODE']
+
+def dialect_for_driver(driver: str) -> str:
+    """Gets the SQL dialect of a JDBC driver class, `ansi` if unknown"""
+    return DRIVER_DIALECTS.get(driver, 'ansi')
+
+
+def create_multi_row_insert(statements: list[InsertStatement], dialect: str = 'ansi') -> str:
+    """
+    Combines single-row inserts into the same table into one statement
+
+    Parameter
+    ---------
+    statements : list[InsertStatement]
+        Inserts sharing table and columns
+    dialect : str
+        SQL dialect, see `DIALECT_MAX_ROWS`
+
+    Returns
+    -------
+    str
+        The generated SQL query
+    """
+    first = statements[0]
+    if len(statements) == 1:
+        return str(first)
+
+    if dialect == 'oracle':
+        rows = '\n'.join(f"  into {first.table} ({first.columns}) values ({statement.values})" for statement in statements)
+        return f"insert all\n{rows}\nselect 1 from dual;"
+
+    rows = ',\n'.join(f"({statement.values})" for statement in statements)
+    return f"insert into {first.table} ({first.columns}) values\n{rows};"
+
+
+def batch_inserts(statements: Iterable[str], batch_size: int, dialect: str = 'ansi') -> Iterator[str]:
+    """
+    Groups consecutive inserts into the same table and columns into
+    multi-row inserts of at most batch_size rows. Other statements are
+    passed through in order.
+    """
+    max_rows = DIALECT_MAX_ROWS.get(dialect)
+    if max_rows is not None:
+        batch_size = min(batch_size, max_rows)
+
+    batch = []
+    key = None
+    for statement in statements:
+        if not isinstance(statement, InsertStatement):
+            if batch:
+                yield create_multi_row_insert(batch, dialect)
+                batch = []
+            key = None
+            yield statement
+            continue
+
+        statement_key = (statement.table.lower(), statement.columns)
+        if batch and (statement_key != key or len(batch) >= batch_size):
+            yield create_multi_row_insert(batch, dialect)
+            batch = []
+        key = statement_key
+        batch.append(statement)
+
+    if batch:
+        yield create_multi_row_insert(batch, dialect)
+
+
+def create_channel(channel_id, processing_order: int=1, max_batch_size: int=100000, enabled: int=1, description: str="",
+                   max_batch_to_send: int=None, max_data_to_route: int=None, queue: str=None) -> str:
+    """
+    Generates SQL for a channel. `max_batch_to_send`, `max_data_to_route`
+    and `queue` are only set when given, leaving SymmetricDS defaults.
+    """
+    columns = 'channel_id, processing_order, max_batch_size, enabled, description'
+    params = (channel_id, processing_order, max_batch_size, enabled, description)
+    for column, value in [('max_batch_to_send', max_batch_to_send), ('max_data_to_route', max_data_to_route), ('queue', queue)]:
+        if value is not None:
+            columns += f", {column}"
+            params += (value,)
+    return InsertStatement('sym_channel', columns, params)
 
 def create_node_group(id: str, description: str = '') -> str:
-    return f"insert into SYM_NODE_GROUP (node_group_id, description) values ('{id}', '{description}');"
+    return InsertStatement('SYM_NODE_GROUP', 'node_group_id, description', (id, description))
 
 def create_node_group_link(source: str, target: str, option: str) -> str:
-    return f"insert into SYM_NODE_GROUP_LINK (source_node_group_id, target_node_group_id, data_event_action) values ('{source}', '{target}', '{option}');"
+    return InsertStatement('SYM_NODE_GROUP_LINK', 'source_node_group_id, target_node_group_id, data_event_action', (source, target, option))
 
 def create_channel_trigger(trigger_id: str, source_table: str, channel: str) -> str:
     """
@@ -30,25 +184,98 @@ def create_channel_trigger(trigger_id: str, source_table: str, channel: str) ->
         The generated SQl query
     """
 
-    return f"insert into sym_trigger (trigger_id,source_table_name,channel_id,last_update_time,create_time) values ('{trigger_id}','{source_table}','{channel}',current_timestamp,current_timestamp);"
+    return InsertStatement('sym_trigger', 'trigger_id,source_table_name,channel_id,last_update_time,create_time', (trigger_id, source_table, channel, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
 
-def create_table_trigger(tbl):
-    return f"insert into sym_trigger (trigger_id,source_table_name,channel_id,last_update_time,create_time) values ('{tbl['name']}','{tbl['name']}','{tbl['channel']}',current_timestamp,current_timestamp);"
+def create_table_trigger(tbl, sync_on_incoming: bool = False):
+    """
+    Generates SQL for a table's trigger. With `sync_on_incoming`, rows the
+    node receives are captured too, so a router node relays them onward.
+    """
+    if sync_on_incoming:
+        return InsertStatement('sym_trigger', 'trigger_id,source_table_name,channel_id,sync_on_incoming_batch,last_update_time,create_time', (tbl['name'], tbl['name'], tbl['channel'], 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
+    return create_channel_trigger(tbl['name'], tbl['name'], tbl['channel'])
     
-def create_table_load_only_trigger(tbl) -> str:
+def load_only_trigger_id(tbl) -> str:
+    """ID of the capture-disabled trigger used for a table's initial load"""
+    return f"{tbl['name']}_{tbl['initial-load-route'].split('-')[0]}"
+
+def chunk_trigger_id(tbl, idx: int) -> str:
+    """ID of the capture-disabled trigger loading a chunk of a table, from 1"""
+    return f"{tbl['name']}_chunk_{idx}"
+
+def create_table_load_only_trigger(tbl, trigger_id: str = None) -> str:
     """
     This does not carry out validation, user are to ensure validation 
     before passing table dictionary to this method
     """
-    trigger_id = f"{tbl['name']}_{tbl['initial-load-route'].split('-')[0]}"
-    return f"insert into sym_trigger (trigger_id,source_table_name,channel_id, sync_on_insert, sync_on_update, sync_on_delete,last_update_time,create_time) values ('{trigger_id}','{tbl['name']}','{tbl['channel']}',0,0,0,current_timestamp,current_timestamp);"
+    trigger_id = trigger_id or load_only_trigger_id(tbl)
+    return InsertStatement('sym_trigger', 'trigger_id,source_table_name,channel_id, sync_on_insert, sync_on_update, sync_on_delete,last_update_time,create_time', (trigger_id, tbl['name'], tbl['channel'], 0, 0, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
 
 def create_router(router_id, source_node_group_id, target_node_group_id, router_type = 'default') -> str:
-    return f"insert into sym_router (router_id,source_node_group_id,target_node_group_id,router_type,create_time,last_update_time) values ('{router_id}','{source_node_group_id}','{target_node_group_id}','{router_type}',current_timestamp,current_timestamp);"
+    return InsertStatement('sym_router', 'router_id,source_node_group_id,target_node_group_id,router_type,create_time,last_update_time', (router_id, source_node_group_id, target_node_group_id, router_type, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
 
 def create_column_router(router_id, source_node_group_id, target_node_group_id, router_type = 'column', expression="" ) -> str:
-    # TODO Unit tests
-    return f"insert into sym_router (router_id,source_node_group_id,target_node_group_id,router_type,router_expression,create_time,last_update_time) values ('{router_id}','{source_node_group_id}','{target_node_group_id}','{router_type}','{expression}',current_timestamp,current_timestamp);"
+    return InsertStatement('sym_router', 'router_id,source_node_group_id,target_node_group_id,router_type,router_expression,create_time,last_update_time', (router_id, source_node_group_id, target_node_group_id, router_type, expression, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
 
-def create_router_trigger(trigger_id, router_id, initial_load_order = 100):
-    return f"insert into sym_trigger_router (trigger_id,router_id,initial_load_order,last_update_time,create_time) values ('{trigger_id}','{router_id}',{initial_load_order},current_timestamp,current_timestamp);"
+def column_router_expression(route_by: str) -> str:
+    """
+    Converts a table's `route-by` into a SymmetricDS column router expression
+
+    Conditions are `<column> = <value>` or `<column> != <value>`, joined by
+    `or`. Values naming a target node attribute (`EXTERNAL_ID`, `NODE_ID`,
+    `NODE_GROUP_ID`, `REDIRECT_NODE`, with or without a leading `:`) are
+    compared with the attribute of each target node, other values are
+    compared as constants. E.g. `store_id = EXTERNAL_ID` becomes
+    `STORE_ID=:EXTERNAL_ID`.
+
+    Raises
+    ------
+    ValueError
+        If route_by is not a valid expression
+    """
+    if not isinstance(route_by, str) or not route_by.strip():
+        raise ValueError("'route-by' must be an expression such as 'store_id = EXTERNAL_ID'")
+
+    conditions = []
+    for condition in re.split(r'\s+or\s+', route_by.strip(), flags=re.IGNORECASE):
+        match = re.fullmatch(r'(\w+)\s*(!?=)\s*(:?)(\S+)', condition)
+        if match is None:
+            raise ValueError(f"Invalid 'route-by' condition '{condition}', expected '<column> = <value>'")
+        column, operator, colon, value = match.groups()
+        if colon or value.upper() in COLUMN_ROUTER_NODE_ATTRIBUTES:
+            if value.upper() not in COLUMN_ROUTER_NODE_ATTRIBUTES:
+                raise ValueError(f"Unknown node attribute ':{value}' in 'route-by', expected one of {COLUMN_ROUTER_NODE_ATTRIBUTES}")
+            value = f":{value.upper()}"
+        conditions.append(f"{column.upper()}{operator}{value}")
+    return ' or '.join(conditions)
+
+def column_router_id(expression: str, taken: Iterable[str] = ()) -> str:
+    """
+    Names the parent to child router of a column router expression after
+    its first column, e.g. `parent_2_one_child_store_id`
+    """
+    column = re.match(r'\w+', expression).group(0)
+    router_id = f"parent_2_one_child_{column.lower()}"
+    taken = set(taken)
+    if router_id not in taken:
+        return router_id
+    idx = 2
+    while f"{router_id}_{idx}" in taken:
+        idx += 1
+    return f"{router_id}_{idx}"
+
+def create_router_trigger(trigger_id, router_id, initial_load_order = 100, initial_load_select: str = None):
+    """
+    Generates SQL linking a trigger to a router. `initial_load_select` is
+    only set when given, the condition rows are initially loaded with.
+    """
+    if initial_load_select is not None:
+        return InsertStatement('sym_trigger_router', 'trigger_id,router_id,initial_load_order,initial_load_select,last_update_time,create_time', (trigger_id, router_id, initial_load_order, initial_load_select, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
+    return InsertStatement('sym_trigger_router', 'trigger_id,router_id,initial_load_order,last_update_time,create_time', (trigger_id, router_id, initial_load_order, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
+
+def create_table_reload_request(target_node_id, source_node_id, trigger_id, router_id, reload_select: str = None) -> str:
+    """
+    Generates SQL requesting SymmetricDS to reload a trigger router's rows
+    to a node, only those matching `reload_select` if given
+    """
+    return InsertStatement('sym_table_reload_request', 'target_node_id,source_node_id,trigger_id,router_id,reload_select,create_table,delete_first,processed,create_time,last_update_time', (target_node_id, source_node_id, trigger_id, router_id, reload_select, 0, 0, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), ',')
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import sys
+from typing import Callable, Iterable, Iterator, TextIO
+from sdmanager.core.templates import parse_template
+
+# Note: Sections are callables returning iterables so nothing is
+# generated before the writer reaches the section's placeholder.
+
+
+def iter_template(template, sections: dict[str, Callable[[], Iterable[str]]]) -> Iterator[str]:
+    """
+    Yields the literal text of a template and the output of each section
+    in the order their placeholders appear in the template
+
+    Parameter
+    ---------
+    template : str | CompiledTemplate
+        Template text using `string.Template` placeholders, or a
+        compiled template
+    sections : dict[str, Callable[[], Iterable[str]]]
+        Placeholder name to a callable producing the section's chunks
+
+    Returns
+    -------
+    Iterator[str]
+        Chunks of the rendered template
+    """
+    parts = parse_template(template) if isinstance(template, str) else template.parts
+    for literal, name in parts:
+        yield literal
+        if name is None:
+            continue
+        if name not in sections:
+            raise KeyError(name)
+
+        yield from sections[name]()
+
+
+def write_sql(chunks: Iterable[str], stream: TextIO = None) -> int:
+    """Writes chunks to a stream as they are produced
+
+    Args:
+        chunks (Iterable[str]): SQL text chunks
+        stream (TextIO, optional): Destination stream. Defaults to stdout.
+
+    Returns:
+        int: Number of characters written
+    """
+    if stream is None:
+        stream = sys.stdout
+
+    written = 0
+    for chunk in chunks:
+        written += stream.write(chunk)
+    return written
+
+
+def write_sql_file(path: str, chunks: Iterable[str]) -> int:
+    """Streams chunks into a file, replacing it only once all chunks are written
+
+    Args:
+        path (str): Destination file path
+        chunks (Iterable[str]): SQL text chunks
+
+    Returns:
+        int: Number of characters written
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w') as sql_file:
+            written = write_sql(chunks, sql_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return written
+
+
+def write_sql_sections(path: str, template, sections: dict[str, Callable[[], Iterable[str]]],
+                       reuse: dict[str, tuple[int, int]] = None) -> tuple[str, dict[str, tuple[int, int]]]:
+    """
+    Streams a template into a file, copying the sections listed in reuse
+    byte for byte from the file currently at path instead of generating them
+
+    Parameter
+    ---------
+    path : str
+        Destination file path
+    template : CompiledTemplate
+        Compiled SQL template
+    sections : dict[str, Callable[[], Iterable[str]]]
+        Placeholder name to a callable producing the section's chunks
+    reuse : dict[str, tuple[int, int]], optional
+        Byte offset and length of sections in the existing file to keep
+
+    Returns
+    -------
+    tuple[str, dict[str, tuple[int, int]]]
+        SHA-256 of the written file and the byte offset and length of
+        each section in it
+    """
+    reuse = reuse or {}
+    digest = hashlib.sha256()
+    spans = {}
+    tmp_path = f"{path}.tmp"
+
+    def write(sql_file, data: bytes):
+        digest.update(data)
+        sql_file.write(data)
+
+    previous = open(path, 'rb') if reuse else None
+    try:
+        with open(tmp_path, 'wb') as sql_file:
+            for literal, name in template.parts:
+                write(sql_file, literal.encode('utf-8'))
+                if name is None:
+                    continue
+
+                start = sql_file.tell()
+                if name in reuse:
+                    offset, length = reuse[name]
+                    previous.seek(offset)
+                    while length > 0:
+                        block = previous.read(min(length, 1 << 16))
+                        if not block:
+                            raise ValueError(f"Previous SQL file ends inside section '{name}'")
+                        write(sql_file, block)
+                        length -= len(block)
+                elif name in sections:
+                    for chunk in sections[name]():
+                        write(sql_file, chunk.encode('utf-8'))
+                else:
+                    raise KeyError(name)
+                spans[name] = (start, sql_file.tell() - start)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        if previous is not None:
+            previous.close()
+
+    return digest.hexdigest(), spans
@@ -0,0 +1,183 @@
+import hashlib
+import os
+from string import Template
+from typing import Optional
+
+# Note: Templates are compiled into `str.format_map` format strings so a
+# render is a single call into C rather than a regex substitution.
+
+
+def parse_template(source: str) -> list[tuple[str, Optional[str]]]:
+    """
+    Splits `string.Template` text into literal text and placeholder names
+
+    Parameter
+    ---------
+    source : str
+        Template text
+
+    Returns
+    -------
+    list[tuple[str, str | None]]
+        Literal text each followed by a placeholder name, the last
+        placeholder being None
+    """
+    parts = []
+    literal = ''
+    position = 0
+    for match in Template.pattern.finditer(source):
+        literal += source[position:match.start()]
+        position = match.end()
+
+        if match.group('escaped') is not None:
+            literal += Template.delimiter
+            continue
+
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            raise ValueError(f"Invalid placeholder in template at index {match.start()}")
+
+        parts.append((literal, name))
+        literal = ''
+
+    parts.append((literal + source[position:], None))
+    return parts
+
+
+class CompiledTemplate():
+    """A template parsed once and rendered with `str.format_map`
+    """
+
+    def __init__(self, source: str) -> None:
+        self.fingerprint = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        self.parts = parse_template(source)
+        self.placeholders = tuple(dict.fromkeys(name for _, name in self.parts if name is not None))
+        self._format = ''.join(
+            literal.replace('{', '{{').replace('}', '}}') + (f"{{{name}}}" if name is not None else '')
+            for literal, name in self.parts
+        )
+
+    def render(self, mapping) -> str:
+        """Substitutes placeholders with values from mapping
+
+        Args:
+            mapping (Mapping[str, Any]): Placeholder values
+
+        Raises:
+            KeyError: If a placeholder has no value in mapping
+
+        Returns:
+            str: The rendered template
+        """
+        return self._format.format_map(mapping)
+
+    __call__ = render
+
+
+class TemplateRegistry():
+    """Loads `<name>.st` templates once and caches them compiled
+
+    Directories are searched in order, so directories registered by users
+    take precedence over the bundled `templates` directory. Cache entries
+    are keyed on path and modification time, so an edited template is
+    recompiled on its next lookup.
+    """
+
+    def __init__(self, directories: list[str] = None) -> None:
+        self.directories = list(directories or [])
+        self._cache = {}
+
+    @staticmethod
+    def default_directory() -> str:
+        return os.path.join(os.environ['SDMANAGER_BASE_DIR'], 'templates')
+
+    def register_directory(self, directory: str) -> None:
+        """Adds a template directory searched before those already registered
+
+        Args:
+            directory (str): Directory containing `<name>.st` templates
+
+        Raises:
+            NotADirectoryError: If directory does not exist
+        """
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"Template directory '{directory}' does not exist")
+
+        directory = os.path.abspath(directory)
+        if directory in self.directories:
+            self.directories.remove(directory)
+        self.directories.insert(0, directory)
+
+    def find(self, name: str) -> str:
+        """Finds the path of a named template
+
+        Raises:
+            FileNotFoundError: If no directory contains the template
+        """
+        for directory in [*self.directories, self.default_directory()]:
+            path = os.path.join(directory, f"{name}.st")
+            if os.path.isfile(path):
+                return path
+
+        raise FileNotFoundError(f"Template '{name}.st' was not found")
+
+    def get(self, name: str) -> CompiledTemplate:
+        """Returns a compiled template, loading it if absent or stale
+
+        Raises:
+            FileNotFoundError: If no directory contains the template
+        """
+        path = self.find(name)
+        mtime = os.stat(path).st_mtime_ns
+
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as template_file:
+            template = CompiledTemplate(template_file.read())
+        self._cache[path] = (mtime, template)
+        return template
+
+    def evict_stale(self) -> int:
+        """Drops cached templates whose file changed or was removed
+
+        Returns:
+            int: Number of evicted templates
+        """
+        stale = []
+        for path, (mtime, _) in self._cache.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    stale.append(path)
+            except FileNotFoundError:
+                stale.append(path)
+
+        for path in stale:
+            del self._cache[path]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+default_registry = TemplateRegistry()
+_registries = {}
+
+
+def registry_for(directories: list[str] = None) -> TemplateRegistry:
+    """
+    Gets the registry searching directories, in order of precedence, before
+    the bundled templates. Registries are shared by every builder of the
+    process, so a template is compiled once however many builds use it.
+    """
+    if not directories:
+        return default_registry
+
+    key = tuple(os.path.abspath(directory) for directory in directories)
+    if key not in _registries:
+        registry = TemplateRegistry()
+        for directory in reversed(directories):
+            registry.register_directory(directory)
+        _registries[key] = registry
+    return _registries[key]
@@ -0,0 +1,254 @@
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+# Note: Without a `links` section every group is linked with every other
+# group, using the source group's `sync` as the data event action. With
+# router nodes, groups are instead chained tier by tier, from the parent
+# group through the router groups to the child group.
+
+DATA_EVENT_ACTIONS = ['P', 'W', 'R']
+TOPOLOGIES = ['star', 'hub-and-spoke', 'chain']
+DIRECTIONS = ['both', 'out', 'in']
+
+
+class GroupLink(NamedTuple):
+    source: str
+    target: str
+    data_event_action: str
+
+
+class Router(NamedTuple):
+    """A router sending captured rows from one group to another"""
+    router_id: str
+    source: str
+    target: str
+    # Column router expression, None to send rows to every target node
+    expression: Optional[str] = None
+
+
+class NodeTree(NamedTuple):
+    """Router tiers between the parent and child groups"""
+    # Router groups, from the one below the parent group downwards
+    router_groups: tuple
+    # Engine name of the node each router, and each node naming an
+    # `upstream`, registers with
+    upstream: dict
+    # Sync URL of the parent and router nodes, by engine name
+    sync_urls: dict
+
+
+def node_tree(nodes: Iterable[dict]) -> NodeTree:
+    """
+    Orders router nodes into tiers below the parent node. A router
+    registers with the node named by its `upstream`, the parent node by
+    default, and its group is the tier below that node's group. Child nodes
+    may name a router, or the parent, as their `upstream`.
+
+    Only parent and router nodes, and nodes with an `upstream`, are kept,
+    so nodes may be streamed.
+
+    Raises
+    ------
+    ValueError
+        If an upstream is unknown or not a parent or router node, upstream
+        nodes form a cycle, or a router group is not a tier of its own
+
+    Returns
+    -------
+    NodeTree
+        Router tiers and upstream nodes
+    """
+    types = {}
+    groups = {}
+    upstream = {}
+    sync_urls = {}
+    child_groups = set()
+    parent = None
+    for node in nodes:
+        if node['type'] == 'child':
+            child_groups.add(node['group_id'])
+        if node['type'] in ['parent', 'router']:
+            types[node['engine_name']] = node['type']
+            groups[node['engine_name']] = node['group_id']
+            sync_urls[node['engine_name']] = node.get('url')
+        if node['type'] == 'parent':
+            parent = node['engine_name']
+        if node.get('upstream'):
+            upstream[node['engine_name']] = node['upstream']
+        elif node['type'] == 'router':
+            upstream[node['engine_name']] = None
+
+    for engine_name, upstream_name in upstream.items():
+        if upstream_name is None:
+            upstream[engine_name] = parent
+        elif types.get(upstream_name) is None:
+            raise ValueError(f"Upstream node '{upstream_name}' of {engine_name} is not a parent or router node")
+
+    depths = {parent: 0}
+
+    def depth(engine_name, seen=()):
+        if engine_name not in depths:
+            if engine_name in seen:
+                raise ValueError(f"Upstream nodes of {engine_name} form a cycle")
+            depths[engine_name] = depth(upstream[engine_name], (*seen, engine_name)) + 1
+        return depths[engine_name]
+
+    tiers = {groups[parent]: 0} if parent is not None else {}
+    for engine_name, node_type in types.items():
+        if node_type != 'router':
+            continue
+        group = groups[engine_name]
+        if group in child_groups or tiers.get(group) == 0:
+            raise ValueError(f"Router group '{group}' of {engine_name} must not have parent or child nodes")
+        tier = depth(engine_name)
+        if tiers.setdefault(group, tier) != tier:
+            raise ValueError(f"Router group '{group}' must be a single tier, {engine_name} is {tier} tier(s) below the parent")
+
+    router_groups = tuple(sorted((group for group, tier in tiers.items() if tier), key=tiers.get))
+    return NodeTree(router_groups, upstream, sync_urls)
+
+
+def iter_tier_links(tiers: list[str], groups: list[dict]) -> Iterator[GroupLink]:
+    """
+    Links each tier with the next one, in both directions, using each
+    source group's `sync` as the data event action
+    """
+    sync = {group['id']: group['sync'] for group in groups}
+    return iter(expand_link({'topology': 'chain', 'groups': tiers}, sync))
+
+
+def iter_all_pairs(groups: list[dict]) -> Iterator[GroupLink]:
+    """
+    Links every group with every other group
+    """
+    for group in groups:
+        for gp in groups:
+            if gp is not group:
+                yield GroupLink(group['id'], gp['id'], group['sync'])
+
+
+def iter_declared_links(links: list[dict], groups: list[dict]) -> Iterator[GroupLink]:
+    """
+    Expands the `links` section of the replication properties into group
+    links, in declaration order. A link declared more than once with the
+    same action is emitted once.
+
+    Parameter
+    ---------
+    links : list[dict]
+        Explicit links and topology shorthands
+    groups : list[dict]
+        Configured groups, whose `sync` is the default data event action
+
+    Raises
+    ------
+    ValueError
+        If an entry is invalid or a link is declared with conflicting actions
+
+    Returns
+    -------
+    Iterator[GroupLink]
+        Group links
+    """
+    sync = {group['id']: group['sync'] for group in groups}
+    declared = {}
+    for idx, entry in enumerate(links):
+        for link in expand_link(entry, sync):
+            key = (link.source, link.target)
+            if key in declared:
+                if declared[key] != link.data_event_action:
+                    raise ValueError(f"links[{idx}]: link {link.source} -> {link.target} is already declared with action '{declared[key]}'")
+                continue
+
+            declared[key] = link.data_event_action
+            yield link
+
+
+def expand_link(entry: dict, sync: dict[str, str]) -> list[GroupLink]:
+    """
+    Expands a single `links` entry
+
+    Entry forms
+    -----------
+    {"source": "corp", "target": "store", "data_event_action": "W"}
+        A single link. The action defaults to the source group's sync.
+    {"topology": "star", "hub": "corp", "spokes": ["store"]}
+        Links the hub with each spoke. Spokes default to every other group.
+    {"topology": "hub-and-spoke", "hubs": {"corp": ["region"], "region": ["store"]}}
+        Links each hub with its own spokes, e.g. for a tree of tiers.
+    {"topology": "chain", "groups": ["corp", "region", "store"]}
+        Links each group with the next one.
+
+    Shorthands accept `direction` of `both` (default), `out` (hub to spoke,
+    or down the chain) or `in`, and `out_action` / `in_action` overriding
+    the actions of each direction.
+
+    Raises
+    ------
+    ValueError
+        If the entry is invalid
+    """
+    if not isinstance(entry, dict):
+        raise ValueError('Link entries must be objects')
+
+    if 'topology' not in entry:
+        for key in ['source', 'target']:
+            if not entry.get(key):
+                raise ValueError(f"'{key}' key is required for link configuration")
+        check_groups([entry['source'], entry['target']], sync)
+        if entry['source'] == entry['target']:
+            raise ValueError(f"Group '{entry['source']}' cannot be linked to itself")
+
+        action = entry.get('data_event_action', sync[entry['source']])
+        check_action(action)
+        return [GroupLink(entry['source'], entry['target'], action)]
+
+    topology = entry['topology']
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topology must be one of {TOPOLOGIES}")
+
+    direction = entry.get('direction', 'both')
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Link direction must be one of {DIRECTIONS}")
+
+    if topology == 'star':
+        if not entry.get('hub'):
+            raise ValueError("'hub' key is required for star topology")
+        spokes = entry.get('spokes', [group_id for group_id in sync if group_id != entry['hub']])
+        pairs = [(entry['hub'], spoke) for spoke in spokes]
+    elif topology == 'hub-and-spoke':
+        if not isinstance(entry.get('hubs'), dict) or not entry['hubs']:
+            raise ValueError("'hubs' mapping of hub to spokes is required for hub-and-spoke topology")
+        pairs = [(hub, spoke) for hub, spokes in entry['hubs'].items() for spoke in spokes]
+    else:
+        chain = entry.get('groups', [])
+        if len(chain) < 2:
+            raise ValueError("Minimum of 2 'groups' is required for chain topology")
+        pairs = list(zip(chain, chain[1:]))
+
+    result = []
+    for upstream, downstream in pairs:
+        check_groups([upstream, downstream], sync)
+        if upstream == downstream:
+            raise ValueError(f"Group '{upstream}' cannot be linked to itself")
+
+        if direction in ['both', 'out']:
+            action = entry.get('out_action', sync[upstream])
+            check_action(action)
+            result.append(GroupLink(upstream, downstream, action))
+        if direction in ['both', 'in']:
+            action = entry.get('in_action', sync[downstream])
+            check_action(action)
+            result.append(GroupLink(downstream, upstream, action))
+
+    return result
+
+
+def check_groups(group_ids: list[str], sync: dict[str, str]) -> None:
+    for group_id in group_ids:
+        if group_id not in sync:
+            raise ValueError(f"Linked group '{group_id}' is not a configured group")
+
+
+def check_action(action: str) -> None:
+    if action not in DATA_EVENT_ACTIONS:
+        raise ValueError('Data event action of P, W or R is required for link configuration')
@@ -0,0 +1,115 @@
+import os
+from typing import Iterator
+from xml.etree.ElementTree import iterparse
+from sdmanager.core.catalog import CATALOG_VERSION, SYM_TABLE_PREFIX, CatalogCache
+from sdmanager.core.manifest import fingerprint
+
+# Note: Torque XML is the database independent DDL format used by
+# SymmetricDS, e.g. `samples/create_sample.xml`. Tables are read into the
+# same snapshot format as database catalogs (see `catalog`), with the
+# Torque `size` kept on columns that declare one.
+
+TRUE_VALUES = ['true', '1', 'yes']
+
+
+def iter_torque_tables(path: str) -> Iterator[dict]:
+    """
+    Streams the tables of a Torque XML schema, one at a time. Elements are
+    cleared once read, so memory stays bounded by the largest table rather
+    than the whole schema.
+
+    Parameter
+    ---------
+    path : str
+        Torque XML schema file
+
+    Raises
+    ------
+    ValueError
+        If the file is not well formed or a table has no name
+
+    Returns
+    -------
+    Iterator[dict]
+        Tables in catalog snapshot format, in schema order
+    """
+    root = None
+    table = None
+    foreign_key = None
+    try:
+        for event, element in iterparse(path, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if root is None:
+                    root = element
+                elif tag == 'table':
+                    if not element.get('name'):
+                        raise ValueError('Torque table without a name')
+                    table = {'name': element.get('name'), 'columns': [], 'primary_key': [], 'foreign_keys': []}
+                elif tag == 'foreign-key' and table is not None:
+                    foreign_key = {'columns': [], 'foreign_table': element.get('foreignTable'), 'foreign_columns': []}
+                continue
+
+            if table is None:
+                continue
+
+            if tag == 'column':
+                primary = element.get('primaryKey', '').lower() in TRUE_VALUES
+                required = element.get('required', '').lower() in TRUE_VALUES
+                column = {'name': element.get('name'), 'type': element.get('type', '').upper(), 'nullable': not (required or primary)}
+                if element.get('size'):
+                    column['size'] = element.get('size')
+                table['columns'].append(column)
+                if primary:
+                    table['primary_key'].append(column['name'])
+            elif tag == 'reference' and foreign_key is not None:
+                foreign_key['columns'].append(element.get('local'))
+                foreign_key['foreign_columns'].append(element.get('foreign'))
+            elif tag == 'foreign-key' and foreign_key is not None:
+                table['foreign_keys'].append(foreign_key)
+                foreign_key = None
+            elif tag == 'table':
+                yield table
+                table = None
+                root.clear()
+    except SyntaxError as e:
+        # ElementTree.ParseError
+        raise ValueError(f"Invalid Torque schema {path}: {e}") from None
+
+
+def read_torque_schema(path: str, cache: CatalogCache = None) -> dict:
+    """
+    Reads a Torque XML schema into a catalog snapshot, from the cache when
+    the file is unchanged since it was last parsed
+
+    Parameter
+    ---------
+    path : str
+        Torque XML schema file
+    cache : CatalogCache
+        Snapshot cache. None disables caching
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid Torque schema
+
+    Returns
+    -------
+    dict
+        Catalog snapshot
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    connection_key = CatalogCache.connection_key(f"torque:{path}")
+    schema_hash = fingerprint(stat.st_size, stat.st_mtime_ns)
+    if cache is not None:
+        snapshot = cache.load(connection_key, schema_hash)
+        if snapshot is not None:
+            return snapshot
+
+    tables = [table for table in iter_torque_tables(path) if not table['name'].lower().startswith(SYM_TABLE_PREFIX)]
+    snapshot = {'version': CATALOG_VERSION, 'tables': tables}
+    if cache is not None:
+        cache.save(connection_key, schema_hash, snapshot)
+    return snapshot
@@ -1,3 +1,42 @@
+from typing import NamedTuple
+from sdmanager.core import capacity, load_order, profiles, sql_generator, topology
+
+
+class ValidationIssue(NamedTuple):
+    """A validation error and the JSON path of the offending value"""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+class ValidationReport():
+    """All validation errors found in replication properties
+    """
+
+    def __init__(self) -> None:
+        self.errors = []
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def add(self, path: str, message: str) -> None:
+        self.errors.append(ValidationIssue(path, message))
+
+    def to_dict(self) -> dict:
+        return {
+            'valid': self.valid,
+            'errors': [error._asdict() for error in self.errors]
+        }
+
+    def __str__(self) -> str:
+        if self.valid:
+            return 'Valid'
+        return '\n'.join(str(error) for error in self.errors)
+
+
 class Validator():
 
     def __init__(self, config):
@@ -17,7 +56,8 @@ class Validator():
         - Ensure assigned groups in node properties exit as group
         - if duplicate Node external IDs exists in replication properties fail
         - if duplicate node engine names exists in replication properties, fail
-        - if node type not 'parent' or 'child' fail
+        - if node type not 'parent', 'child' or 'router' fail
+        - Ensure router nodes form tiers below the parent node
 
         Otherwise, check that all other required parameters with 
         the replication properties
@@ -37,9 +77,17 @@ class Validator():
         group = self.validate_groups()
         if not group[0]:
             return group
+        links = self.validate_links()
+        if not links[0]:
+            return links
+        for key, message in self.profile_errors(self.properties):
+            return False, message
         node = self.validate_nodes()
         if not node[0]:
             return node
+        channel = self.validate_channels()
+        if not channel[0]:
+            return channel
         table = self.validate_table()
         if not table[0]:
             return table
@@ -87,13 +135,30 @@ class Validator():
             if group['sync'] not in ['P', 'W', 'R']:
                 return False, 'Synchronization mode of P, W or R is required for group configuration'
         
-        group_ids = [gp['id'] for gp in self.properties['groups']]
-        contains_duplicates = any(group_ids.count(element) > 1 for element in group_ids)
-        if contains_duplicates:
+        if len(set(self.groups)) != len(self.groups):
             return False, 'Group ID must be unique'
         
         return self.success()
     
+    def validate_links(self) -> tuple[ bool, str]:
+        """Checks the optional `links` section expands into valid group links
+
+        Returns:
+            tuple[bool, str]: Validation result and message
+        """
+        if not 'links' in self.properties:
+            return self.success()
+        if not isinstance(self.properties['links'], list):
+            return False, "'links' must be a list"
+
+        try:
+            for _ in topology.iter_declared_links(self.properties['links'], self.properties['groups']):
+                pass
+        except ValueError as e:
+            return False, str(e)
+
+        return self.success()
+
     def validate_nodes(self) -> tuple[ bool, str]:
         
         if len(self.properties['nodes']) < 2:
@@ -104,20 +169,22 @@ class Validator():
             if not result:
                 return result, error
 
-        node_groups = [node['group_id'] for node in self.properties['nodes']]
-        node_groups = list(dict.fromkeys(node_groups))
+        node_groups = {node['group_id'] for node in self.properties['nodes']}
         if len(node_groups) < 2:
             return False, "Minimum of 2 node groups required."
 
-        node_engine_names = [n['engine_name'] for n in self.properties['nodes']]
-        contains_duplicate_engine_name = any(node_engine_names.count(element) > 1 for element in node_engine_names)
-        if contains_duplicate_engine_name:
+        node_engine_names = {n['engine_name'] for n in self.properties['nodes']}
+        if len(node_engine_names) != len(self.properties['nodes']):
             return False, 'Node engine name must be unique.'
         
-        node_external_id_list = [n['external_id'] for n in self.properties['nodes']]
-        contains_duplicate_external_id= any(node_external_id_list.count(element) > 1 for element in node_external_id_list)
-        if contains_duplicate_external_id:
+        node_external_ids = {n['external_id'] for n in self.properties['nodes']}
+        if len(node_external_ids) != len(self.properties['nodes']):
             return False, 'Node external ID must be unique.'
+
+        try:
+            topology.node_tree(self.properties['nodes'])
+        except ValueError as e:
+            return False, str(e)
             
         return self.success()
     
@@ -143,6 +210,12 @@ class Validator():
         
         if node['type'] == 'parent' and not 'url' in node:
                 return False, "A parent node must have a synchronization url"
+
+        if node['type'] == 'router' and not 'url' in node:
+                return False, "A router node must have a synchronization url"
+
+        if node['type'] == 'parent' and 'upstream' in node:
+                return False, "A parent node cannot have an upstream node"
         
         if node['type'] == 'type' and not 'url' in node:
                 return False, "A child node must have a replication url"
@@ -150,6 +223,9 @@ class Validator():
         if node['group_id'] not in self.groups:
             return False, f"Node {node['external_id']}'s assigned group '{node['group_id']}' is not in {self.groups}"
 
+        for key, message in self.profile_errors(node):
+            return False, f"{node['engine_name']}: {message}"
+
         return self.success()
 
     def get_node_types(self, nodes):
@@ -159,8 +235,90 @@ class Validator():
         print(ls)
 
     
+    def profile_errors(self, entry: dict) -> list[tuple[str, str]]:
+        """
+        Checks the `profile` and `parameters` of the properties or a node
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            The invalid keys and their errors
+        """
+        errors = []
+        if 'profile' in entry and entry['profile'] not in profiles.PROFILES:
+            errors.append(('profile', f"Profile must be one of {sorted(profiles.PROFILES)}"))
+        if 'parameters' in entry:
+            parameters = entry['parameters']
+            if not isinstance(parameters, dict) or any(isinstance(value, (dict, list)) or value is None for value in parameters.values()):
+                errors.append(('parameters', "'parameters' must map engine parameter names to values"))
+        return errors
+
+    def validate_channels(self) -> tuple[ bool, str]:
+        """Checks the optional capacity tuning fields of each channel
+
+        Returns:
+            tuple[bool, str]: Validation result and message
+        """
+        for channel in self.properties['channels']:
+            for key, message in self.capacity_errors(channel, capacity.CHANNEL_TUNING_KEYS):
+                return False, f"{channel.get('id')}: {message}"
+
+        return self.success()
+
+    def capacity_errors(self, entry: dict, keys: list[str]) -> list[tuple[str, str]]:
+        """
+        Checks channel tuning or table rate fields, see `capacity`
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            The invalid keys and their errors
+        """
+        errors = []
+        for key in keys:
+            if key not in entry:
+                continue
+            value = entry[key]
+            if key == 'queue':
+                if not isinstance(value, str) or not value:
+                    errors.append((key, f"'{key}' must be a queue name"))
+            elif key in ['rows-per-second', 'avg-row-bytes']:
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                    errors.append((key, f"'{key}' must be a number of at least 0"))
+            elif isinstance(value, bool) or not isinstance(value, int) or value < (0 if key == 'processing-order' else 1):
+                errors.append((key, f"'{key}' must be an integer of at least {0 if key == 'processing-order' else 1}"))
+        return errors
+
+    def load_errors(self, table: dict) -> list[tuple[str, str]]:
+        """
+        Checks a table's initial load fields, see `load_order`
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            The invalid keys and their errors
+        """
+        errors = []
+        rows = table.get('rows')
+        if 'rows' in table and (isinstance(rows, bool) or not isinstance(rows, int) or rows < 0):
+            errors.append(('rows', "'rows' must be an integer of at least 0"))
+        if 'key-range' in table:
+            error = load_order.key_range_error(table['key-range'])
+            if error:
+                errors.append(('key-range', error))
+        return errors
+
+    def chunk_rows_error(self):
+        value = self.properties.get('load-chunk-rows', load_order.DEFAULT_CHUNK_ROWS)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            return "'load-chunk-rows' must be an integer of at least 1"
+        return None
+
     def validate_table(self) -> tuple[ bool, str]:
         # Table validation
+        error = self.chunk_rows_error()
+        if error:
+            return False, error
         table_required_keys = ['name', 'channel', 'route']
         for table in self.properties['tables']:
             for key in table_required_keys:
@@ -170,7 +328,235 @@ class Validator():
                     # A route as to be specified as well
                     if ( arch != 'parent-child' and arch != 'child-parent') and key in ['route'] : # table exceptions
                         return False, f"{table['name']}: '{key}' key is required for table configuration{arch}"
+
+            error = self.route_by_error(table)
+            if error:
+                return False, f"{table['name']}: {error}"
+
+            for key, message in self.capacity_errors(table, capacity.TABLE_RATE_KEYS):
+                return False, f"{table['name']}: {message}"
+            for key, message in self.load_errors(table):
+                return False, f"{table['name']}: {message}"
             
             #TODO Code smell ? Check required keys for initial load tables
         
-        return self.success()
\ No newline at end of file
+        return self.success()
+
+    def validate_all(self) -> ValidationReport:
+        """
+        Validates all replication properties in a single pass, collecting
+        every error with the JSON path of the offending value instead of
+        stopping at the first one. Applies the same rules as `validate`.
+
+        Returns
+        -------
+        ValidationReport
+            Every validation error found
+        """
+        report = ValidationReport()
+
+        for key in ['groups', 'nodes', 'replication-arch', 'channels', 'tables']:
+            if not key in self.properties:
+                report.add(f"$.{key}", f"'{key}' must be configured.")
+
+        group_ids = self.collect_group_errors(report) if 'groups' in self.properties else set()
+        if 'links' in self.properties:
+            self.collect_link_errors(report)
+        for key, message in self.profile_errors(self.properties):
+            report.add(f"$.{key}", message)
+        if 'nodes' in self.properties:
+            self.collect_node_errors(report, group_ids)
+        if 'channels' in self.properties:
+            self.collect_channel_errors(report)
+        if 'tables' in self.properties:
+            self.collect_table_errors(report)
+
+        return report
+
+    def collect_group_errors(self, report: ValidationReport) -> set:
+        groups = self.properties['groups']
+        if len(groups) < 2:
+            report.add('$.groups', 'Minimum of 2 groups is required')
+
+        first_seen = {}
+        for idx, group in enumerate(groups):
+            path = f"$.groups[{idx}]"
+            for key in ['id', 'sync']:
+                if not key in group:
+                    report.add(f"{path}.{key}", f"'{key}' key is required for group configuration")
+
+            if 'id' in group:
+                if not group['id']:
+                    report.add(f"{path}.id", 'Required group field (id) must not be empty')
+                elif group['id'] in first_seen:
+                    report.add(f"{path}.id", f"Group ID '{group['id']}' must be unique, first defined at {first_seen[group['id']]}")
+                else:
+                    first_seen[group['id']] = path
+
+            if 'sync' in group and group['sync'] not in ['P', 'W', 'R']:
+                report.add(f"{path}.sync", 'Synchronization mode of P, W or R is required for group configuration')
+
+        return set(first_seen)
+
+    def collect_link_errors(self, report: ValidationReport) -> None:
+        if not isinstance(self.properties['links'], list):
+            report.add('$.links', "'links' must be a list")
+            return
+
+        sync = {group['id']: group['sync'] for group in self.properties.get('groups', []) if 'id' in group and 'sync' in group}
+        declared = {}
+        for idx, entry in enumerate(self.properties['links']):
+            path = f"$.links[{idx}]"
+            try:
+                links = topology.expand_link(entry, sync)
+            except ValueError as e:
+                report.add(path, str(e))
+                continue
+
+            for link in links:
+                key = (link.source, link.target)
+                if key in declared and declared[key][0] != link.data_event_action:
+                    report.add(path, f"link {link.source} -> {link.target} is already declared with action '{declared[key][0]}' at {declared[key][1]}")
+                elif key not in declared:
+                    declared[key] = (link.data_event_action, path)
+
+    def validate_changed_nodes(self, engine_names: set) -> ValidationReport:
+        """
+        Validates properties that were valid before the nodes named in
+        `engine_names` changed or were added. Those nodes are checked in
+        full, the rules spanning all nodes, such as unique engine names,
+        across every node.
+
+        Returns
+        -------
+        ValidationReport
+            Every validation error found
+        """
+        report = ValidationReport()
+        group_ids = {group['id'] for group in self.properties['groups']}
+        self.collect_node_errors(report, group_ids, engine_names)
+        return report
+
+    def collect_node_errors(self, report: ValidationReport, group_ids: set, only: set = None) -> None:
+        nodes = self.properties['nodes']
+
+        node_required_keys = ['engine_name', 'group_id', 'external_id', 'type', 'db_driver', 'db_url', 'db_user', 'db_password']
+        unique_keys = {'engine_name': 'Node engine name', 'external_id': 'Node external ID'}
+        first_seen = {key: {} for key in unique_keys}
+        node_groups = set()
+        # Parent and router nodes, nodes with an upstream and a child node
+        # of each group, enough to check the router tiers
+        tree_nodes = []
+        child_groups = set()
+
+        idx = -1
+        for idx, node in enumerate(nodes):
+            path = f"$.nodes[{idx}]"
+            self.collect_tree_node(node, tree_nodes, child_groups)
+            if only is not None and node.get('engine_name') not in only:
+                node_groups.add(node.get('group_id'))
+                self.collect_unique_node_keys(report, path, node, unique_keys, first_seen)
+                continue
+
+            for key in node_required_keys:
+                if not key in node:
+                    report.add(f"{path}.{key}", f"'{key}' field is required for node configuration")
+                elif not node[key]:
+                    report.add(f"{path}.{key}", f"Required node field ({key}) must not be empty")
+
+            if 'type' in node:
+                if node['type'] not in ['parent', 'child', 'router']:
+                    report.add(f"{path}.type", "Type of 'parent', 'child' or 'router' is required for node configurations")
+                elif node['type'] in ['parent', 'router'] and not 'url' in node:
+                    report.add(f"{path}.url", f"A {node['type']} node must have a synchronization url")
+                if node['type'] == 'parent' and 'upstream' in node:
+                    report.add(f"{path}.upstream", "A parent node cannot have an upstream node")
+
+            if node.get('group_id'):
+                node_groups.add(node['group_id'])
+                if node['group_id'] not in group_ids:
+                    report.add(f"{path}.group_id", f"Node {node.get('external_id')}'s assigned group '{node['group_id']}' is not in {sorted(group_ids)}")
+
+            for key, message in self.profile_errors(node):
+                report.add(f"{path}.{key}", message)
+
+            self.collect_unique_node_keys(report, path, node, unique_keys, first_seen)
+
+        # Counted while iterating so streamed nodes are read once
+        if idx < 1:
+            report.add('$.nodes', 'Minimum of 2 nodes required.')
+        if len(node_groups) < 2:
+            report.add('$.nodes', "Minimum of 2 node groups required.")
+
+        # Tiers are only checked once every node is well formed
+        if report.valid and any(node['type'] == 'router' or node.get('upstream') for node in tree_nodes):
+            try:
+                topology.node_tree(tree_nodes)
+            except ValueError as e:
+                report.add('$.nodes', str(e))
+
+    def collect_tree_node(self, node: dict, tree_nodes: list, child_groups: set) -> None:
+        if node.get('type') == 'child' and not node.get('upstream'):
+            if node.get('group_id') in child_groups:
+                return
+            child_groups.add(node.get('group_id'))
+        tree_nodes.append(node)
+
+    def collect_unique_node_keys(self, report: ValidationReport, path: str, node: dict, unique_keys: dict, first_seen: dict) -> None:
+        for key, label in unique_keys.items():
+            value = node.get(key)
+            if not value:
+                continue
+            if value in first_seen[key]:
+                report.add(f"{path}.{key}", f"{label} '{value}' must be unique, first defined at {first_seen[key][value]}")
+            else:
+                first_seen[key][value] = path
+
+    def collect_table_errors(self, report: ValidationReport) -> None:
+        arch = self.properties.get('replication-arch')
+        error = self.chunk_rows_error()
+        if error:
+            report.add('$.load-chunk-rows', error)
+
+        for idx, table in enumerate(self.properties['tables']):
+            if arch not in ['parent-child', 'child-parent'] and not 'route' in table:
+                report.add(f"$.tables[{idx}].route", f"{table.get('name')}: 'route' key is required for table configuration{arch}")
+
+            error = self.route_by_error(table)
+            if error:
+                report.add(f"$.tables[{idx}].route-by", f"{table.get('name')}: {error}")
+
+            for key, message in self.capacity_errors(table, capacity.TABLE_RATE_KEYS):
+                report.add(f"$.tables[{idx}].{key}", f"{table.get('name')}: {message}")
+            for key, message in self.load_errors(table):
+                report.add(f"$.tables[{idx}].{key}", f"{table.get('name')}: {message}")
+
+    def collect_channel_errors(self, report: ValidationReport) -> None:
+        for idx, channel in enumerate(self.properties['channels']):
+            for key, message in self.capacity_errors(channel, capacity.CHANNEL_TUNING_KEYS):
+                report.add(f"$.channels[{idx}].{key}", f"{channel.get('id')}: {message}")
+
+    def route_by_error(self, table: dict):
+        """
+        Checks a table's `route-by` column routing
+
+        Returns
+        -------
+        str | None
+            The error, or None if the table is not routed by column or
+            its routing is valid
+        """
+        if 'route-by' not in table:
+            return None
+
+        try:
+            sql_generator.column_router_expression(table['route-by'])
+        except ValueError as e:
+            return str(e)
+
+        arch = self.properties.get('replication-arch')
+        routed_to_child = arch == 'parent-child' or (arch == 'bi-directional' and 'parent-child' in [
+            table.get('route'), table.get('initial-load-route') if table.get('initial-load') else None])
+        if not routed_to_child:
+            return "'route-by' requires the table to be routed parent-child"
+        return None
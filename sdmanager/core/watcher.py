@@ -0,0 +1,193 @@
+import os
+import time
+from typing import Callable, NamedTuple
+from sdmanager.core import properties_reader, sql_generator
+from sdmanager.core.manifest import BuildManifest
+from sdmanager.core.validator import Validator
+
+# Note: The watcher polls file modification times, which works the same on
+# every platform and for files replaced by editors. The builder's model is
+# kept in memory and diffed against each new version of the properties, so
+# a change to a few nodes re-renders only those nodes. Output files are
+# assumed not to change on disk while watching.
+
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.3
+# Properties every node's parameters depend on
+NODE_WIDE_KEYS = ['profile']
+
+
+class Rebuild(NamedTuple):
+    """Outcome of rebuilding after a change to the properties"""
+    nodes: list
+    removed_nodes: list
+    sql_sections: list
+    failures: list
+    seconds: float
+    error: str
+
+    def __str__(self) -> str:
+        if self.error:
+            return f"Rebuild failed after {self.seconds:.3f}s, keeping the previous build:\n{self.error}"
+        if not self.nodes and not self.removed_nodes and not self.sql_sections:
+            return f"No change to the build ({self.seconds:.3f}s)"
+        parts = [f"{len(self.nodes)} node(s)"]
+        if self.removed_nodes:
+            parts.append(f"{len(self.removed_nodes)} removed node(s)")
+        parts.append(f"SQL sections: {', '.join(self.sql_sections) or 'none'}")
+        lines = [f"Rebuilt {', '.join(parts)} in {self.seconds:.3f}s"]
+        for engine_name, error in self.failures:
+            lines.append(f"  {engine_name}: {error}")
+        return '\n'.join(lines)
+
+
+def materialize(properties: dict) -> dict:
+    """Reads streamed nodes and tables into lists"""
+    return {key: list(value) if isinstance(value, properties_reader.StreamedEntries) else value
+            for key, value in properties.items()}
+
+
+def snapshot(path: str) -> dict[str, tuple[int, int]]:
+    """
+    Gets the modification time and size of a properties file, or of every
+    file in a directory of fragments
+    """
+    paths = [path]
+    if os.path.isdir(path):
+        paths = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+
+    stats = {}
+    for file_path in paths:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        stats[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+class PropertiesWatcher():
+    """Rebuilds the files of a builder each time its properties change
+
+    The builder must have been built once. On each change the properties
+    are parsed again and compared with the builder's model:
+
+    - Only changed and added nodes are validated and rendered, unless a
+      key all nodes depend on, such as `profile`, changed.
+    - Any other changed key revalidates the whole properties, and the SQL
+      file is rebuilt incrementally, regenerating only the sections whose
+      inputs changed.
+
+    Invalid properties are reported and the previous build is kept.
+
+        watcher = PropertiesWatcher(builder, 'properties.json')
+        watcher.watch(lambda rebuild: print(rebuild))
+    """
+
+    def __init__(self, builder, path: str, table_schema: str = None, dialect: str = None,
+                 poll_interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE) -> None:
+        self.builder = builder
+        self.path = path
+        self.table_schema = table_schema
+        self.dialect = dialect
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.builder.properties = materialize(builder.properties)
+        self.stats = snapshot(path)
+
+    def wait_for_change(self, timeout: float = None) -> bool:
+        """
+        Polls until the properties change and then stay unchanged for the
+        debounce period, so a burst of edits is rebuilt once
+
+        Returns
+        -------
+        bool
+            True on a change, False if none happened within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while snapshot(self.path) == self.stats:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+        stats = snapshot(self.path)
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < self.debounce:
+            time.sleep(min(self.poll_interval, self.debounce))
+            current = snapshot(self.path)
+            if current != stats:
+                stats = current
+                quiet_since = time.monotonic()
+
+        self.stats = stats
+        return True
+
+    def watch(self, report: Callable[[Rebuild], None] = print, rebuilds: int = None) -> None:
+        """Rebuilds on every change, forever or for the given number of rebuilds"""
+        while rebuilds is None or rebuilds > 0:
+            if self.wait_for_change():
+                report(self.rebuild())
+                if rebuilds is not None:
+                    rebuilds -= 1
+
+    def rebuild(self) -> Rebuild:
+        """Parses the properties and rebuilds the files affected by changes"""
+        start = time.perf_counter()
+        builder = self.builder
+        previous = builder.properties
+        previous_sql_options = builder.sql_options()
+        previous_tree = builder.node_tree
+
+        try:
+            builder.parse_properties(self.path)
+            builder.properties = materialize(builder.properties)
+            if self.table_schema is not None or 'table-schema' in builder.properties:
+                builder.resolve_table_schema(self.table_schema)
+        except (SystemExit, Exception) as e:
+            builder.properties = previous
+            return Rebuild([], [], [], [], time.perf_counter() - start, str(e))
+
+        properties = builder.properties
+        changed_keys = {key for key in set(previous) | set(properties) if key != 'nodes' and previous.get(key) != properties.get(key)}
+        previous_nodes = {node.get('engine_name'): node for node in previous['nodes']}
+        nodes = properties.get('nodes', [])
+        engine_names = {node.get('engine_name') for node in nodes}
+        changed_nodes = [node for node in nodes if previous_nodes.get(node.get('engine_name')) != node]
+        removed_nodes = sorted(name for name in previous_nodes if name not in engine_names)
+
+        if changed_keys or not isinstance(properties.get('nodes'), list):
+            report = Validator(properties).validate_all()
+        else:
+            report = Validator(properties).validate_changed_nodes({node.get('engine_name') for node in changed_nodes})
+        if not report.valid:
+            builder.properties = previous
+            return Rebuild([], [], [], [], time.perf_counter() - start, str(report))
+
+        builder.resolve_node_groups()
+        builder.dialect = self.dialect or sql_generator.dialect_for_driver(builder.parent_node().get('db_driver', ''))
+        # Registration URLs follow the upstream nodes, unchanged nodes are
+        # skipped by the manifest
+        if changed_keys & set(NODE_WIDE_KEYS) or builder.node_tree != previous_tree:
+            changed_nodes = nodes
+
+        if builder.output_dir is not None and builder.manifest is not None:
+            builder.manifest = BuildManifest(builder.output_dir, builder.node_suffix)
+            rendered = {node['engine_name'] for node in changed_nodes}
+            for name in engine_names - rendered:
+                if name in builder.manifest.previous.get('nodes', {}):
+                    builder.manifest.keep_node(name)
+
+        failures = []
+        if changed_nodes or removed_nodes:
+            failures = builder.generate_node_property_files(changed_nodes)
+
+        sql_sections = []
+        if changed_keys or builder.sql_options() != previous_sql_options:
+            builder.reused_sql_sections = []
+            builder.generate_sql_file()
+            template = builder.templates.get('sql')
+            sql_sections = [name for name in template.placeholders if name not in builder.reused_sql_sections]
+
+        return Rebuild([node['engine_name'] for node in changed_nodes if node['engine_name'] not in builder.skipped_nodes],
+                       removed_nodes, sql_sections, failures, time.perf_counter() - start, None)
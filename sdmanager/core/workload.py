@@ -0,0 +1,250 @@
+import csv
+import datetime
+import io
+import os
+import random
+import string
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterator, NamedTuple
+from sdmanager.core import sql_generator
+
+# Note: Rows are generated in chunks by workers and written in order by a
+# single writer, a window of chunks at a time, so memory does not grow with
+# the number of rows. Each chunk is seeded from the seed, table and first
+# row, so output is identical whatever the number of workers.
+
+WORKLOAD_FORMATS = ['sql', 'csv']
+CHUNK_ROWS = 10000
+STORE_COLUMN = 'store_id'
+NULL_RATE = 0.05
+EPOCH = datetime.datetime(2020, 1, 1)
+YEAR_SECONDS = 365 * 24 * 3600
+
+INTEGER_TYPES = ['INTEGER', 'INT', 'BIGINT', 'SMALLINT', 'TINYINT']
+DECIMAL_TYPES = ['DECIMAL', 'NUMERIC', 'FLOAT', 'DOUBLE', 'REAL']
+DATE_TYPES = ['DATE', 'TIME', 'TIMESTAMP', 'DATETIME']
+BOOLEAN_TYPES = ['BOOLEAN', 'BIT']
+
+
+class LoadChunk(NamedTuple):
+    """Rows [start, stop) of a table, all belonging to one store"""
+    table: dict
+    start: int
+    stop: int
+    store: str
+    path: str
+    options: dict
+
+
+def table_definitions(builder) -> Iterator[dict]:
+    """
+    Yields the configured tables with their columns, from the table schema
+    metadata or a table's own `columns` (and `primary-key`), in catalog
+    snapshot format. Tables without columns are yielded without any.
+    """
+    for table in builder.properties['tables']:
+        metadata = builder.table_metadata.get(table['name'])
+        if metadata is None:
+            metadata = {
+                'name': table['name'],
+                'columns': table.get('columns', []),
+                'primary_key': table.get('primary-key', []),
+                'foreign_keys': [],
+            }
+        yield {**metadata, 'route-by': table.get('route-by')}
+
+
+def store_column(table: dict, default: str = STORE_COLUMN):
+    """
+    Gets the column holding the store's external ID: the column a table
+    is routed by, else a column named `default`, else None
+    """
+    names = {column['name'].lower(): column['name'] for column in table['columns']}
+    if table.get('route-by'):
+        expression = sql_generator.column_router_expression(table['route-by'])
+        if expression.endswith('=:EXTERNAL_ID') and ' or ' not in expression:
+            column = expression.split('=')[0].lower()
+            if column in names:
+                return names[column]
+    return names.get(default.lower())
+
+
+def value_generator(table: dict, column: dict, row_counts: dict, partition_column: str) -> Callable:
+    """
+    Gets a function generating a column's value from a random generator,
+    row number and store
+    """
+    name = column['name']
+    column_type = column.get('type', 'VARCHAR').upper()
+    size = str(column.get('size') or '')
+    primary = name in table['primary_key']
+
+    if name == partition_column:
+        return lambda rng, row, store: store
+
+    for foreign_key in table.get('foreign_keys', []):
+        if name in foreign_key['columns'] and foreign_key['foreign_table'] in row_counts:
+            parent_rows = max(row_counts[foreign_key['foreign_table']], 1)
+            if primary:
+                # Cycles through the parent rows so keys stay unique
+                if column_type in INTEGER_TYPES:
+                    return lambda rng, row, store: row % parent_rows + 1
+                return lambda rng, row, store: str(row % parent_rows + 1)
+            if column_type in INTEGER_TYPES:
+                return lambda rng, row, store: rng.randint(1, parent_rows)
+            return lambda rng, row, store: str(rng.randint(1, parent_rows))
+
+    if column_type in INTEGER_TYPES:
+        if primary:
+            return lambda rng, row, store: row + 1
+        return lambda rng, row, store: rng.randint(1, 100)
+
+    if column_type in DECIMAL_TYPES:
+        precision, _, scale = size.partition(',')
+        scale = int(scale or 2)
+        limit = min(10 ** (int(precision or 10) - scale) - 1, 10000)
+        if primary:
+            return lambda rng, row, store: row + 1
+        return lambda rng, row, store: round(rng.uniform(0, limit), scale)
+
+    if column_type in DATE_TYPES:
+        date_format = {'DATE': '%Y-%m-%d', 'TIME': '%H:%M:%S'}.get(column_type, '%Y-%m-%d %H:%M:%S')
+        return lambda rng, row, store: (EPOCH + datetime.timedelta(seconds=rng.randrange(YEAR_SECONDS))).strftime(date_format)
+
+    if column_type in BOOLEAN_TYPES:
+        return lambda rng, row, store: rng.randint(0, 1)
+
+    length = int(size.split(',')[0]) if size.split(',')[0].isdigit() else 50
+    if primary:
+        return lambda rng, row, store: str(row + 1)[-length:]
+    letters = string.ascii_lowercase
+    return lambda rng, row, store: ''.join(rng.choices(letters, k=rng.randint(1, min(length, 20))))
+
+
+def render_chunk(chunk: LoadChunk) -> tuple[str, list[str], str, int]:
+    """
+    Generates and formats a chunk's rows. Module level so it can run in a
+    process pool worker.
+
+    Returns
+    -------
+    tuple[str, list[str], str, int]
+        Output path, column names, formatted rows and row count
+    """
+    table = chunk.table
+    options = chunk.options
+    partition_column = store_column(table, options['store_column'])
+    generators = [value_generator(table, column, options['row_counts'], partition_column) for column in table['columns']]
+    nullable = [column.get('nullable', True) and column['name'] not in table['primary_key'] and column['name'] != partition_column
+                for column in table['columns']]
+    names = [column['name'] for column in table['columns']]
+    rng = random.Random(f"{options['seed']}:{table['name']}:{chunk.start}")
+
+    rows = []
+    for row in range(chunk.start, chunk.stop):
+        rows.append([None if null and rng.random() < NULL_RATE else generate(rng, row, chunk.store)
+                     for generate, null in zip(generators, nullable)])
+
+    if options['format'] == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        return chunk.path, names, buffer.getvalue(), len(rows)
+
+    columns = ', '.join(names)
+    statements = (sql_generator.InsertStatement(table['name'], columns, tuple(values)) for values in rows)
+    text = ''.join(f"{statement}\n" for statement in sql_generator.batch_inserts(statements, options['batch_size'], options['dialect']))
+    return chunk.path, names, text, len(rows)
+
+
+class WorkloadGenerator():
+    """Writes seeded synthetic rows for the configured tables
+
+    Rows of a table are spread evenly over the stores, the child nodes'
+    external IDs, and each row's store column (the `route-by` column or
+    `store_id`) holds its store's ID. With `per_store` rows are written to
+    `<output>/<external_id>/<table>.<format>`, tables without a store column
+    to `<output>/<table>.<format>`.
+    """
+
+    def __init__(self, builder, output_dir: str, rows: int = 1000, table_rows: dict = None, seed: int = 0,
+                 output_format: str = 'sql', per_store: bool = False, jobs: int = 1, batch_size: int = 500,
+                 dialect: str = None, tables: list[str] = None, chunk_rows: int = CHUNK_ROWS) -> None:
+        if output_format not in WORKLOAD_FORMATS:
+            raise ValueError(f"Format must be one of {WORKLOAD_FORMATS}")
+
+        self.output_dir = output_dir
+        self.per_store = per_store
+        self.jobs = max(1, jobs or 1)
+        self.chunk_rows = max(1, chunk_rows)
+        self.skipped_tables = []
+        self.tables = []
+        for table in table_definitions(builder):
+            if tables and table['name'] not in tables:
+                continue
+            if not table['columns']:
+                self.skipped_tables.append(table['name'])
+                continue
+            self.tables.append(table)
+
+        self.row_counts = {table['name']: (table_rows or {}).get(table['name'], rows) for table in self.tables}
+        self.stores = [node['external_id'] for node in builder.properties['nodes'] if node['type'] == 'child']
+        self.options = {
+            'seed': seed,
+            'format': output_format,
+            'batch_size': max(1, batch_size),
+            'dialect': dialect or builder.dialect,
+            'store_column': STORE_COLUMN,
+            'row_counts': self.row_counts,
+        }
+
+    def iter_chunks(self) -> Iterator[LoadChunk]:
+        extension = self.options['format']
+        for table in self.tables:
+            rows = self.row_counts[table['name']]
+            partitioned = store_column(table) is not None
+            stores = self.stores or ['']
+            for idx, store in enumerate(stores):
+                start, stop = rows * idx // len(stores), rows * (idx + 1) // len(stores)
+                path = os.path.join(self.output_dir, f"{table['name']}.{extension}")
+                if self.per_store and partitioned:
+                    path = os.path.join(self.output_dir, store, f"{table['name']}.{extension}")
+                for chunk_start in range(start, stop, self.chunk_rows):
+                    yield LoadChunk(table, chunk_start, min(chunk_start + self.chunk_rows, stop), store, path, self.options)
+
+    def write(self) -> dict[str, int]:
+        """
+        Generates and writes every table's rows
+
+        Returns
+        -------
+        dict[str, int]
+            Rows written per table
+        """
+        written = {table['name']: 0 for table in self.tables}
+        chunks = self.iter_chunks()
+        output = None
+        executor = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            while True:
+                window = list(islice(chunks, self.jobs * 4))
+                if not window:
+                    break
+
+                results = executor.map(render_chunk, window) if executor is not None else map(render_chunk, window)
+                for chunk, (path, names, text, count) in zip(window, results):
+                    if output is None or output.name != path:
+                        if output is not None:
+                            output.close()
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        output = open(path, 'w', newline='')
+                        if self.options['format'] == 'csv':
+                            csv.writer(output, lineterminator='\n').writerow(names)
+                    output.write(text)
+                    written[chunk.table['name']] += count
+        finally:
+            if output is not None:
+                output.close()
+            if executor is not None:
+                executor.shutdown()
+        return written
@@ -1,11 +1,14 @@
 import configparser
+import functools
 import subprocess
-from sdmanager.core import ReplicationBuilder
 import click
 
-config_parser = configparser.ConfigParser()
-config_parser.sections()
-config_parser.read('conf.ini')
+@functools.lru_cache(maxsize=None)
+def get_config_parser() -> configparser.ConfigParser:
+    """Reads the INI config on first use"""
+    config_parser = configparser.ConfigParser()
+    config_parser.read('conf.ini')
+    return config_parser
 
 @click.group()
 def cli():
@@ -16,6 +19,9 @@ def cli():
 @click.option('-p', '--properties', required=True, help='Manager replication properties file.')
 @click.option('-o', '--output', help='Symmetric DS files Output directory to save SymmetricDS files.')
 def build(config, output=None):
+    from sdmanager.core import ReplicationBuilder
+
+    config_parser = get_config_parser()
     sd_home = None
     if 'SYMMETRICDS' in config_parser.sections():
         sd_home = config_parser['SYMMETRICDS']['HomeDirectory']
@@ -53,7 +59,7 @@ def set_config(key: str, value: str) -> None:
         click.echo("Comibation of INI section and key separated by '.' required.")
         return
 
-    config_parser[sections[0]][sections[1]] = value
+    get_config_parser()[sections[0]][sections[1]] = value
 
 
 @cli.command()
@@ -71,6 +77,7 @@ def get_config(key: str) -> None:
         $ > manager get-config foo.bar
         OUTPUT: Hello World
     """
+    config_parser = get_config_parser()
     sections = key.split('.')
     if (len(sections) != 2):
         click.echo("Comibation of INI section and key separated by '.' required.")
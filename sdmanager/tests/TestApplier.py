@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.applier import ConfigurationApplier, split_statements
+from sdmanager.core.database import ConnectionPool, DatabaseError, parse_jdbc_url
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+SCHEMA = os.path.join(os.path.dirname(__file__), 'sym_schema.sql')
+
+def create_sym_database(path):
+    """Creates a sqlite database with the SymmetricDS configuration tables"""
+    with open(SCHEMA) as schema_file:
+        connection = sqlite3.connect(path)
+        connection.executescript(schema_file.read())
+        connection.close()
+    return f"jdbc:sqlite:{path}"
+
+class TestApplier(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'corp.db')
+        self.url = create_sym_database(self.path)
+        self.pool = ConnectionPool()
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def query(self, sql):
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute(sql).fetchall()
+        finally:
+            connection.close()
+
+    def test_parse_jdbc_url(self):
+        self.assertEqual(parse_jdbc_url('jdbc:sqlite:/tmp/corp.db'), ('sqlite', {'database': '/tmp/corp.db'}))
+        self.assertEqual(parse_jdbc_url('jdbc:mysql://db:3307/corp?tinyInt1isBit=false'),
+            ('mysql', {'host': 'db', 'database': 'corp', 'port': 3307, 'options': {'tinyInt1isBit': 'false'}}))
+        with self.assertRaises(DatabaseError):
+            parse_jdbc_url('jdbc:informix-sqli://db/corp')
+
+    def test_split_statements(self):
+        self.assertEqual(split_statements("-- clear\ndelete from a;\ndelete from b where x in ("),
+            (['delete from a'], "\ndelete from b where x in ("))
+
+    def test_apply_loads_configuration(self):
+        applier = ConfigurationApplier(ReplicationBuilder(make_properties()), self.url, pool=self.pool)
+        timings = applier.apply()
+
+        self.assertEqual([timing.section for timing in timings], [
+            'template', 'channel', 'group', 'group_links', 'table_triggers', 'initial_load_table_triggers',
+            'router', 'router_triggers', 'initial_load_router_triggers'
+        ])
+        self.assertEqual(timings[1].statements, 1)
+        self.assertEqual(timings[1].rows, 2)
+        self.assertEqual(self.query('select channel_id from sym_channel order by channel_id'), [('item',), ('sale_transaction',)])
+        self.assertEqual(len(self.query('select * from sym_trigger_router')), 3)
+
+    def test_apply_replaces_previous_configuration(self):
+        properties = make_properties()
+        ConfigurationApplier(ReplicationBuilder(properties), self.url, pool=self.pool).apply()
+        properties['tables'].pop(0)
+        ConfigurationApplier(ReplicationBuilder(properties), self.url, pool=self.pool, executemany=False).apply()
+
+        self.assertEqual(self.query('select trigger_id from sym_trigger order by trigger_id'),
+            [('sale_transaction',), ('sale_transaction_parent',)])
+
+    def test_failed_apply_rolls_back(self):
+        properties = make_properties()
+        ConfigurationApplier(ReplicationBuilder(properties), self.url, pool=self.pool).apply()
+        properties['tables'].append(dict(properties['tables'][0]))
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            ConfigurationApplier(ReplicationBuilder(properties), self.url, pool=self.pool).apply()
+
+        self.assertEqual(len(self.query('select * from sym_trigger')), 3)
+
+    def test_pool_reuses_connections(self):
+        with self.pool.connection(self.url) as (first, _):
+            pass
+        with self.pool.connection(self.url) as (second, _):
+            pass
+        self.assertIs(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
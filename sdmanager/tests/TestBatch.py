@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder, batch
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp.name, 'output')
+        self.paths = [self.write(f"customer-{idx}.json", make_properties(stores=idx + 1)) for idx in range(3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, properties):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as properties_file:
+            json.dump(properties, properties_file)
+        return path
+
+    def read(self, *names):
+        with open(os.path.join(*names)) as output_file:
+            return output_file.read()
+
+    def test_builds_match_single_builds(self):
+        results = list(batch.build_deployments(self.paths, self.output_dir, jobs=2))
+
+        self.assertEqual([result.name for result in results], ['customer-0', 'customer-1', 'customer-2'])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([result.nodes for result in results], [2, 3, 4])
+
+        single_dir = os.path.join(self.tmp.name, 'single')
+        os.mkdir(single_dir)
+        ReplicationBuilder(self.paths[2], single_dir).generate_files()
+        deployment_dir = os.path.join(self.output_dir, 'customer-2')
+        self.assertEqual(sorted(os.listdir(deployment_dir)), sorted(os.listdir(single_dir)))
+        for name in ['symmetricds.sql', 'store-003.properties']:
+            self.assertEqual(self.read(deployment_dir, name), self.read(single_dir, name))
+
+    def test_failed_deployment_reported(self):
+        properties = make_properties()
+        properties['nodes'][1]['group_id'] = 'warehouse'
+        invalid = self.write('invalid.json', properties)
+
+        results = list(batch.build_deployments([invalid, self.paths[0]], self.output_dir))
+        summary = batch.format_summary(results)
+
+        self.assertFalse(results[0].ok)
+        self.assertIn("group 'warehouse'", results[0].error)
+        self.assertTrue(results[1].ok)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'invalid')))
+        self.assertIn('Built 1 of 2 deployment(s), 2 node(s)', summary)
+        self.assertIn('invalid (', summary)
+
+    def test_expand_and_name_deployments(self):
+        pattern = os.path.join(self.tmp.name, 'customer-*.json')
+        self.assertEqual(batch.expand_properties([pattern, self.paths[0]]), self.paths)
+        with self.assertRaises(ValueError):
+            batch.expand_properties([os.path.join(self.tmp.name, 'missing-*.json')])
+
+        fragments = os.path.join(self.tmp.name, 'retail')
+        os.mkdir(fragments)
+        self.assertEqual(batch.deployment_name(fragments), 'retail')
+        self.assertEqual(batch.deployment_name(os.path.join(fragments, 'properties.json')), 'retail')
+        with self.assertRaises(ValueError):
+            batch.deployment_dirs([self.paths[0], os.path.join(self.tmp.name, 'other', 'customer-0.json')], self.output_dir)
+
+    def test_cli_glob(self):
+        pattern = os.path.join(self.tmp.name, 'customer-*.json')
+        result = CliRunner().invoke(cli, ['build-files', '-p', pattern, '-o', self.output_dir, '-j', '2'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Built 3 of 3 deployment(s), 9 node(s)', result.output)
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['customer-0', 'customer-1', 'customer-2'])
+
+        result = CliRunner().invoke(cli, ['build-files', '-p', pattern])
+        self.assertEqual(result.exit_code, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder, bundle
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp.name
+        self.properties = make_properties(stores=3)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **kwargs):
+        builder = ReplicationBuilder(self.properties, self.output_dir, **kwargs)
+        self.assertEqual(builder.generate_files(), [])
+        return builder
+
+    def test_tar_bundle_per_node(self):
+        self.build(bundle_format='tar.gz')
+
+        self.assertEqual(sorted(name for name in os.listdir(self.output_dir) if 'store-001' in name), ['store-001.tar.gz'])
+        with tarfile.open(os.path.join(self.output_dir, 'store-001.tar.gz')) as archive:
+            self.assertEqual(archive.getnames(), ['engines', 'logs', 'tmp', 'engines/store-001.properties', 'SHA256SUMS'])
+            properties = archive.extractfile('engines/store-001.properties').read()
+            checksums = archive.extractfile('SHA256SUMS').read().decode()
+        self.assertIn(b'external.id=001', properties)
+        self.assertTrue(checksums.endswith('  engines/store-001.properties\n'))
+
+    def test_unchanged_bundles_skipped(self):
+        self.build(bundle_format='zip')
+        self.properties['nodes'][2]['db_url'] = 'jdbc:mysql://localhost/store2'
+
+        builder = self.build(bundle_format='zip')
+
+        self.assertEqual(builder.skipped_nodes, ['corp-000', 'store-001', 'store-003'])
+        with zipfile.ZipFile(os.path.join(self.output_dir, 'store-002.zip')) as archive:
+            self.assertEqual(archive.namelist(), ['engines/', 'logs/', 'tmp/', 'engines/store-002.properties', 'SHA256SUMS'])
+            self.assertIn(b'store2', archive.read('engines/store-002.properties'))
+
+    def test_combined_archive_indexes_nodes(self):
+        for bundle_format in bundle.BUNDLE_FORMATS:
+            self.build(bundle_format=bundle_format, combined_bundle=True)
+            path = os.path.join(self.output_dir, bundle.combined_archive_name(bundle_format))
+
+            index = bundle.read_index(path)
+            self.assertEqual(sorted(index['nodes']), ['corp-000', 'store-001', 'store-002', 'store-003'])
+            # The index inside the archive is used without the one next to it
+            os.remove(bundle.index_path(path))
+            self.assertEqual(bundle.read_index(path), index)
+
+            content, read_format = bundle.read_node_bundle(path, 'store-002')
+            self.assertEqual(read_format, bundle_format)
+            files = bundle.extract_bundle(content, read_format, os.path.join(self.output_dir, bundle_format))
+            self.assertEqual(files, ['SHA256SUMS', 'engines/store-002.properties'])
+            self.assertTrue(os.path.isdir(os.path.join(self.output_dir, bundle_format, 'logs')))
+
+        self.assertFalse(any(name.endswith('.properties') for name in os.listdir(self.output_dir)))
+
+    def test_corrupt_bundle_rejected(self):
+        self.build(combined_bundle=True)
+        path = os.path.join(self.output_dir, 'nodes.tar')
+        entry = bundle.read_index(path)['nodes']['store-001']
+        with open(path, 'r+b') as archive_file:
+            archive_file.seek(entry['offset'] + 20)
+            archive_file.write(b'\0')
+
+        with self.assertRaisesRegex(ValueError, 'does not match its checksum'):
+            bundle.read_node_bundle(path, 'store-001')
+        with self.assertRaises(KeyError):
+            bundle.read_node_bundle(path, 'store-009')
+
+    def test_checksum_manifest_verified(self):
+        content = bundle.node_bundle('store-001', 'engine.name=store-001\n', 'tar.gz')
+        with tarfile.open(fileobj=io.BytesIO(content)) as archive:
+            members = [(info, archive.extractfile(info).read() if info.isfile() else None) for info in archive]
+
+        tampered = io.BytesIO()
+        with tarfile.open(fileobj=tampered, mode='w:gz') as archive:
+            for info, data in members:
+                if info.name.endswith('.properties'):
+                    data = b'engine.name=store-002\n'
+                archive.addfile(info, io.BytesIO(data) if data is not None else None)
+
+        with self.assertRaisesRegex(ValueError, "'engines/store-001.properties' does not match"):
+            bundle.extract_bundle(tampered.getvalue(), 'tar.gz', self.output_dir)
+
+    def test_bundle_requires_output(self):
+        with self.assertRaises(ValueError):
+            ReplicationBuilder(self.properties, bundle_format='zip')
+
+    def test_cli_extract_node(self):
+        path = os.path.join(self.output_dir, 'properties.json')
+        with open(path, 'w') as properties_file:
+            json.dump(self.properties, properties_file)
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ['build-files', '-p', path, '-o', self.output_dir, '--bundle', 'zip', '--combined'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        result = runner.invoke(cli, ['extract-node', '-a', os.path.join(self.output_dir, 'nodes.zip'), '-n', 'store-003',
+                                     '-o', os.path.join(self.output_dir, 'server')])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'server', 'engines', 'store-003.properties')))
+
+        result = runner.invoke(cli, ['build-files', '-p', path, '--bundle', 'zip'])
+        self.assertEqual(result.exit_code, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from sdmanager.core import ReplicationBuilder, Validator
+from sdmanager.core.capacity import format_plans, plan_channels
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+CHANNELS = [{"id": "sale_transaction"}, {"id": "item"}, {"id": "audit"}]
+TABLES = [
+    {"name": "sale_transaction", "channel": "sale_transaction", "rows-per-second": 400, "avg-row-bytes": 300},
+    {"name": "sale_return_line_item", "channel": "sale_transaction", "rows-per-second": 100, "avg-row-bytes": 800},
+    {"name": "item", "channel": "item", "rows-per-second": 0.5, "avg-row-bytes": 200},
+    {"name": "audit_log", "channel": "audit"},
+]
+
+class TestCapacity(unittest.TestCase):
+
+    def test_plan_sizes_channels_from_rates(self):
+        plans = {plan.channel_id: plan for plan in plan_channels(CHANNELS, TABLES)}
+
+        sale = plans['sale_transaction']
+        self.assertEqual((sale.rows_per_second, sale.bytes_per_second), (500, 200000))
+        # 1 MiB batches of 400 byte rows, 5000 rows per 10s push
+        self.assertEqual(sale.max_batch_size, 2622)
+        self.assertEqual(sale.max_batch_to_send, 10)
+        self.assertEqual(sale.max_data_to_route, 10000)
+        self.assertEqual(sale.queue, 'sale_transaction')
+
+        item = plans['item']
+        self.assertEqual((item.max_batch_size, item.queue), (100, 'default'))
+        self.assertEqual(item.processing_order, 1)
+        self.assertEqual(sale.processing_order, 2)
+
+        audit = plans['audit']
+        self.assertEqual((audit.processing_order, audit.max_batch_size, audit.queue), (3, None, None))
+        self.assertEqual(audit.rationale, ('no expected rate, SymmetricDS defaults',))
+
+    def test_channel_fields_override_plan(self):
+        channels = [{"id": "sale_transaction", "max-batch-size": 500, "processing-order": 9}, {"id": "item"}]
+
+        plan = plan_channels(channels, TABLES)[0]
+
+        self.assertEqual((plan.max_batch_size, plan.processing_order, plan.max_batch_to_send), (500, 9, 10))
+        self.assertEqual(plan.rationale[-1], 'processing-order, max-batch-size set in properties')
+        self.assertIn('sale_transaction: 500 rows/s of 400 bytes', format_plans([plan]))
+
+    def test_builder_emits_planned_channels(self):
+        properties = make_properties()
+        properties['tables'][1].update({"rows-per-second": 50, "avg-row-bytes": 1024})
+        properties['channels'][0]['queue'] = 'reference'
+
+        channels = ReplicationBuilder(properties).build_channel_query()[1]
+
+        self.assertIn("insert into sym_channel (channel_id, processing_order, max_batch_size, enabled, description, queue) "
+                      "values ('item', 2, 100000, 1, '', 'reference');", channels)
+        self.assertIn("insert into sym_channel (channel_id, processing_order, max_batch_size, enabled, description, max_batch_to_send, max_data_to_route, queue) "
+                      "values ('sale_transaction', 1, 500, 1, '', 10, 10000, 'default');", channels)
+
+    def test_default_channels_unchanged_without_rates(self):
+        channels = ReplicationBuilder(make_properties()).build_channel_query()[1]
+        self.assertIn("values ('item', 1, 100000, 1, '');", channels)
+
+    def test_invalid_tuning_fields(self):
+        properties = make_properties()
+        properties['channels'][0]['max-batch-size'] = 0
+        properties['tables'][0]['rows-per-second'] = 'fast'
+
+        report = Validator(properties).validate_all()
+
+        self.assertEqual([error.path for error in report.errors], ['$.channels[0].max-batch-size', '$.tables[0].rows-per-second'])
+        self.assertEqual(Validator(properties).validate(), (False, "item: 'max-batch-size' must be an integer of at least 1"))
+
+if __name__ == '__main__':
+    unittest.main()
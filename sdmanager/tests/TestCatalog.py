@@ -0,0 +1,93 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import catalog
+from sdmanager.core.catalog import CatalogCache, discover_catalog, tables_section
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+SCHEMA = """
+create table store (store_id integer primary key, name varchar(50) not null);
+create table item (item_id integer not null, store_id integer not null, description text,
+    primary key (store_id, item_id), foreign key (store_id) references store (store_id));
+create table sale_line (sale_id integer, line integer, store_id integer, item_id integer,
+    primary key (sale_id, line), foreign key (store_id, item_id) references item (store_id, item_id));
+create table sym_node (node_id varchar(50) primary key);
+"""
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'store.db')
+        self.url = f"jdbc:sqlite:{self.path}"
+        self.cache = CatalogCache(os.path.join(self.tmp.name, 'cache'))
+        connection = sqlite3.connect(self.path)
+        connection.executescript(SCHEMA)
+        connection.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sqlite_catalog(self):
+        snapshot, cached = discover_catalog(self.url)
+        tables = {table['name']: table for table in snapshot['tables']}
+
+        self.assertFalse(cached)
+        self.assertEqual(list(tables), ['item', 'sale_line', 'store'])
+        self.assertEqual(tables['item']['primary_key'], ['store_id', 'item_id'])
+        self.assertEqual(tables['item']['columns'][2], {'name': 'description', 'type': 'TEXT', 'nullable': True})
+        self.assertEqual(tables['sale_line']['foreign_keys'],
+                         [{'columns': ['store_id', 'item_id'], 'foreign_table': 'item', 'foreign_columns': ['store_id', 'item_id']}])
+
+    def test_cached_until_schema_changes(self):
+        first, cached = discover_catalog(self.url, cache=self.cache)
+        self.assertFalse(cached)
+
+        with mock.patch.object(catalog, 'read_catalog', side_effect=AssertionError('catalog re-read')):
+            second, cached = discover_catalog(self.url, cache=self.cache)
+        self.assertTrue(cached)
+        self.assertEqual(second['tables'], first['tables'])
+
+        connection = sqlite3.connect(self.path)
+        connection.execute('create table customer (customer_id integer primary key)')
+        connection.close()
+
+        third, cached = discover_catalog(self.url, cache=self.cache)
+        self.assertFalse(cached)
+        self.assertIn('customer', [table['name'] for table in third['tables']])
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+    def test_tables_section_keeps_configured_tables(self):
+        snapshot, _ = discover_catalog(self.url)
+        existing = [{'name': 'item', 'channel': 'item', 'route': 'child-parent'}]
+
+        tables = tables_section(snapshot, existing, 'sale', 'parent-child', exclude=['store'])
+
+        self.assertEqual(tables, [existing[0], {'name': 'sale_line', 'channel': 'sale', 'route': 'parent-child'}])
+
+    def test_discover_command_writes_tables(self):
+        properties_path = os.path.join(self.tmp.name, 'properties.json')
+        properties = make_properties()
+        properties['tables'] = []
+        with open(properties_path, 'w') as properties_file:
+            json.dump(properties, properties_file)
+
+        result = CliRunner().invoke(cli, ['discover', '-p', properties_path, '-d', self.url, '-i', 's*',
+                                          '--cache-dir', self.cache.directory])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Added 2 of 3 table(s)', result.output)
+        with open(properties_path) as properties_file:
+            tables = json.load(properties_file)['tables']
+        self.assertEqual(tables, [
+            {'name': 'sale_line', 'channel': 'item', 'route': 'parent-child'},
+            {'name': 'store', 'channel': 'item', 'route': 'parent-child'},
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
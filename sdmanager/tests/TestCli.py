@@ -0,0 +1,55 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager import cli
+
+# Prints the loaded sdmanager modules once the command exits
+RUN_CLI = ('import atexit, sys; atexit.register(lambda: print(",".join(m for m in sys.modules if m.startswith("sdmanager")), '
+           'file=sys.stderr)); from sdmanager.cli import cli; cli(prog_name="sd-manager")')
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, 'conf.ini'), 'w') as config_file:
+            config_file.write('[foo]\nbar = Hello World\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def loaded_modules(self, *arguments):
+        result = subprocess.run([sys.executable, '-c', RUN_CLI, *arguments], cwd=self.tmp.name,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return result.stdout, result.stderr.strip().splitlines()[-1].split(',')
+
+    def test_help_and_config_do_not_load_commands(self):
+        output, modules = self.loaded_modules('--help')
+        self.assertIn('build-files', output)
+        self.assertEqual(sorted(modules), ['sdmanager', 'sdmanager.cli'])
+
+        output, modules = self.loaded_modules('get-config', 'foo.bar')
+        self.assertEqual(output, 'SymmetricDS Manager\nHello World\n')
+        self.assertEqual(sorted(modules), ['sdmanager', 'sdmanager.cli'])
+
+    def test_lazy_command_loaded_when_run(self):
+        output, modules = self.loaded_modules('validate', '--help')
+        self.assertIn('--properties', output)
+        self.assertIn('sdmanager.commands', modules)
+
+    def test_lazy_command_short_help(self):
+        for name, (path, short_help) in cli.LAZY_COMMANDS.items():
+            module, _, attribute = path.partition(':')
+            command = getattr(importlib.import_module(module), attribute)
+            self.assertEqual(command.help.split('\n')[0], short_help, name)
+
+    def test_unknown_command(self):
+        result = CliRunner().invoke(cli.cli, ['foo'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("No such command", result.output)
+
+if __name__ == '__main__':
+    unittest.main()
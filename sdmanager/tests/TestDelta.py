@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder, delta
+from sdmanager.core.applier import ConfigurationApplier
+from sdmanager.core.database import ConnectionPool
+from sdmanager.tests.TestApplier import create_sym_database
+from sdmanager.tests.TestReplicationBuilder import make_properties
+from sdmanager.tests.TestTopology import make_tiered_properties
+
+class TestDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'corp.db')
+        self.url = create_sym_database(self.path)
+        self.pool = ConnectionPool()
+        self.properties = make_properties(stores=2)
+        self.apply(self.properties)
+        self.query("insert into sym_node (node_id, node_group_id, external_id) values ('001', 'store', '001')")
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def query(self, sql):
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute(sql).fetchall()
+            connection.commit()
+            return rows
+        finally:
+            connection.close()
+
+    def apply(self, properties, **kwargs):
+        applier = ConfigurationApplier(ReplicationBuilder(properties), self.url, pool=self.pool, **kwargs)
+        applier.apply()
+        return applier.changes
+
+    def current_rows(self, path=None):
+        connection = sqlite3.connect(path or self.path)
+        try:
+            return delta.read_database_rows(connection.cursor())
+        finally:
+            connection.close()
+
+    def assertMatchesFullApply(self, properties):
+        path = tempfile.mktemp(suffix='.db', dir=self.tmp.name)
+        ConfigurationApplier(ReplicationBuilder(properties), create_sym_database(path), pool=self.pool).apply()
+        self.assertEqual(self.current_rows(), self.current_rows(path))
+
+    def test_unchanged_configuration_has_no_changes(self):
+        self.assertEqual(self.apply(self.properties, delta=True), [])
+        self.assertEqual(delta.format_summary([]), 'No configuration change')
+
+    def test_removed_table_deletes_only_its_rows(self):
+        self.properties['tables'].pop(0)
+        changes = self.apply(self.properties, delta=True)
+
+        self.assertEqual([(change.action, change.table, change.key) for change in changes], [
+            ('delete', 'sym_trigger_router', ('item', 'parent_2_child')),
+            ('delete', 'sym_trigger', ('item',)),
+        ])
+        self.assertEqual(changes[1].statement, "delete from sym_trigger where trigger_id = 'item';")
+        self.assertEqual(self.query('select node_id from sym_node'), [('001',)])
+        self.assertMatchesFullApply(self.properties)
+
+    def test_changed_rows_updated(self):
+        self.properties['tables'][0]['channel'] = 'sale_transaction'
+        self.properties['tables'][0]['rows-per-second'] = 50
+        changes = self.apply(self.properties, delta=True)
+
+        self.assertEqual({(change.action, change.table) for change in changes}, {('update', 'sym_channel'), ('update', 'sym_trigger')})
+        update = next(change.statement for change in changes if change.table == 'sym_trigger')
+        self.assertEqual(update, "update sym_trigger set channel_id = 'sale_transaction', last_update_time = current_timestamp where trigger_id = 'item';")
+        self.assertMatchesFullApply(self.properties)
+
+    def test_tiers_added_and_removed(self):
+        tiered = make_tiered_properties(regions=2, stores=2)
+        self.apply(tiered, delta=True)
+        self.assertMatchesFullApply(tiered)
+        self.assertEqual(self.query("select sync_on_incoming_batch from sym_trigger where trigger_id = 'item'"), [(1,)])
+
+        self.apply(self.properties, delta=True)
+        self.assertMatchesFullApply(self.properties)
+        self.assertEqual(self.query('select count(*) from sym_node'), [(1,)])
+
+    def test_channels_never_deleted(self):
+        self.query("insert into sym_channel (channel_id) values ('reload')")
+        self.properties['channels'].append({'id': 'price'})
+        changes = self.apply(self.properties, delta=True)
+
+        self.assertEqual([(change.action, change.key) for change in changes], [('insert', ('price',))])
+        self.assertEqual(len(self.query("select * from sym_channel where channel_id = 'reload'")), 1)
+
+    def test_snapshot_matches_database(self):
+        snapshot = os.path.join(self.tmp.name, 'snapshot.json')
+        delta.write_snapshot(snapshot, delta.builder_rows(ReplicationBuilder(self.properties)))
+        self.properties['tables'].pop(0)
+        self.properties['groups'][1]['description'] = 'Stores'
+
+        desired = delta.builder_rows(ReplicationBuilder(self.properties))
+        self.assertEqual(delta.diff_rows(desired, delta.read_snapshot(snapshot)), delta.diff_rows(desired, self.current_rows()))
+
+    def test_duplicate_rows_rejected(self):
+        self.properties['tables'].append(dict(self.properties['tables'][0]))
+        with self.assertRaisesRegex(ValueError, 'generated twice'):
+            delta.builder_rows(ReplicationBuilder(self.properties))
+
+    def test_cli_diff_config(self):
+        properties_path = os.path.join(self.tmp.name, 'properties.json')
+        self.properties['nodes'][0]['db_url'] = self.url
+        self.properties['tables'].pop(0)
+        with open(properties_path, 'w') as properties_file:
+            json.dump(self.properties, properties_file)
+        output = os.path.join(self.tmp.name, 'delta.sql')
+        snapshot = os.path.join(self.tmp.name, 'snapshot.json')
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ['diff-config', '-p', properties_path, '-o', output, '--write-snapshot', snapshot])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('1 delete(s) on sym_trigger_router, 1 delete(s) on sym_trigger', result.output)
+        with open(output) as delta_file:
+            self.assertEqual(delta_file.read().count('\n'), 2)
+
+        result = runner.invoke(cli, ['diff-config', '-p', properties_path, '--snapshot', snapshot])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('-- No configuration change', result.output)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder, Validator, load_order
+from sdmanager.core.applier import ConfigurationApplier
+from sdmanager.core.catalog import CatalogCache
+from sdmanager.core.database import ConnectionPool
+from sdmanager.tests.TestApplier import create_sym_database
+from sdmanager.tests.TestReplicationBuilder import make_properties
+from sdmanager.tests.TestTopology import make_tiered_properties
+from sdmanager.tests.TestTorque import SAMPLE
+
+def router_trigger_rows(builder):
+    return {(statement.params[0], statement.params[1]): statement.params[2:-2]
+            for section in ['router_triggers', 'initial_load_router_triggers']
+            for statement in builder.sql_statement_sections()[section]()}
+
+class TestLoadOrder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CatalogCache(os.path.join(self.tmp.name, 'cache'))
+        self.properties = make_properties(stores=2)
+        self.properties['table-schema'] = {'path': SAMPLE, 'channel': 'sale_transaction'}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def builder(self, properties=None):
+        return ReplicationBuilder(properties or self.properties, catalog_cache=self.cache)
+
+    def test_tiers_follow_foreign_keys(self):
+        dependencies = {'a': ['b'], 'b': ['c'], 'd': ['e', 'a'], 'e': ['d']}
+        names = ['a', 'b', 'c', 'd', 'e', 'f']
+
+        self.assertEqual(load_order.load_tiers(names, dependencies), [['c', 'f'], ['b'], ['a'], ['d', 'e']])
+        self.assertEqual(load_order.initial_load_orders([['c'], ['b']]), {'c': 100, 'b': 110})
+
+    def test_sample_schema_orders(self):
+        rows = router_trigger_rows(self.builder())
+
+        self.assertEqual(rows[('item', 'parent_2_child')], (100,))
+        self.assertEqual(rows[('sale_transaction_parent', 'parent_2_child')], (100,))
+        # References item
+        self.assertEqual(rows[('item_selling_price', 'parent_2_child')], (110,))
+        # References item and sale_transaction
+        self.assertEqual(rows[('sale_return_line_item', 'parent_2_child')], (110,))
+
+    def test_orders_unchanged_without_schema(self):
+        rows = router_trigger_rows(ReplicationBuilder(make_properties()))
+        self.assertEqual(set(rows.values()), {(100,)})
+
+    def test_chunk_conditions(self):
+        self.assertEqual(load_order.chunk_conditions('tran_id', 1, 1000, 4), [
+            't.tran_id < 251', 't.tran_id >= 251 and t.tran_id < 501', 't.tran_id >= 501 and t.tran_id < 751', 't.tran_id >= 751'])
+        self.assertEqual(load_order.chunk_conditions('tran_id', 1, 1, 4), [])
+
+    def test_large_table_loaded_in_chunks(self):
+        self.properties['load-chunk-rows'] = 1000000
+        self.properties['tables'][1].update({'rows': 2500000, 'key-range': {'min': 1, 'max': 3000000}})
+        builder = self.builder()
+        rows = router_trigger_rows(builder)
+
+        self.assertEqual(rows[('sale_transaction_chunk_1', 'parent_2_child')], (100, 't.tran_id < 1000001'))
+        self.assertEqual(rows[('sale_transaction_chunk_3', 'parent_2_child')], (100, 't.tran_id >= 2000001'))
+        # Captured rows keep flowing, but are not loaded again
+        self.assertEqual(rows[('sale_transaction', 'child_2_parent')], (load_order.NOT_LOADED,))
+        self.assertNotIn(('sale_transaction_parent', 'parent_2_child'), rows)
+        triggers = [statement.params[0] for statement in builder.iter_initial_load_table_trigger_queries()]
+        self.assertEqual(triggers, ['sale_transaction_chunk_1', 'sale_transaction_chunk_2', 'sale_transaction_chunk_3'])
+
+        path = os.path.join(self.tmp.name, 'corp.db')
+        pool = ConnectionPool()
+        try:
+            applier = ConfigurationApplier(builder, create_sym_database(path), pool=pool)
+            applier.apply()
+            applier.delta = True
+            applier.apply()
+        finally:
+            pool.close()
+        self.assertEqual(applier.changes, [])
+        with sqlite3.connect(path) as connection:
+            selects = connection.execute("select initial_load_select from sym_trigger_router where trigger_id like 'sale_transaction_chunk_%'").fetchall()
+        self.assertEqual(len(selects), 3)
+
+    def test_chunk_key_column_required(self):
+        properties = make_properties()
+        properties['tables'][0].update({'rows': 5000000, 'key-range': {'min': 1, 'max': 10}})
+        with self.assertRaisesRegex(ValueError, "requires a 'column'"):
+            ReplicationBuilder(properties).load_plan()
+
+        properties['tables'][0]['key-range']['column'] = 'item_id'
+        self.assertEqual(len(ReplicationBuilder(properties).load_plan()['item'].chunks), 5)
+
+    def test_invalid_load_fields(self):
+        self.properties['tables'][0]['key-range'] = {'min': 10, 'max': 1}
+        self.properties['tables'][1]['rows'] = -1
+        self.properties['load-chunk-rows'] = 0
+
+        report = Validator(self.properties).validate_all()
+        self.assertEqual([error.path for error in report.errors], ['$.load-chunk-rows', '$.tables[0].key-range', '$.tables[1].rows'])
+        self.assertFalse(Validator(self.properties).validate()[0])
+
+    def test_orders_from_database_schema(self):
+        path = os.path.join(self.tmp.name, 'store.db')
+        with sqlite3.connect(path) as connection:
+            connection.executescript(
+                'create table item (item_id integer primary key);'
+                'create table sale_transaction (tran_id integer primary key, item_id integer references item (item_id));')
+        properties = make_properties()
+        properties['table-schema'] = {'url': f"jdbc:sqlite:{path}"}
+
+        rows = router_trigger_rows(self.builder(properties))
+        self.assertEqual(rows[('item', 'parent_2_child')], (100,))
+        self.assertEqual(rows[('sale_transaction_parent', 'parent_2_child')], (110,))
+
+    def test_reload_requests_through_tiers(self):
+        properties = make_tiered_properties(regions=2, stores=2)
+        properties['tables'][0].update({'rows': 30, 'key-range': {'min': 1, 'max': 30, 'column': 'item_id'}})
+        properties['load-chunk-rows'] = 10
+        builder = ReplicationBuilder(properties)
+
+        requests = [statement.params[:5] for statement in load_order.reload_requests(builder, ['store-001', 'region-001'])]
+        self.assertEqual(requests[0], ('r01', '000', 'item_chunk_1', 'corp_2_region', 't.item_id < 11'))
+        self.assertEqual(requests[1], ('001', 'r01', 'item_chunk_1', 'region_2_store', 't.item_id < 11'))
+        self.assertEqual(len(requests), 8)
+        self.assertEqual(requests[-1][2:4], ('sale_transaction_parent', 'region_2_store'))
+
+        with self.assertRaisesRegex(ValueError, 'Unknown table'):
+            list(load_order.reload_requests(builder, ['store-001'], ['price']))
+
+    def test_cli_reload(self):
+        path = os.path.join(self.tmp.name, 'properties.json')
+        properties = make_properties(stores=2)
+        properties['tables'][1].update({'rows': 3000, 'key-range': {'min': 1, 'max': 3000, 'column': 'tran_id'}})
+        properties['load-chunk-rows'] = 1000
+        with open(path, 'w') as properties_file:
+            json.dump(properties, properties_file)
+        output = os.path.join(self.tmp.name, 'reload.sql')
+
+        result = CliRunner().invoke(cli, ['reload', '-p', path, '-n', 'store-002', '-t', 'sale_transaction', '-o', output])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('3 reload request(s)', result.output)
+
+        db_path = os.path.join(self.tmp.name, 'corp.db')
+        create_sym_database(db_path)
+        with open(output) as reload_file, sqlite3.connect(db_path) as connection:
+            connection.executescript(reload_file.read())
+            rows = connection.execute('select target_node_id, reload_select from sym_table_reload_request order by reload_select').fetchall()
+        self.assertEqual(rows[0], ('002', 't.tran_id < 1001'))
+
+        result = CliRunner().invoke(cli, ['reload', '-p', path, '-n', 'store-009'])
+        self.assertEqual(result.exit_code, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.manifest import BuildManifest, MANIFEST_FILE, fingerprint
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.TemporaryDirectory()
+        self.output_dir = self.output.name
+
+    def tearDown(self):
+        self.output.cleanup()
+
+    def build(self, properties, **kwargs):
+        builder = ReplicationBuilder(properties, self.output_dir, **kwargs)
+        self.assertEqual(builder.generate_files(), [])
+        return builder
+
+    def read(self, name):
+        with open(os.path.join(self.output_dir, name)) as output_file:
+            return output_file.read()
+
+    def test_fingerprint_ignores_key_order(self):
+        self.assertEqual(fingerprint({'a': 1, 'b': 2}), fingerprint({'b': 2, 'a': 1}))
+        self.assertNotEqual(fingerprint({'a': 1}), fingerprint({'a': 2}))
+
+    def test_unchanged_rebuild_skips_everything(self):
+        properties = make_properties(stores=2)
+        self.build(properties)
+        sql_mtime = os.stat(os.path.join(self.output_dir, 'symmetricds.sql')).st_mtime_ns
+
+        builder = self.build(properties)
+
+        self.assertEqual(builder.skipped_nodes, ['corp-000', 'store-001', 'store-002'])
+        self.assertEqual(os.stat(os.path.join(self.output_dir, 'symmetricds.sql')).st_mtime_ns, sql_mtime)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, MANIFEST_FILE)))
+
+    def test_only_changed_node_rewritten(self):
+        properties = make_properties(stores=2)
+        self.build(properties)
+
+        properties['nodes'][2]['db_url'] = 'jdbc:mysql://localhost/store2'
+        builder = self.build(properties)
+
+        self.assertEqual(builder.skipped_nodes, ['corp-000', 'store-001'])
+        self.assertIn('db.url=jdbc:mysql://localhost/store2', self.read('store-002.properties'))
+
+    def test_changed_section_matches_full_build(self):
+        properties = make_properties()
+        self.build(properties)
+
+        properties['tables'].append({"name": "item_selling_price", "channel": "item", "route": "parent-child"})
+        builder = self.build(properties)
+        incremental = self.read('symmetricds.sql')
+
+        self.assertEqual(builder.reused_sql_sections, ['channel', 'channels_list', 'group', 'group_links', 'router'])
+        self.build(properties, incremental=False)
+        self.assertEqual(incremental, self.read('symmetricds.sql'))
+        self.assertIn("'item_selling_price','parent_2_child'", incremental)
+
+    def test_added_channel_regenerates_channel_section(self):
+        properties = make_properties()
+        self.build(properties)
+
+        properties['channels'].append({"id": "price"})
+        builder = self.build(properties)
+
+        self.assertNotIn('channel', builder.reused_sql_sections)
+        self.assertIn("'price'", self.read('symmetricds.sql').split('sym_channel')[1])
+
+    def test_edited_output_rewritten(self):
+        properties = make_properties()
+        self.build(properties)
+        with open(os.path.join(self.output_dir, 'store-001.properties'), 'a') as node_file:
+            node_file.write('edited')
+        with open(os.path.join(self.output_dir, 'symmetricds.sql'), 'a') as sql_file:
+            sql_file.write('edited')
+
+        builder = self.build(properties)
+
+        self.assertEqual(builder.skipped_nodes, ['corp-000'])
+        self.assertEqual(builder.reused_sql_sections, [])
+        self.assertNotIn('edited', self.read('store-001.properties'))
+        self.assertNotIn('edited', self.read('symmetricds.sql'))
+
+    def test_corrupt_manifest_ignored(self):
+        with open(os.path.join(self.output_dir, MANIFEST_FILE), 'w') as manifest_file:
+            manifest_file.write('{not json')
+        self.assertEqual(BuildManifest(self.output_dir).previous, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from sdmanager.core import ReplicationBuilder, Validator
+from sdmanager.core.profiles import PROFILES, node_engine_parameters
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestProfiles(unittest.TestCase):
+
+    def render(self, properties, engine_name):
+        builder = ReplicationBuilder(properties)
+        for node in builder.properties['nodes']:
+            if node['engine_name'] == engine_name:
+                return builder.read_node_template(node['type']).render(builder.node_parameters(node))
+
+    def test_no_profile_renders_defaults_only(self):
+        text = self.render(make_properties(), 'store-001')
+        self.assertTrue(text.endswith('job.pull.period.time.ms=10000'))
+        self.assertNotIn('thread.per.server.count', text)
+
+    def test_global_profile_expands_into_parameters(self):
+        properties = make_properties()
+        properties['profile'] = 'low-bandwidth-wan'
+
+        text = self.render(properties, 'store-001')
+
+        self.assertIn('job.push.period.time.ms=60000\n', text)
+        self.assertIn('# Performance profile: low-bandwidth-wan\n', text)
+        self.assertIn('\ncompression.level=9\n', text)
+        self.assertIn('\npush.thread.per.server.count=2\n', text)
+        self.assertEqual(text.count('job.push.period.time.ms'), 1)
+
+    def test_node_profile_and_overrides_win(self):
+        properties = make_properties(stores=2)
+        properties['profile'] = 'high-throughput'
+        properties['nodes'][1].update({
+            'profile': 'low-latency',
+            'job_pull_period_time_ms': 3000,
+            'parameters': {'http.compression': True, 'job.routing.period.time.ms': 250},
+        })
+
+        text = self.render(properties, 'store-001')
+        other = self.render(properties, 'store-002')
+
+        self.assertIn('job.routing.period.time.ms=250\n', text)
+        self.assertIn('job.push.period.time.ms=1000\n', text)
+        self.assertIn('job.pull.period.time.ms=3000\n', text)
+        self.assertIn('\nhttp.compression=true\n', text)
+        self.assertIn('# Performance profile: high-throughput\n', other)
+
+    def test_parent_only_parameters_stay_in_template(self):
+        properties = make_properties()
+        properties['nodes'][0]['parameters'] = {'job.purge.period.time.ms': 60000}
+
+        text = self.render(properties, 'corp-000')
+
+        self.assertIn('job.purge.period.time.ms=60000\n', text)
+        self.assertNotIn('# Performance', text)
+
+    def test_node_engine_parameters(self):
+        name, parameters = node_engine_parameters({'parameters': {'http.timeout.ms': 5}}, 'low-latency')
+        self.assertEqual(name, 'low-latency')
+        self.assertEqual(parameters, {**PROFILES['low-latency'], 'http.timeout.ms': 5})
+
+    def test_unknown_profile_invalid(self):
+        properties = make_properties()
+        properties['profile'] = 'fastest'
+        properties['nodes'][1]['parameters'] = {'http.compression': None}
+
+        report = Validator(properties).validate_all()
+
+        self.assertEqual([error.path for error in report.errors], ['$.profile', '$.nodes[1].parameters'])
+        self.assertFalse(Validator(properties).validate()[0])
+
+if __name__ == '__main__':
+    unittest.main()
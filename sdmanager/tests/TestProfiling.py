@@ -0,0 +1,58 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.profiling import BuildProfiler
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_phases_and_counts(self):
+        profiler = BuildProfiler()
+        ended = []
+        profiler.listeners.append(ended.append)
+
+        ReplicationBuilder(make_properties(stores=3), self.tmp.name, profiler=profiler).generate_files()
+
+        self.assertEqual([metrics.phase for metrics in profiler.phases], ['parse_properties', 'validate', 'node_properties', 'sql'])
+        self.assertEqual(ended, profiler.phases)
+        self.assertTrue(all(metrics.peak_bytes > 0 for metrics in profiler.phases[1:]))
+        self.assertEqual(profiler.counts['nodes_rendered'], 4)
+        self.assertEqual(profiler.counts['tables'], 2)
+        self.assertEqual(profiler.counts['statements'], 14)
+        self.assertIn('node_properties', profiler.summary())
+
+    def test_stats_require_cprofile(self):
+        with self.assertRaises(ValueError):
+            BuildProfiler().dump_stats(os.path.join(self.tmp.name, 'build.pstats'))
+
+    def test_build_files_profile_outputs(self):
+        properties_path = os.path.join(self.tmp.name, 'properties.json')
+        with open(properties_path, 'w') as properties_file:
+            json.dump(make_properties(), properties_file)
+        json_path = os.path.join(self.tmp.name, 'profile.json')
+        stats_path = os.path.join(self.tmp.name, 'build.pstats')
+
+        result = CliRunner().invoke(cli, ['build-files', '-p', properties_path, '-o', self.tmp.name,
+                                          '--profile-json', json_path, '--profile-stats', stats_path])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Phase', result.output)
+        with open(json_path) as json_file:
+            metrics = json.load(json_file)
+        self.assertEqual([phase['phase'] for phase in metrics['phases']], ['parse_properties', 'validate', 'node_properties', 'sql'])
+        self.assertEqual(metrics['counts']['nodes_rendered'], 2)
+        self.assertGreater(pstats.Stats(stats_path).total_calls, 0)
+
+if __name__ == '__main__':
+    unittest.main()
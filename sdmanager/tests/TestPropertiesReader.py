@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from sdmanager.core import ReplicationBuilder, Validator
+from sdmanager.core.properties_reader import StreamedEntries, _JsonStream, open_properties
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+class TestPropertiesReader(unittest.TestCase):
+
+    def setUp(self):
+        self.work = tempfile.TemporaryDirectory()
+        self.work_dir = self.work.name
+
+    def tearDown(self):
+        self.work.cleanup()
+
+    def write_json(self, name, value):
+        path = os.path.join(self.work_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as json_file:
+            json.dump(value, json_file, indent=2)
+        return path
+
+    def write_jsonl(self, name, entries):
+        path = os.path.join(self.work_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as jsonl_file:
+            for entry in entries:
+                jsonl_file.write(json.dumps(entry) + '\n')
+        return path
+
+    def build(self, properties):
+        output_dir = tempfile.mkdtemp(dir=self.work_dir)
+        builder = ReplicationBuilder(properties, output_dir, incremental=False)
+        builder.generate_files()
+        contents = {}
+        for name in sorted(os.listdir(output_dir)):
+            with open(os.path.join(output_dir, name)) as output_file:
+                contents[name] = output_file.read()
+        return contents
+
+    def test_streamed_file_matches_loaded(self):
+        properties = make_properties(stores=5)
+        path = self.write_json('properties.json', properties)
+
+        streamed = open_properties(path)
+
+        self.assertIsInstance(streamed['nodes'], StreamedEntries)
+        self.assertEqual(list(streamed['nodes']), properties['nodes'])
+        # Second pass reads the spooled entries
+        self.assertEqual(list(streamed['nodes']), properties['nodes'])
+        self.assertEqual(list(streamed['tables']), properties['tables'])
+        self.assertEqual(len(streamed['nodes']), 6)
+        self.assertEqual(streamed['groups'], properties['groups'])
+
+    def test_values_split_across_chunks(self):
+        text = json.dumps({"nodes": [{"id": n, "value": 12345.5, "ok": True} for n in range(50)], "name": "x"})
+        stream = _JsonStream(io.StringIO(text), chunk_size=7)
+
+        values = {}
+        for key, value in stream.iter_object('nodes'):
+            values[key] = list(value) if key == 'nodes' else value
+
+        self.assertEqual(values, json.loads(text))
+
+    def test_invalid_json_reports_position(self):
+        path = os.path.join(self.work_dir, 'broken.json')
+        with open(path, 'w') as json_file:
+            json_file.write('{"groups": [], "nodes": [{"a": 1} {"b": 2}]}')
+
+        with self.assertRaisesRegex(ValueError, "Expecting ',' or ']' at character 34"):
+            open_properties(path)
+
+    def test_fragment_directory_matches_single_file(self):
+        properties = make_properties(stores=4)
+        base = {key: value for key, value in properties.items() if key not in ['nodes', 'tables']}
+        self.write_json('fragments/properties.json', {**base, 'nodes': properties['nodes'][:1]})
+        self.write_jsonl('fragments/nodes/01-stores.jsonl', properties['nodes'][1:3])
+        self.write_json('fragments/nodes/02-stores.json', properties['nodes'][3:])
+        self.write_jsonl('fragments/tables.jsonl', properties['tables'])
+
+        streamed = open_properties(os.path.join(self.work_dir, 'fragments'))
+
+        self.assertEqual(list(streamed['nodes']), properties['nodes'])
+        self.assertEqual(list(streamed['tables']), properties['tables'])
+        self.assertEqual(self.build(streamed), self.build(properties))
+
+    def test_builder_streams_properties_file(self):
+        properties = make_properties(stores=3)
+        path = self.write_json('properties.json', properties)
+
+        builder = ReplicationBuilder(path, streaming=True)
+
+        self.assertTrue(builder.is_streamed())
+        self.assertEqual(self.build(builder.properties), self.build(properties))
+
+    def test_validate_all_on_streamed_entries(self):
+        properties = make_properties(stores=2)
+        properties['nodes'][2]['group_id'] = 'region'
+        del properties['tables'][0]['route']
+        path = self.write_json('properties.json', properties)
+
+        report = Validator(open_properties(path)).validate_all()
+
+        self.assertEqual([issue.path for issue in report.errors], ['$.nodes[2].group_id', '$.tables[0].route'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import copy
+import os
+import tempfile
+import unittest
+from sdmanager.core import ReplicationBuilder
+
+PROPERTIES = {
+    "groups": [
+        {"id": "corp", "description": "Corporation", "sync": "P"},
+        {"id": "store", "description": "Branch stores", "sync": "W"}
+    ],
+    "nodes": [
+        {
+            "engine_name": "corp-000",
+            "group_id": "corp",
+            "type": "parent",
+            "external_id": "000",
+            "db_driver": "com.mysql.jdbc.Driver",
+            "db_url": "jdbc:mysql://localhost/corp",
+            "db_user": "symmetric",
+            "db_password": "symmetric",
+            "url": "http://localhost:31415/sync/corp-000"
+        },
+        {
+            "engine_name": "store-001",
+            "group_id": "store",
+            "type": "child",
+            "external_id": "001",
+            "db_driver": "com.mysql.jdbc.Driver",
+            "db_url": "jdbc:mysql://localhost/store",
+            "db_user": "symmetric",
+            "db_password": "symmetric",
+            "url": "http://localhost:31415/sync/corp-000"
+        }
+    ],
+    "replication-arch": "bi-directional",
+    "channels": [{"id": "item"}, {"id": "sale_transaction"}],
+    "tables": [
+        {"name": "item", "channel": "item", "route": "parent-child"},
+        {
+            "name": "sale_transaction",
+            "channel": "sale_transaction",
+            "route": "child-parent",
+            "initial-load": 1,
+            "initial-load-route": "parent-child"
+        }
+    ]
+}
+
+def make_properties(stores=1):
+    """Copies the sample properties with the given number of store nodes"""
+    properties = copy.deepcopy(PROPERTIES)
+    store = properties['nodes'].pop()
+    for idx in range(1, stores + 1):
+        properties['nodes'].append({**store, "engine_name": f"store-{idx:03}", "external_id": f"{idx:03}"})
+    return properties
+
+class TestReplicationBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.TemporaryDirectory()
+        self.output_dir = self.output.name
+
+    def tearDown(self):
+        self.output.cleanup()
+
+    def read_output(self):
+        contents = {}
+        for name in sorted(os.listdir(self.output_dir)):
+            with open(os.path.join(self.output_dir, name)) as output_file:
+                contents[name] = output_file.read()
+        return contents
+
+    def test_streamed_sql_matches_built_sections(self):
+        builder = ReplicationBuilder(make_properties(), self.output_dir)
+        builder.generate_sql_file()
+        streamed = self.read_output()['symmetricds.sql']
+
+        mappings = {}
+        mappings['group'], mappings['group_links'] = builder.build_group_queries()
+        mappings['channels_list'], mappings['channel'] = builder.build_channel_query()
+        mappings['table_triggers'], mappings['initial_load_table_triggers'] = builder.build_table_trigger_queries()
+        mappings['router'] = builder.build_router_query()
+        mappings['router_triggers'], mappings['initial_load_router_triggers'] = builder.build_router_trigger_queries()
+        builder.generate_sql_file(mappings)
+
+        self.assertEqual(self.read_output()['symmetricds.sql'], streamed)
+        self.assertIn("delete from sym_channel where channel_id in ( 'item','sale_transaction');", streamed)
+
+    def test_parallel_node_files_match_serial(self):
+        properties = make_properties(stores=6)
+        self.assertEqual(ReplicationBuilder(properties, self.output_dir, incremental=False).generate_node_property_files(), [])
+        serial = self.read_output()
+
+        for name in os.listdir(self.output_dir):
+            os.remove(os.path.join(self.output_dir, name))
+
+        self.assertEqual(ReplicationBuilder(properties, self.output_dir, jobs=3, incremental=False).generate_node_property_files(), [])
+        self.assertEqual(self.read_output(), serial)
+        self.assertEqual(len(serial), 7)
+
+    def test_failed_node_reported_without_file(self):
+        properties = make_properties(stores=3)
+        del properties['nodes'][2]['url']
+
+        failures = ReplicationBuilder(properties, self.output_dir, jobs=2).generate_node_property_files()
+
+        self.assertEqual([engine_name for engine_name, _ in failures], ['store-002'])
+        self.assertIn("missing 'url'", failures[0][1])
+        self.assertNotIn('store-002.properties', self.read_output())
+        self.assertIn('store-003.properties', self.read_output())
+
+    def test_route_by_generates_column_routers(self):
+        properties = make_properties()
+        properties['tables'] += [
+            {"name": "item_selling_price", "channel": "item", "route": "parent-child", "route-by": "store_id = EXTERNAL_ID",
+             "initial-load": 1, "initial-load-route": "parent-child"},
+            {"name": "store_stock", "channel": "item", "route": "parent-child", "route-by": "STORE_ID=:EXTERNAL_ID"},
+        ]
+        builder = ReplicationBuilder(properties)
+
+        routers = builder.build_router_query()
+        router_triggers, initial_load_router_triggers = builder.build_router_trigger_queries()
+
+        self.assertEqual(routers.count("'column'"), 1)
+        self.assertIn("values ('parent_2_one_child_store_id','corp','store','column','STORE_ID=:EXTERNAL_ID',", routers)
+        self.assertIn("values ('item','parent_2_child',", router_triggers)
+        self.assertIn("values ('item_selling_price','parent_2_one_child_store_id',", router_triggers)
+        self.assertIn("values ('store_stock','parent_2_one_child_store_id',", router_triggers)
+        self.assertIn("values ('item_selling_price_parent','parent_2_one_child_store_id',", initial_load_router_triggers)
+
+if __name__ == '__main__':
+    unittest.main()
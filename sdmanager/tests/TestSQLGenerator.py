@@ -38,10 +38,66 @@ class TestSQLGenerator(unittest.TestCase):
         self.assertEqual(sql_generator.create_router('corp_2_store', 'corp', 'store', 'default'), \
             "insert into sym_router (router_id,source_node_group_id,target_node_group_id,router_type,create_time,last_update_time) values ('corp_2_store','corp','store','default',current_timestamp,current_timestamp);")
     
+    def test_create_column_router(self):
+        self.assertEqual(sql_generator.create_column_router('corp_2_one_store', 'corp', 'store', expression='STORE_ID=:EXTERNAL_ID'), \
+            "insert into sym_router (router_id,source_node_group_id,target_node_group_id,router_type,router_expression,create_time,last_update_time) values ('corp_2_one_store','corp','store','column','STORE_ID=:EXTERNAL_ID',current_timestamp,current_timestamp);")
+
+    def test_column_router_expression(self):
+        self.assertEqual(sql_generator.column_router_expression('store_id = EXTERNAL_ID'), 'STORE_ID=:EXTERNAL_ID')
+        self.assertEqual(sql_generator.column_router_expression('region=:node_group_id OR store_id != 000'), 'REGION=:NODE_GROUP_ID or STORE_ID!=000')
+        for route_by in ['', 'store_id', 'store_id = :STORE_NAME', 'store id = EXTERNAL_ID']:
+            with self.assertRaises(ValueError):
+                sql_generator.column_router_expression(route_by)
+
+    def test_column_router_id(self):
+        self.assertEqual(sql_generator.column_router_id('STORE_ID=:EXTERNAL_ID'), 'parent_2_one_child_store_id')
+        self.assertEqual(sql_generator.column_router_id('STORE_ID=:NODE_ID', ['parent_2_one_child_store_id']), 'parent_2_one_child_store_id_2')
+
     def test_create_router_trigger(self):
         
         self.assertEqual(sql_generator.create_router_trigger('item','corp_2_store', 100), \
             "insert into sym_trigger_router (trigger_id,router_id,initial_load_order,last_update_time,create_time) values ('item','corp_2_store',100,current_timestamp,current_timestamp);")
 
+    def test_insert_statement_pickles(self):
+        import pickle
+        statement = pickle.loads(pickle.dumps(sql_generator.create_node_group('store')))
+        self.assertEqual((statement.table, statement.values), ('SYM_NODE_GROUP', "'store', ''"))
+
+    def test_dialect_for_driver(self):
+        self.assertEqual(sql_generator.dialect_for_driver('com.mysql.jdbc.Driver'), 'mysql')
+        self.assertEqual(sql_generator.dialect_for_driver('com.example.Driver'), 'ansi')
+
+    def test_batch_inserts_groups_by_table(self):
+        statements = [
+            sql_generator.create_router_trigger('item', 'corp_2_store'),
+            sql_generator.create_router_trigger('price', 'corp_2_store'),
+            sql_generator.create_router_trigger('sale', 'store_2_corp'),
+            sql_generator.create_node_group('store'),
+            '-- comment',
+            sql_generator.create_node_group('corp')
+        ]
+        self.assertEqual(list(sql_generator.batch_inserts(statements, 2, 'mysql')), [
+            "insert into sym_trigger_router (trigger_id,router_id,initial_load_order,last_update_time,create_time) values\n" \
+            "('item','corp_2_store',100,current_timestamp,current_timestamp),\n" \
+            "('price','corp_2_store',100,current_timestamp,current_timestamp);",
+            "insert into sym_trigger_router (trigger_id,router_id,initial_load_order,last_update_time,create_time) values ('sale','store_2_corp',100,current_timestamp,current_timestamp);",
+            "insert into SYM_NODE_GROUP (node_group_id, description) values ('store', '');",
+            '-- comment',
+            "insert into SYM_NODE_GROUP (node_group_id, description) values ('corp', '');"
+        ])
+
+    def test_batch_inserts_oracle(self):
+        statements = [sql_generator.create_node_group('store'), sql_generator.create_node_group('corp')]
+        self.assertEqual(list(sql_generator.batch_inserts(statements, 100, 'oracle')), [
+            "insert all\n" \
+            "  into SYM_NODE_GROUP (node_group_id, description) values ('store', '')\n" \
+            "  into SYM_NODE_GROUP (node_group_id, description) values ('corp', '')\n" \
+            "select 1 from dual;"
+        ])
+
+    def test_batch_inserts_respects_dialect_limit(self):
+        statements = [sql_generator.create_node_group(str(idx)) for idx in range(1200)]
+        self.assertEqual(len(list(sql_generator.batch_inserts(statements, 5000, 'mssql'))), 2)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import io
+import os
+import tempfile
+import unittest
+from sdmanager.core import sql_writer
+
+class TestSQLWriter(unittest.TestCase):
+
+    def test_iter_template_keeps_section_order(self):
+        chunks = sql_writer.iter_template("-- a\n$first\n-- b\n${second}$$", {
+            'first': lambda: iter(['one;', 'two;']),
+            'second': lambda: iter(['three;'])
+        })
+        self.assertEqual(''.join(chunks), "-- a\none;two;\n-- b\nthree;$")
+
+    def test_iter_template_is_lazy(self):
+        called = []
+        chunks = sql_writer.iter_template("head $section tail", {
+            'section': lambda: called.append(True) or ['x']
+        })
+        self.assertEqual(next(chunks), 'head ')
+        self.assertEqual(called, [])
+        self.assertEqual(''.join(chunks), 'x tail')
+
+    def test_iter_template_missing_section(self):
+        with self.assertRaises(KeyError):
+            ''.join(sql_writer.iter_template("$missing", {}))
+
+    def test_write_sql_to_stream(self):
+        stream = io.StringIO()
+        self.assertEqual(sql_writer.write_sql(['ab', 'c'], stream), 3)
+        self.assertEqual(stream.getvalue(), 'abc')
+
+    def test_write_sql_file_keeps_previous_file_on_error(self):
+        def failing_chunks():
+            yield 'partial'
+            raise RuntimeError('boom')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, 'symmetricds.sql')
+            with open(path, 'w') as sql_file:
+                sql_file.write('previous')
+
+            with self.assertRaises(RuntimeError):
+                sql_writer.write_sql_file(path, failing_chunks())
+
+            with open(path) as sql_file:
+                self.assertEqual(sql_file.read(), 'previous')
+            self.assertEqual(os.listdir(output_dir), ['symmetricds.sql'])
+
+if __name__ == '__main__':
+    unittest.main()
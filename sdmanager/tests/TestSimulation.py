@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import unittest
+from click.testing import CliRunner
+from sdmanager.cli import cli
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.simulation import ReplicationSimulator
+from sdmanager.tests.TestReplicationBuilder import make_properties
+from sdmanager.tests.TestTopology import make_tiered_properties
+
+def simulate(properties, **kwargs):
+    return ReplicationSimulator(ReplicationBuilder(properties), **kwargs).run()
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.properties = make_properties(stores=3)
+        self.properties['tables'][0]['rows-per-second'] = 10
+        self.properties['tables'][1]['rows-per-second'] = 2
+
+    def channel(self, report, channel_id):
+        return next(stats for stats in report.channels if stats.channel == channel_id)
+
+    def link(self, report, source, target):
+        return next(stats for stats in report.links if (stats.source, stats.target) == (source, target))
+
+    def test_rows_delivered_within_job_periods(self):
+        report = simulate(self.properties, duration=600)
+
+        # item is captured at corp and sent to every store
+        item = self.channel(report, 'item')
+        self.assertAlmostEqual(item.rows + item.backlog_rows, 10 * 600 * 3, delta=10 * 15 * 3)
+        # Routing every 5s and syncing every 10s
+        self.assertLess(item.max_latency, 15)
+        self.assertGreater(item.mean_latency, 2.5)
+        self.assertFalse(item.growing)
+
+        # sale_transaction is captured at every store and pushed to corp
+        sales = self.channel(report, 'sale_transaction')
+        self.assertAlmostEqual(sales.rows + sales.backlog_rows, 2 * 600 * 3, delta=2 * 15 * 3)
+        self.assertEqual(self.link(report, 'corp', 'store').data_event_action, 'P')
+        self.assertEqual(self.link(report, 'store', 'corp').data_event_action, 'W')
+        self.assertAlmostEqual(self.link(report, 'corp', 'store').bytes_per_second, 10 * 512 * 3, delta=10 * 512 * 3 * 0.1)
+        self.assertEqual(report.warnings, [])
+
+    def test_column_router_sends_each_row_to_one_store(self):
+        self.properties['tables'].append({"name": "item_selling_price", "channel": "sale_transaction", "route": "parent-child",
+                                          "route-by": "store_id = EXTERNAL_ID", "rows-per-second": 30})
+        self.properties['tables'][1]['rows-per-second'] = 0
+
+        sales = self.channel(simulate(self.properties, duration=600), 'sale_transaction')
+        self.assertAlmostEqual(sales.rows + sales.backlog_rows, 30 * 600, delta=30 * 15)
+
+    def test_profile_periods_lower_latency(self):
+        default = self.channel(simulate(self.properties), 'item')
+        self.properties['profile'] = 'low-latency'
+        fast = self.channel(simulate(self.properties), 'item')
+        self.assertLess(fast.max_latency, 3)
+        self.assertLess(fast.mean_latency, default.mean_latency)
+
+    def test_backlog_grows_when_routing_cannot_keep_up(self):
+        self.properties['channels'][0]['max-data-to-route'] = 20
+        report = simulate(self.properties)
+
+        self.assertTrue(self.channel(report, 'item').growing)
+        self.assertFalse(self.channel(report, 'sale_transaction').growing)
+        self.assertIn('Backlog of channel item keeps growing', '\n'.join(report.warnings))
+
+    def test_bandwidth_delays_delivery(self):
+        self.properties['tables'][0]['rows-per-second'] = 1000
+        instant = self.channel(simulate(self.properties), 'item')
+        slow = self.channel(simulate(self.properties, bandwidth=512 * 1024), 'item')
+        self.assertFalse(instant.growing)
+        self.assertGreater(slow.mean_latency, instant.mean_latency + 1)
+
+    def test_rates_beyond_planned_channel_fall_behind(self):
+        # Channel batching is planned for the declared 10 rows/s
+        report = simulate(self.properties, rates={'item': 1000})
+        self.assertTrue(self.channel(report, 'item').growing)
+
+    def test_routers_relay_to_their_own_stores(self):
+        properties = make_tiered_properties(regions=2, stores=4)
+        properties['tables'][0]['rows-per-second'] = 10
+        properties['tables'][1]['rows-per-second'] = 2
+        report = simulate(properties, duration=600)
+
+        item = self.channel(report, 'item')
+        self.assertAlmostEqual(item.rows + item.backlog_rows, 10 * 600 * 4, delta=10 * 30 * 4)
+        # Two hops of routing and syncing
+        self.assertLess(item.max_latency, 30)
+        # corp sends to the 2 regions only, each region to its own 2 stores
+        self.assertAlmostEqual(self.link(report, 'corp', 'region').bytes_per_second, 10 * 512 * 2, delta=10 * 512 * 2 * 0.1)
+        self.assertAlmostEqual(self.link(report, 'region', 'store').bytes_per_second, 10 * 512 * 4, delta=10 * 512 * 4 * 0.1)
+        sales = self.channel(report, 'sale_transaction')
+        self.assertAlmostEqual(sales.rows + sales.backlog_rows, 2 * 600 * 4, delta=2 * 30 * 4)
+        self.assertEqual(report.warnings, [])
+
+    def test_missing_link_reported(self):
+        self.properties['links'] = [{"source": "corp", "target": "store"}]
+        report = simulate(self.properties)
+
+        self.assertEqual(self.channel(report, 'sale_transaction').rows, 0)
+        self.assertIn('No push or pull group link store -> corp', report.warnings[0])
+
+    def test_requires_rates(self):
+        with self.assertRaises(ValueError):
+            ReplicationSimulator(ReplicationBuilder(make_properties()))
+
+    def test_cli_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'properties.json')
+            with open(path, 'w') as properties_file:
+                json.dump(make_properties(stores=2), properties_file)
+
+            result = CliRunner().invoke(cli, ['simulate', '-p', path, '-r', 'item=5', '-d', '60', '--json'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        report = json.loads(result.output[result.output.index('{'):])
+        self.assertEqual(report['nodes'], 3)
+        self.assertEqual([channel['channel'] for channel in report['channels']], ['item', 'sale_transaction'])
+
+if __name__ == '__main__':
+    unittest.main()
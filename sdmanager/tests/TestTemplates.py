@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from string import Template
+from sdmanager.core import templates
+
+class TestTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.template_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.template_dir.cleanup()
+
+    def write_template(self, name, text, mtime=None):
+        path = os.path.join(self.template_dir.name, f"{name}.st")
+        with open(path, 'w') as template_file:
+            template_file.write(text)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+    def test_compiled_render_matches_string_template(self):
+        source = "a.b=$first\n${second}{literal} $$cost $first"
+        mapping = {'first': 1, 'second': 'two'}
+        self.assertEqual(templates.CompiledTemplate(source).render(mapping), Template(source).substitute(mapping))
+
+    def test_compiled_render_missing_key(self):
+        with self.assertRaises(KeyError):
+            templates.CompiledTemplate("$missing").render({})
+
+    def test_placeholders(self):
+        self.assertEqual(templates.CompiledTemplate("$b $a ${b}").placeholders, ('b', 'a'))
+
+    def test_bundled_templates_found(self):
+        registry = templates.TemplateRegistry()
+        self.assertIn('engine_name', registry.get('parent').placeholders)
+        self.assertIs(registry.get('parent'), registry.get('parent'))
+
+    def test_registered_directory_takes_precedence(self):
+        self.write_template('child', 'custom=$engine_name')
+        registry = templates.TemplateRegistry()
+        registry.register_directory(self.template_dir.name)
+        self.assertEqual(registry.get('child').render({'engine_name': 'store'}), 'custom=store')
+
+    def test_register_missing_directory(self):
+        with self.assertRaises(NotADirectoryError):
+            templates.TemplateRegistry().register_directory(os.path.join(self.template_dir.name, 'missing'))
+
+    def test_modified_template_recompiled(self):
+        path = self.write_template('node', 'v1', mtime=1_000_000_000)
+        registry = templates.TemplateRegistry([self.template_dir.name])
+        self.assertEqual(registry.get('node').render({}), 'v1')
+
+        self.write_template('node', 'v2', mtime=2_000_000_000)
+        self.assertEqual(registry.evict_stale(), 1)
+        self.assertEqual(registry.get('node').render({}), 'v2')
+
+        os.remove(path)
+        self.assertEqual(registry.evict_stale(), 1)
+        with self.assertRaises(FileNotFoundError):
+            registry.get('node')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import unittest
+from sdmanager.core import Validator, topology, ReplicationBuilder
+from sdmanager.core.topology import GroupLink
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+def make_tiered_properties(regions=2, stores=4):
+    """Copies the sample properties with region router nodes between corp and the stores"""
+    props = make_properties(stores)
+    props['groups'].insert(1, {'id': 'region', 'description': 'Regional offices', 'sync': 'P'})
+    corp = props['nodes'][0]
+    for idx in range(1, regions + 1):
+        props['nodes'].insert(idx, {**corp, 'engine_name': f'region-{idx:03}', 'group_id': 'region', 'type': 'router',
+                                    'external_id': f'r{idx:02}', 'url': f'http://region{idx}:31415/sync/region-{idx:03}'})
+    for idx, store in enumerate(props['nodes'][regions + 1:]):
+        store['upstream'] = f'region-{idx % regions + 1:03}'
+        del store['url']
+    return props
+
+GROUPS = [
+    {'id': 'corp', 'sync': 'W'},
+    {'id': 'region', 'sync': 'P'},
+    {'id': 'store', 'sync': 'P'}
+]
+
+class TestTopology(unittest.TestCase):
+
+    def links(self, links):
+        return list(topology.iter_declared_links(links, GROUPS))
+
+    def test_all_pairs(self):
+        self.assertEqual(len(list(topology.iter_all_pairs(GROUPS))), 6)
+
+    def test_explicit_link_defaults_to_source_sync(self):
+        self.assertEqual(self.links([
+            {'source': 'corp', 'target': 'store'},
+            {'source': 'store', 'target': 'corp', 'data_event_action': 'R'}
+        ]), [GroupLink('corp', 'store', 'W'), GroupLink('store', 'corp', 'R')])
+
+    def test_star_defaults_to_all_other_groups(self):
+        self.assertEqual(self.links([{'topology': 'star', 'hub': 'corp', 'direction': 'out'}]),
+            [GroupLink('corp', 'region', 'W'), GroupLink('corp', 'store', 'W')])
+
+    def test_hub_and_spoke(self):
+        self.assertEqual(self.links([{'topology': 'hub-and-spoke', 'hubs': {'corp': ['region'], 'region': ['store']}, 'out_action': 'W', 'in_action': 'P'}]), [
+            GroupLink('corp', 'region', 'W'), GroupLink('region', 'corp', 'P'),
+            GroupLink('region', 'store', 'W'), GroupLink('store', 'region', 'P')
+        ])
+
+    def test_chain_inbound(self):
+        self.assertEqual(self.links([{'topology': 'chain', 'groups': ['corp', 'region', 'store'], 'direction': 'in'}]),
+            [GroupLink('region', 'corp', 'P'), GroupLink('store', 'region', 'P')])
+
+    def test_duplicate_link_emitted_once(self):
+        self.assertEqual(len(self.links([{'source': 'corp', 'target': 'store'}, {'topology': 'star', 'hub': 'corp', 'spokes': ['store'], 'direction': 'out'}])), 1)
+
+    def test_conflicting_link_rejected(self):
+        with self.assertRaises(ValueError):
+            self.links([{'source': 'corp', 'target': 'store'}, {'source': 'corp', 'target': 'store', 'data_event_action': 'P'}])
+
+    def test_invalid_entries_rejected(self):
+        for entry in [
+            {'source': 'corp'},
+            {'source': 'corp', 'target': 'warehouse'},
+            {'source': 'corp', 'target': 'corp'},
+            {'source': 'corp', 'target': 'store', 'data_event_action': 'X'},
+            {'topology': 'mesh'},
+            {'topology': 'star'},
+            {'topology': 'chain', 'groups': ['corp']},
+            {'topology': 'star', 'hub': 'corp', 'direction': 'sideways'}
+        ]:
+            with self.assertRaises(ValueError, msg=entry):
+                self.links([entry])
+
+    def test_validator_reports_link_errors(self):
+        props = make_properties()
+        props['links'] = [{'source': 'corp', 'target': 'store'}, {'source': 'corp', 'target': 'warehouse'}]
+        self.assertEqual(Validator(props).validate(), (False, "Linked group 'warehouse' is not a configured group"))
+        self.assertEqual([error.path for error in Validator(props).validate_all().errors], ['$.links[1]'])
+
+    def test_builder_emits_only_declared_links(self):
+        props = make_properties()
+        props['groups'].append({'id': 'region', 'sync': 'P'})
+        props['links'] = [{'topology': 'star', 'hub': 'corp', 'spokes': ['store'], 'direction': 'out'}]
+        _, links = ReplicationBuilder(props).build_group_queries()
+        self.assertEqual(links,
+            "insert into SYM_NODE_GROUP_LINK (source_node_group_id, target_node_group_id, data_event_action) values ('corp', 'store', 'P');\n\n")
+
+class TestTiers(unittest.TestCase):
+
+    def setUp(self):
+        self.props = make_tiered_properties()
+
+    def test_node_tree(self):
+        tree = topology.node_tree(self.props['nodes'])
+        self.assertEqual(tree.router_groups, ('region',))
+        self.assertEqual(tree.upstream['region-001'], 'corp-000')
+        self.assertEqual(tree.upstream['store-002'], 'region-002')
+
+    def test_invalid_trees_rejected(self):
+        for change, message in [
+            (lambda nodes: nodes[3].update(upstream='store-002'), "Upstream node 'store-002' of store-001 is not a parent or router node"),
+            (lambda nodes: nodes[1].update(upstream='region-002') or nodes[2].update(upstream='region-001'), 'form a cycle'),
+            (lambda nodes: nodes[2].update(upstream='region-001'), "Router group 'region' must be a single tier"),
+            (lambda nodes: nodes[2].update(group_id='store'), "Router group 'store' of region-002 must not have parent or child nodes"),
+        ]:
+            props = make_tiered_properties()
+            change(props['nodes'])
+            with self.assertRaisesRegex(ValueError, message):
+                topology.node_tree(props['nodes'])
+            self.assertIn(message.split("'")[0], Validator(props).validate()[1])
+            self.assertEqual([error.path for error in Validator(props).validate_all().errors], ['$.nodes'])
+
+    def test_validator_requires_router_url(self):
+        del self.props['nodes'][1]['url']
+        self.assertEqual(Validator(self.props).validate(), (False, 'A router node must have a synchronization url'))
+        self.assertEqual([error.path for error in Validator(self.props).validate_all().errors], ['$.nodes[1].url'])
+
+    def test_routers_and_links_per_tier(self):
+        builder = ReplicationBuilder(self.props)
+        self.assertEqual([(router.router_id, router.source, router.target) for router in builder.iter_routers()], [
+            ('corp_2_region', 'corp', 'region'), ('region_2_store', 'region', 'store'),
+            ('store_2_region', 'store', 'region'), ('region_2_corp', 'region', 'corp'),
+        ])
+        self.assertEqual(list(builder.iter_group_links()), [
+            GroupLink('corp', 'region', 'P'), GroupLink('region', 'corp', 'P'),
+            GroupLink('region', 'store', 'P'), GroupLink('store', 'region', 'W'),
+        ])
+
+    def test_trigger_routers_relay_through_middle_tier(self):
+        self.props['tables'].append({'name': 'item_selling_price', 'channel': 'item', 'route': 'parent-child', 'route-by': 'store_id = EXTERNAL_ID'})
+        builder = ReplicationBuilder(self.props)
+
+        triggers, _ = builder.build_table_trigger_queries()
+        self.assertEqual(triggers.count('sync_on_incoming_batch'), 3)
+        router_triggers, load_router_triggers = builder.build_router_trigger_queries()
+        self.assertEqual([line.split("'")[1:4:2] for line in router_triggers.split('\n') if line], [
+            ['item', 'corp_2_region'], ['item', 'region_2_store'],
+            ['sale_transaction', 'store_2_region'], ['sale_transaction', 'region_2_corp'],
+            ['item_selling_price', 'corp_2_region'], ['item_selling_price', 'parent_2_one_child_store_id'],
+        ])
+        self.assertEqual(load_router_triggers.count('sale_transaction_parent'), 2)
+        self.assertIn("('parent_2_one_child_store_id','region','store','column','STORE_ID=:EXTERNAL_ID'", builder.build_router_query())
+
+    def test_router_and_child_properties_register_upstream(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            ReplicationBuilder(self.props, output_dir).generate_files()
+            with open(os.path.join(output_dir, 'region-002.properties')) as properties_file:
+                region = properties_file.read()
+            with open(os.path.join(output_dir, 'store-002.properties')) as properties_file:
+                store = properties_file.read()
+
+        self.assertIn('registration.url=http://localhost:31415/sync/corp-000\n', region)
+        self.assertIn('sync.url=http://region2:31415/sync/region-002\n', region)
+        self.assertIn('auto.registration=true', region)
+        self.assertIn('registration.url=http://region2:31415/sync/region-002\n', store)
+
+if __name__ == '__main__':
+    unittest.main()
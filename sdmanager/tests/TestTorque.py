@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sdmanager.core import ReplicationBuilder, torque
+from sdmanager.core.catalog import CatalogCache
+from sdmanager.core.torque import iter_torque_tables, read_torque_schema
+from sdmanager.tests.TestReplicationBuilder import make_properties
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', '..', 'samples', 'create_sample.xml')
+
+class TestTorque(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CatalogCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sample_schema(self):
+        tables = {table['name']: table for table in iter_torque_tables(SAMPLE)}
+
+        self.assertEqual(list(tables), ['item', 'item_selling_price', 'sale_transaction', 'sale_return_line_item'])
+        self.assertEqual(tables['item_selling_price']['primary_key'], ['item_id', 'store_id'])
+        self.assertEqual(tables['item_selling_price']['columns'][2],
+                         {'name': 'price', 'type': 'DECIMAL', 'nullable': False, 'size': '10,2'})
+        self.assertEqual(tables['sale_return_line_item']['foreign_keys'], [
+            {'columns': ['tran_id'], 'foreign_table': 'sale_transaction', 'foreign_columns': ['tran_id']},
+            {'columns': ['item_id'], 'foreign_table': 'item', 'foreign_columns': ['item_id']},
+        ])
+
+    def test_invalid_schema(self):
+        path = os.path.join(self.tmp.name, 'broken.xml')
+        with open(path, 'w') as schema_file:
+            schema_file.write('<database><table name="a"><column name="b"></table></database>')
+
+        with self.assertRaisesRegex(ValueError, 'Invalid Torque schema'):
+            list(iter_torque_tables(path))
+
+    def test_parsed_schema_is_cached(self):
+        first = read_torque_schema(SAMPLE, self.cache)
+
+        with mock.patch.object(torque, 'iter_torque_tables', side_effect=AssertionError('schema re-parsed')):
+            self.assertEqual(read_torque_schema(SAMPLE, self.cache)['tables'], first['tables'])
+
+    def test_builder_adds_schema_tables(self):
+        properties = make_properties()
+        properties['table-schema'] = {'path': SAMPLE, 'channel': 'sale_transaction', 'exclude': ['item_*']}
+
+        builder = ReplicationBuilder(properties, catalog_cache=self.cache)
+
+        self.assertEqual([table['name'] for table in builder.properties['tables']],
+                         ['item', 'sale_transaction', 'sale_return_line_item'])
+        self.assertEqual(builder.properties['tables'][2], {'name': 'sale_return_line_item', 'channel': 'sale_transaction', 'route': 'parent-child'})
+        self.assertEqual(builder.table_metadata['item']['primary_key'], ['item_id'])
+        self.assertIn("'sale_return_line_item'", builder.build_table_trigger_queries()[0])
+
+if __name__ == '__main__':
+    unittest.main()
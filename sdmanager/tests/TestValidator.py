@@ -1,3 +1,4 @@
+import time
 import unittest
 from sdmanager.core import Validator
 
@@ -283,6 +284,99 @@ class TestValidator(unittest.TestCase):
             (False, 'Node external ID must be unique.')
         )
 
+    ################################
+    """COLLECT-ALL VALIDATION TESTS"""
+    ################################
+
+    def make_node(self, idx, group_id='store', node_type='child'):
+        return {
+            "engine_name": f"{group_id}-{idx}",
+            "group_id": group_id,
+            "type": node_type,
+            "external_id": f"{idx}",
+            "db_driver": self._DB_DRIVER,
+            "db_url": self._DB_URL,
+            "db_user": self._DB_USER,
+            "db_password": self._DB_PASSWORD,
+            "url": ""
+        }
+
+    def make_props(self, nodes=2):
+        return {
+            "groups": [{'id': 'corp', 'sync': 'P'}, {'id': 'store', 'sync': 'W'}],
+            "nodes": [self.make_node(0, 'corp', 'parent')] + [self.make_node(idx) for idx in range(1, nodes)],
+            "replication-arch": "parent-child",
+            "channels": [],
+            "tables": []
+        }
+
+    def test_validate_all_passes_valid_props(self):
+        props = self.make_props()
+        report = Validator(props).validate_all()
+        self.assertTrue(report.valid)
+        self.assertEqual(str(report), 'Valid')
+        self.assertEqual(Validator(props).validate(), self.success)
+
+    def test_validate_all_collects_every_error(self):
+        props = self.make_props(4)
+        props['groups'].append({'id': 'corp', 'sync': 'X'})
+        props['nodes'][2]['engine_name'] = props['nodes'][1]['engine_name']
+        props['nodes'][3]['group_id'] = 'region'
+        del props['nodes'][3]['db_url']
+        del props['channels']
+
+        report = Validator(props).validate_all()
+
+        self.assertFalse(report.valid)
+        self.assertEqual([error.path for error in report.errors], [
+            '$.channels',
+            '$.groups[2].id',
+            '$.groups[2].sync',
+            '$.nodes[2].engine_name',
+            '$.nodes[3].db_url',
+            '$.nodes[3].group_id'
+        ])
+        self.assertEqual(report.errors[3].message, "Node engine name 'store-1' must be unique, first defined at $.nodes[1]")
+        self.assertEqual(report.to_dict()['errors'][0], {'path': '$.channels', 'message': "'channels' must be configured."})
+
+    def test_validate_all_requires_route_for_bi_directional(self):
+        props = self.make_props()
+        props['replication-arch'] = 'bi-directional'
+        props['tables'] = [{'name': 'item', 'channel': 'item', 'route': 'parent-child'}, {'name': 'sale', 'channel': 'sale'}]
+        self.assertEqual([error.path for error in Validator(props).validate_all().errors], ['$.tables[1].route'])
+
+    def test_route_by_requires_parent_child_routing(self):
+        props = self.make_props()
+        props['replication-arch'] = 'bi-directional'
+        props['tables'] = [
+            {'name': 'price', 'channel': 'item', 'route': 'parent-child', 'route-by': 'store_id = EXTERNAL_ID'},
+            {'name': 'sale', 'channel': 'sale', 'route': 'child-parent', 'route-by': 'store_id = EXTERNAL_ID'},
+            {'name': 'stock', 'channel': 'item', 'route': 'parent-child', 'route-by': 'store_id'},
+        ]
+
+        report = Validator(props).validate_all()
+
+        self.assertEqual([error.path for error in report.errors], ['$.tables[1].route-by', '$.tables[2].route-by'])
+        self.assertEqual(report.errors[0].message, "sale: 'route-by' requires the table to be routed parent-child")
+        self.assertEqual(Validator(props).validate(), (False, report.errors[0].message))
+
+
+class TestValidatorScaling(unittest.TestCase):
+    """Checks validation time grows linearly with the number of nodes"""
+
+    def time_validation(self, nodes):
+        props = TestValidator().make_props(nodes)
+        start = time.perf_counter()
+        self.assertTrue(Validator(props).validate_all().valid)
+        self.assertEqual(Validator(props).validate(), (True, 'Valid'))
+        return time.perf_counter() - start
+
+    def test_linear_up_to_100k_nodes(self):
+        small = min(self.time_validation(10000) for _ in range(3))
+        large = self.time_validation(100000)
+        # 10x the nodes; quadratic checks would take ~100x as long
+        self.assertLess(large / small, 30)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from sdmanager.core import ReplicationBuilder, Validator
+from sdmanager.core.manifest import MANIFEST_FILE
+from sdmanager.core.watcher import PropertiesWatcher
+from sdmanager.tests.TestReplicationBuilder import make_properties
+from sdmanager.tests.TestTopology import make_tiered_properties
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'properties.json')
+        self.output_dir = os.path.join(self.tmp.name, 'output')
+        os.mkdir(self.output_dir)
+        self.properties = make_properties(stores=3)
+        self.write()
+        builder = ReplicationBuilder(self.path, self.output_dir)
+        builder.generate_files()
+        self.watcher = PropertiesWatcher(builder, self.path, poll_interval=0.01, debounce=0.05)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self):
+        with open(self.path, 'w') as properties_file:
+            json.dump(self.properties, properties_file)
+
+    def read(self, name):
+        with open(os.path.join(self.output_dir, name)) as output_file:
+            return output_file.read()
+
+    def test_changed_node_rendered_alone(self):
+        self.properties['nodes'][2]['db_url'] = 'jdbc:mysql://localhost/store2'
+        self.write()
+
+        rebuild = self.watcher.rebuild()
+
+        self.assertIsNone(rebuild.error)
+        self.assertEqual(rebuild.nodes, ['store-002'])
+        self.assertEqual(rebuild.sql_sections, [])
+        self.assertIn('db.url=jdbc:mysql://localhost/store2', self.read('store-002.properties'))
+        with open(os.path.join(self.output_dir, MANIFEST_FILE)) as manifest_file:
+            self.assertEqual(sorted(json.load(manifest_file)['nodes']), ['corp-000', 'store-001', 'store-002', 'store-003'])
+
+    def test_changed_section_matches_full_build(self):
+        self.properties['channels'].append({"id": "price"})
+        self.properties['tables'].append({"name": "item_selling_price", "channel": "price", "route": "parent-child"})
+        self.write()
+
+        rebuild = self.watcher.rebuild()
+        incremental = self.read('symmetricds.sql')
+
+        self.assertEqual(rebuild.nodes, [])
+        self.assertIn('table_triggers', rebuild.sql_sections)
+        self.assertNotIn('group', rebuild.sql_sections)
+        ReplicationBuilder(self.path, self.output_dir, incremental=False).generate_files()
+        self.assertEqual(incremental, self.read('symmetricds.sql'))
+
+    def test_profile_renders_every_node(self):
+        self.properties['profile'] = 'low-latency'
+        self.write()
+
+        rebuild = self.watcher.rebuild()
+
+        self.assertEqual(rebuild.nodes, ['corp-000', 'store-001', 'store-002', 'store-003'])
+        self.assertIn('# Performance profile: low-latency', self.read('store-001.properties'))
+
+    def test_invalid_change_keeps_model(self):
+        previous = self.watcher.builder.properties
+        self.properties['nodes'][1]['group_id'] = 'warehouse'
+        self.write()
+
+        rebuild = self.watcher.rebuild()
+
+        self.assertIn("$.nodes[1].group_id", rebuild.error)
+        self.assertIs(self.watcher.builder.properties, previous)
+
+        with open(self.path, 'w') as properties_file:
+            properties_file.write('{')
+        self.assertIsNotNone(self.watcher.rebuild().error)
+        self.assertIs(self.watcher.builder.properties, previous)
+
+    def test_removed_node_reported(self):
+        del self.properties['nodes'][3]
+        self.write()
+
+        rebuild = self.watcher.rebuild()
+
+        self.assertEqual(rebuild.removed_nodes, ['store-003'])
+        self.assertIn('1 removed node(s)', str(rebuild))
+
+    def test_wait_for_change_debounces(self):
+        self.assertFalse(self.watcher.wait_for_change(timeout=0.05))
+
+        time.sleep(0.01)
+        self.write()
+        self.assertTrue(self.watcher.wait_for_change(timeout=1))
+        self.assertFalse(self.watcher.wait_for_change(timeout=0.05))
+
+    def test_router_url_renders_its_stores(self):
+        self.properties = make_tiered_properties(regions=2, stores=4)
+        self.write()
+        builder = ReplicationBuilder(self.path, self.output_dir)
+        builder.generate_files()
+        watcher = PropertiesWatcher(builder, self.path)
+
+        self.properties['nodes'][1]['url'] = 'http://region1.example.com/sync/region-001'
+        self.write()
+        rebuild = watcher.rebuild()
+
+        self.assertEqual(rebuild.nodes, ['region-001', 'store-001', 'store-003'])
+        self.assertIn('registration.url=http://region1.example.com/sync/region-001', self.read('store-003.properties'))
+
+    def test_validate_changed_nodes_checks_uniqueness(self):
+        self.properties['nodes'][2]['external_id'] = '001'
+        report = Validator(self.properties).validate_changed_nodes({'store-002'})
+        self.assertEqual([error.path for error in report.errors], ['$.nodes[2].external_id'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import csv
+import os
+import tempfile
+import unittest
+from sdmanager.core import ReplicationBuilder
+from sdmanager.core.catalog import CatalogCache
+from sdmanager.core.workload import WorkloadGenerator
+from sdmanager.tests.TestReplicationBuilder import make_properties
+from sdmanager.tests.TestTorque import SAMPLE
+
+class TestWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        properties = make_properties(stores=3)
+        properties['tables'].append({"name": "item_selling_price", "channel": "item", "route": "parent-child", "route-by": "store_id = EXTERNAL_ID"})
+        self.builder = ReplicationBuilder(properties, table_schema=SAMPLE, catalog_cache=CatalogCache(os.path.join(self.tmp.name, 'cache')))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self, name, **options):
+        output_dir = os.path.join(self.tmp.name, name)
+        written = WorkloadGenerator(self.builder, output_dir, **options).write()
+        contents = {}
+        for directory, _, files in os.walk(output_dir):
+            for file_name in files:
+                path = os.path.join(directory, file_name)
+                with open(path) as output_file:
+                    contents[os.path.relpath(path, output_dir)] = output_file.read()
+        return written, contents
+
+    def test_output_independent_of_workers(self):
+        written, serial = self.generate('serial', rows=90, chunk_rows=7, seed=3)
+        _, parallel = self.generate('parallel', rows=90, chunk_rows=7, seed=3, jobs=3)
+        _, reseeded = self.generate('reseeded', rows=90, chunk_rows=7, seed=4)
+
+        self.assertEqual(parallel, serial)
+        self.assertNotEqual(reseeded, serial)
+        self.assertEqual(written, {'item': 90, 'sale_transaction': 90, 'item_selling_price': 90, 'sale_return_line_item': 90})
+        self.assertEqual(sum(1 for line in serial['item.sql'].splitlines() if line.startswith('(')), 90)
+
+    def test_rows_partitioned_by_store(self):
+        _, contents = self.generate('stores', rows=30, table_rows={'item': 10}, output_format='csv', per_store=True)
+
+        self.assertEqual(sorted(contents), [
+            '001/item_selling_price.csv', '001/sale_transaction.csv',
+            '002/item_selling_price.csv', '002/sale_transaction.csv',
+            '003/item_selling_price.csv', '003/sale_transaction.csv',
+            'item.csv', 'sale_return_line_item.csv',
+        ])
+        rows = list(csv.DictReader(contents['002/item_selling_price.csv'].splitlines()))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual({row['store_id'] for row in rows}, {'002'})
+        # Foreign keys only reference generated parent rows
+        self.assertTrue(all(1 <= int(row['item_id']) <= 10 for row in rows))
+        self.assertEqual(len({row['item_id'] for row in rows}), 10)
+
+if __name__ == '__main__':
+    unittest.main()
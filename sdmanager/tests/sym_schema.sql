@@ -0,0 +1,149 @@
+-- SymmetricDS 3.12 configuration tables used by sd-manager, for sqlite.
+-- Columns not written by sd-manager are kept where they have defaults.
+
+create table sym_channel (
+    channel_id varchar(128) not null primary key,
+    processing_order integer default 1 not null,
+    max_batch_size integer default 1000 not null,
+    max_batch_to_send integer default 60 not null,
+    max_data_to_route integer default 100000 not null,
+    extract_period_millis integer default 0 not null,
+    enabled smallint default 1 not null,
+    use_old_data_to_route smallint default 1 not null,
+    use_row_data_to_route smallint default 1 not null,
+    use_pk_data_to_route smallint default 1 not null,
+    reload_flag smallint default 0 not null,
+    file_sync_flag smallint default 0 not null,
+    contains_big_lob smallint default 0 not null,
+    batch_algorithm varchar(50) default 'default' not null,
+    data_loader_type varchar(50) default 'default' not null,
+    description varchar(255),
+    queue varchar(25) default 'default' not null,
+    max_network_kbps decimal(10,3) default 0.000 not null,
+    data_event_action char(1),
+    create_time timestamp,
+    last_update_by varchar(50),
+    last_update_time timestamp
+);
+
+create table sym_node_group (
+    node_group_id varchar(50) not null primary key,
+    description varchar(255),
+    create_time timestamp,
+    last_update_by varchar(50),
+    last_update_time timestamp
+);
+
+create table sym_node_group_link (
+    source_node_group_id varchar(50) not null,
+    target_node_group_id varchar(50) not null,
+    data_event_action char(1) default 'W' not null,
+    sync_config_enabled smallint default 1 not null,
+    is_reversible smallint default 0 not null,
+    create_time timestamp,
+    last_update_by varchar(50),
+    last_update_time timestamp,
+    primary key (source_node_group_id, target_node_group_id)
+);
+
+create table sym_trigger (
+    trigger_id varchar(128) not null primary key,
+    source_catalog_name varchar(255),
+    source_schema_name varchar(255),
+    source_table_name varchar(255) not null,
+    channel_id varchar(128) not null,
+    reload_channel_id varchar(128) default 'reload' not null,
+    sync_on_update smallint default 1 not null,
+    sync_on_insert smallint default 1 not null,
+    sync_on_delete smallint default 1 not null,
+    sync_on_incoming_batch smallint default 0 not null,
+    sync_on_update_condition text,
+    sync_on_insert_condition text,
+    sync_on_delete_condition text,
+    excluded_column_names text,
+    included_column_names text,
+    sync_key_names text,
+    use_stream_lobs smallint default 0 not null,
+    use_capture_lobs smallint default 0 not null,
+    use_capture_old_data smallint default 1 not null,
+    use_handle_key_updates smallint default 1 not null,
+    channel_expression varchar(255),
+    create_time timestamp not null,
+    last_update_by varchar(50),
+    last_update_time timestamp not null
+);
+
+create table sym_router (
+    router_id varchar(50) not null primary key,
+    target_catalog_name varchar(255),
+    target_schema_name varchar(255),
+    target_table_name varchar(255),
+    source_node_group_id varchar(50) not null,
+    target_node_group_id varchar(50) not null,
+    router_type varchar(50),
+    router_expression text,
+    sync_on_update smallint default 1 not null,
+    sync_on_insert smallint default 1 not null,
+    sync_on_delete smallint default 1 not null,
+    use_source_catalog_schema smallint default 1 not null,
+    create_time timestamp not null,
+    last_update_by varchar(50),
+    last_update_time timestamp not null
+);
+
+create table sym_trigger_router (
+    trigger_id varchar(128) not null,
+    router_id varchar(50) not null,
+    enabled smallint default 1 not null,
+    initial_load_order integer default 1 not null,
+    initial_load_select text,
+    initial_load_delete_stmt text,
+    ping_back_enabled smallint default 0 not null,
+    create_time timestamp not null,
+    last_update_by varchar(50),
+    last_update_time timestamp not null,
+    primary key (trigger_id, router_id)
+);
+
+create table sym_node (
+    node_id varchar(50) not null primary key,
+    node_group_id varchar(50) not null,
+    external_id varchar(255) not null,
+    sync_enabled smallint default 0,
+    sync_url varchar(255)
+);
+
+create table sym_node_security (
+    node_id varchar(50) not null primary key,
+    node_password varchar(50) not null,
+    registration_enabled smallint default 0
+);
+
+create table sym_node_identity (
+    node_id varchar(50) not null primary key
+);
+
+create table sym_node_host (
+    node_id varchar(50) not null,
+    host_name varchar(60) not null,
+    primary key (node_id, host_name)
+);
+
+create table sym_table_reload_request (
+    target_node_id varchar(50) not null,
+    source_node_id varchar(50) not null,
+    trigger_id varchar(128) not null,
+    router_id varchar(50) not null,
+    create_time timestamp not null,
+    create_table smallint default 0 not null,
+    delete_first smallint default 0 not null,
+    reload_select text,
+    before_custom_sql text,
+    reload_time timestamp,
+    load_id integer,
+    processed smallint default 0 not null,
+    channel_id varchar(128),
+    last_update_by varchar(50),
+    last_update_time timestamp not null,
+    primary key (target_node_id, source_node_id, trigger_id, router_id, create_time)
+);
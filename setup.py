@@ -9,6 +9,10 @@ setup(
     install_requires=[
         'Click',
     ],
+    extras_require={
+        'mysql': ['PyMySQL'],
+        'postgresql': ['psycopg2-binary'],
+    },
     entry_points='''
         [console_scripts]
         sd-manager=sdmanager.cli:cli